@@ -0,0 +1,214 @@
+"""Token-per-minute and adaptive concurrency limits held around each model call.
+
+LangChain's ``rate_limiter`` hook only counts requests and has no release
+step, and model callbacks are skipped when a call is cancelled, so both
+limits are held by the model itself: ``create_llm`` builds hosted models
+from ``limited_class(<provider class>)``, whose request methods run inside
+``CallLimits.hold``. The AIMD concurrency slot and the token reservation
+are given back in ``finally``, so a call cancelled by a graph or worker
+timeout can't leak them. Responses served from the LLM cache never reach
+these methods, so they take no slot and no tokens.
+"""
+
+import contextvars
+import functools
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.messages.ai import UsageMetadata, add_usage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+from app.core.concurrency import ConcurrencyRegistry, is_overload_error
+from app.core.rate_limiter import RateLimiterRegistry, TokenBudget
+from app.core.tokens import estimate_message_tokens
+
+# Set while a call holds its limits, so a provider whose _agenerate delegates
+# to its own _astream doesn't take a second slot
+_holding: contextvars.ContextVar[bool] = contextvars.ContextVar("llm_call_limits_holding", default=False)
+
+
+class _Call:
+    """Usage the provider reported during one held call."""
+
+    def __init__(self) -> None:
+        self.usage: UsageMetadata | None = None
+
+    def observe(self, message: BaseMessage | None) -> None:
+        usage = getattr(message, "usage_metadata", None)
+        if usage:
+            self.usage = add_usage(self.usage, usage)
+
+
+class CallLimits:
+    """Concurrency slot and TPM reservation for calls on one provider key.
+
+    Either part is optional: *concurrency* is None when ADAPTIVE_CONCURRENCY
+    is off, *budget* when no TPM limit is set.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        concurrency: ConcurrencyRegistry | None = None,
+        budget: TokenBudget | None = None,
+        registry: RateLimiterRegistry | None = None,
+        stats_key: str = "",
+        max_tokens: int = 4096,
+    ) -> None:
+        self.key = key
+        self.concurrency = concurrency
+        self.budget = budget
+        self.registry = registry
+        self.stats_key = stats_key
+        self.max_tokens = max_tokens
+
+    def _estimate(self, messages: list[BaseMessage]) -> tuple[int, int] | None:
+        if self.budget is None:
+            return None
+        return estimate_message_tokens(messages), self.budget.expected_output(self.max_tokens)
+
+    def _record_wait(self, waited: float) -> None:
+        if self.registry is not None:
+            self.registry.record_wait(self.stats_key, waited)
+
+    @asynccontextmanager
+    async def hold(self, messages: list[BaseMessage]) -> AsyncIterator[_Call]:
+        """Reserve tokens and take a slot for the call made inside the block."""
+        call = _Call()
+        if _holding.get():
+            yield call
+            return
+        _holding.set(True)
+        reserved = self._estimate(messages)
+        controller = started = error = None
+        try:
+            if reserved is not None:
+                self._record_wait(await self.budget.reserve(*reserved))
+            if self.concurrency is not None:
+                slot = self.concurrency.get(self.key)
+                await slot.acquire()
+                controller = slot
+            started = time.monotonic()
+            yield call
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            _holding.set(False)
+            self._settle(call, reserved, controller, started, error)
+
+    @contextmanager
+    def hold_sync(self, messages: list[BaseMessage]) -> Iterator[_Call]:
+        """Blocking variant of hold() for synchronous model calls."""
+        call = _Call()
+        if _holding.get():
+            yield call
+            return
+        _holding.set(True)
+        reserved = self._estimate(messages)
+        controller = started = error = None
+        try:
+            if reserved is not None:
+                self._record_wait(self.budget.reserve_sync(*reserved))
+            if self.concurrency is not None:
+                slot = self.concurrency.get(self.key)
+                slot.acquire_sync()
+                controller = slot
+            started = time.monotonic()
+            yield call
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            _holding.set(False)
+            self._settle(call, reserved, controller, started, error)
+
+    def _settle(
+        self,
+        call: _Call,
+        reserved: tuple[int, int] | None,
+        controller: Any,
+        started: float | None,
+        error: BaseException | None,
+    ) -> None:
+        if controller is not None:
+            controller.release()
+            if error is None:
+                self.concurrency.record_success(self.key, time.monotonic() - started)
+            elif is_overload_error(error):
+                self.concurrency.record_overload(self.key)
+        if reserved is None:
+            return
+        if started is None:
+            # Cancelled while waiting — the request never went out
+            self.budget.refund(reserved)
+        elif error is not None:
+            self.budget.release(reserved)
+        elif call.usage:
+            self.budget.reconcile(reserved, (call.usage["input_tokens"], call.usage["output_tokens"]))
+        # No usage reported — keep the estimate as the charge
+
+
+class _LimitedModel:
+    """Request methods of a chat model, run inside its ``CallLimits``."""
+
+    _call_limits: CallLimits | None
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        if self._call_limits is None:
+            return super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        with self._call_limits.hold_sync(messages) as call:
+            result = super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            call.observe(result.generations[0].message if result.generations else None)
+            return result
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        if self._call_limits is None:
+            return await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        async with self._call_limits.hold(messages) as call:
+            result = await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            call.observe(result.generations[0].message if result.generations else None)
+            return result
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        if self._call_limits is None:
+            yield from super()._stream(messages, stop=stop, run_manager=run_manager, **kwargs)
+            return
+        with self._call_limits.hold_sync(messages) as call:
+            for chunk in super()._stream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                call.observe(chunk.message)
+                yield chunk
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        if self._call_limits is None:
+            async for chunk in super()._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                yield chunk
+            return
+        async with self._call_limits.hold(messages) as call:
+            async for chunk in super()._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                call.observe(chunk.message)
+                yield chunk
+
+
+@functools.cache
+def limited_class(base: type[BaseChatModel]) -> type[BaseChatModel]:
+    """Subclass of *base* that holds ``_call_limits`` around each request.
+
+    It keeps *base*'s name and module, so serialization (and LLM cache
+    keys) don't change. Methods *base* inherits from ``BaseChatModel`` are left alone:
+    LangChain checks them to tell whether a model implements streaming.
+    """
+    namespace: dict[str, Any] = {
+        "__module__": base.__module__,
+        "__annotations__": {"_call_limits": CallLimits | None},
+        "_call_limits": PrivateAttr(default=None),
+    }
+    for name in ("_generate", "_agenerate", "_stream", "_astream"):
+        if getattr(base, name) is getattr(BaseChatModel, name):
+            namespace[name] = getattr(BaseChatModel, name)
+    return type(base.__name__, (_LimitedModel, base), namespace)
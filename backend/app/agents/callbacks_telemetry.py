@@ -1,59 +1,84 @@
 """Telemetry callback handler — extends SaladinCallbackHandler with token tracking."""
 
+import asyncio
 import logging
 from datetime import datetime, UTC
 from typing import Any
 
 from app.agents.callbacks import SaladinCallbackHandler
+from app.config import settings
 from app.models.schemas import WSEvent
 from app.core.event_bus import event_bus
-from app.core.telemetry import create_token_usage
+from app.core.llm_cache import get_llm_cache, is_cache_hit
+from app.core.telemetry import create_token_usage, extract_cache_usage, extract_token_usage
 
 logger = logging.getLogger(__name__)
 
 
 class TelemetryCallbackHandler(SaladinCallbackHandler):
-    """Extends SaladinCallbackHandler with on_llm_end token usage extraction."""
+    """Extends SaladinCallbackHandler with on_llm_end token usage extraction.
+
+    Also streams generated tokens as ``worker_token`` events, batched into
+    TOKEN_STREAM_FLUSH_MS windows so event volume stays bounded.
+    """
+
+    def __init__(self, task_id: str, agent_id: str = "", agent_name: str = ""):
+        super().__init__(task_id, agent_id, agent_name)
+        self._token_buffer: list[str] = []
+        self._flush_task: asyncio.Task | None = None
+
+    async def on_llm_new_token(self, token: str, **kwargs) -> None:
+        if not token:
+            return
+        self._token_buffer.append(token)
+        if self._flush_task is None:
+            delay = settings.TOKEN_STREAM_FLUSH_MS / 1000
+            self._flush_task = asyncio.create_task(self._flush_after(delay))
+
+    async def _flush_after(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._flush_task = None
+        await self._flush_tokens()
+
+    async def _flush_tokens(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        if not self._token_buffer:
+            return
+        delta = "".join(self._token_buffer)
+        self._token_buffer.clear()
+        await event_bus.publish(WSEvent(
+            type="worker_token",
+            data={
+                "task_id": self.task_id,
+                "agent_id": self.agent_id,
+                "agent_name": self.agent_name,
+                "delta": delta,
+                "timestamp": datetime.now(UTC).isoformat(),
+            },
+        ))
+
+    async def on_llm_error(self, error: BaseException, **kwargs) -> None:
+        await self._flush_tokens()
+        await super().on_llm_error(error, **kwargs)
 
     async def on_llm_end(self, response: Any, **kwargs) -> None:
+        # Deliver any buffered tail before the completion log
+        await self._flush_tokens()
+
         # Call parent for log event
         await super().on_llm_end(response, **kwargs)
 
         # Extract token usage from response metadata
         try:
-            usage_metadata = None
-            model_name = ""
-
-            # LangChain response objects have different structures
-            if hasattr(response, 'generations') and response.generations:
-                gen = response.generations[0][0] if response.generations[0] else None
-                if gen and hasattr(gen, 'message'):
-                    msg = gen.message
-                    if hasattr(msg, 'usage_metadata'):
-                        usage_metadata = msg.usage_metadata
-                    if hasattr(msg, 'response_metadata'):
-                        model_name = msg.response_metadata.get('model', '')
-                        if not usage_metadata:
-                            # Try extracting from response_metadata directly
-                            rm = msg.response_metadata
-                            usage = rm.get('usage', rm.get('token_usage', {}))
-                            if usage:
-                                usage_metadata = {
-                                    'input_tokens': usage.get('input_tokens', usage.get('prompt_tokens', 0)),
-                                    'output_tokens': usage.get('output_tokens', usage.get('completion_tokens', 0)),
-                                }
-
-            if usage_metadata:
-                input_tokens = 0
-                output_tokens = 0
-                if isinstance(usage_metadata, dict):
-                    input_tokens = usage_metadata.get('input_tokens', 0)
-                    output_tokens = usage_metadata.get('output_tokens', 0)
-                else:
-                    input_tokens = getattr(usage_metadata, 'input_tokens', 0)
-                    output_tokens = getattr(usage_metadata, 'output_tokens', 0)
-
+            usage = extract_token_usage(response)
+            if usage:
+                model_name, input_tokens, output_tokens = usage
                 token_usage = create_token_usage(model_name, input_tokens, output_tokens)
+                cache_hit = is_cache_hit(response)
+                cache_read, cache_creation = extract_cache_usage(response)
+                llm_cache = get_llm_cache()
 
                 await event_bus.publish(WSEvent(
                     type="telemetry",
@@ -65,7 +90,13 @@ class TelemetryCallbackHandler(SaladinCallbackHandler):
                         "input_tokens": token_usage.input_tokens,
                         "output_tokens": token_usage.output_tokens,
                         "total_tokens": token_usage.total_tokens,
-                        "estimated_cost_usd": token_usage.estimated_cost_usd,
+                        # Cache hits replay the original usage but cost nothing
+                        "estimated_cost_usd": 0.0 if cache_hit else token_usage.estimated_cost_usd,
+                        "cache_hit": cache_hit,
+                        # Provider-side prompt cache
+                        "cache_read_tokens": cache_read,
+                        "cache_creation_tokens": cache_creation,
+                        "cache_hit_rate": llm_cache.stats()["hit_rate"] if llm_cache else None,
                         "timestamp": datetime.now(UTC).isoformat(),
                     },
                 ))
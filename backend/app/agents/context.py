@@ -0,0 +1,113 @@
+"""Context window management for the ReAct worker loop.
+
+``create_react_agent`` resends the whole message history on every step, so
+without trimming the input grows with every tool call. ``make_context_hook``
+builds a pre-model hook that leaves the stored history untouched and only
+shapes what the model sees:
+
+- the task input (leading human messages) and the most recent messages are
+  kept verbatim;
+- older tool results over ``OLD_TOOL_RESULT_TOKENS`` are summarized (cached
+  by content, so each result is summarized at most once per process);
+- if that is still over budget, the oldest steps are dropped whole — an AI
+  message together with its tool results, so tool calls stay paired.
+
+Nothing happens while the history fits in the budget.
+"""
+
+import asyncio
+import json
+from collections.abc import Awaitable, Callable
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+
+from app.core.tokens import count_tokens, message_text
+
+OLD_TOOL_RESULT_TOKENS = 300
+_MESSAGE_OVERHEAD = 4
+
+
+def message_tokens(message: BaseMessage, provider: str = "") -> int:
+    tokens = count_tokens(message_text(message.content), provider) + _MESSAGE_OVERHEAD
+    for call in getattr(message, "tool_calls", None) or []:
+        tokens += count_tokens(call["name"] + json.dumps(call.get("args", {})), provider)
+    return tokens
+
+
+def _split(messages: list[BaseMessage], keep_recent: int) -> tuple[list, list, list]:
+    """(task input, older steps, recent steps); recent starts on an AI message."""
+    start = 0
+    while start < len(messages) and isinstance(messages[start], HumanMessage):
+        start += 1
+    cut = max(start, len(messages) - keep_recent)
+    # Never separate tool results from the AI message that requested them
+    while start < cut < len(messages) and isinstance(messages[cut], ToolMessage):
+        cut -= 1
+    return messages[:start], messages[start:cut], messages[cut:]
+
+
+def _steps(messages: list[BaseMessage]) -> list[list[BaseMessage]]:
+    """Group messages into steps: an AI message followed by its tool results."""
+    steps: list[list[BaseMessage]] = []
+    for message in messages:
+        if steps and isinstance(message, ToolMessage):
+            steps[-1].append(message)
+        else:
+            steps.append([message])
+    return steps
+
+
+async def compact_messages(
+    messages: list[BaseMessage],
+    max_tokens: int,
+    keep_recent: int,
+    provider: str = "",
+) -> list[BaseMessage]:
+    """*messages* shaped to fit *max_tokens*, as described in the module docstring."""
+    total = sum(message_tokens(m, provider) for m in messages)
+    if total <= max_tokens:
+        return messages
+
+    head, older, recent = _split(messages, keep_recent)
+
+    from app.agents.tools_summarize import asummarize_text
+
+    async def compact(message: BaseMessage) -> BaseMessage:
+        if not isinstance(message, ToolMessage):
+            return message
+        text = message_text(message.content)
+        if count_tokens(text, provider) <= OLD_TOOL_RESULT_TOKENS:
+            return message
+        summary = await asummarize_text(text, OLD_TOOL_RESULT_TOKENS)
+        return message.model_copy(update={"content": f"[Earlier tool output, summarized]\n{summary}"})
+
+    older = list(await asyncio.gather(*(compact(m) for m in older)))
+
+    steps = _steps(older)
+    fixed = sum(message_tokens(m, provider) for m in head + recent)
+    step_tokens = [sum(message_tokens(m, provider) for m in step) for step in steps]
+    dropped = 0
+    while steps and fixed + sum(step_tokens) > max_tokens:
+        steps.pop(0)
+        step_tokens.pop(0)
+        dropped += 1
+
+    kept = [m for step in steps for m in step]
+    if dropped:
+        note = HumanMessage(content=f"[{dropped} earlier steps omitted to fit the context window]")
+        kept.insert(0, note)
+    return head + kept + recent
+
+
+def make_context_hook(
+    max_tokens: int,
+    keep_recent: int,
+    provider: str = "",
+) -> Callable[[dict], Awaitable[dict]]:
+    """Pre-model hook for ``create_react_agent`` applying ``compact_messages``."""
+
+    async def hook(state: dict) -> dict:
+        messages = await compact_messages(state["messages"], max_tokens, keep_recent, provider)
+        return {"llm_input_messages": messages}
+
+    return hook
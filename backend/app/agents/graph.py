@@ -2,12 +2,12 @@ import asyncio
 import logging
 from datetime import datetime, UTC
 
-from langchain_core.messages import HumanMessage
 from langgraph.graph import StateGraph, END
 
+from app.agents.output_store import put_output, resolve_outputs
 from app.agents.state import SaladinState, WorkerResult
 from app.agents.supervisor import supervisor_review
-from app.agents.worker import create_worker_agent
+from app.agents.worker import create_worker_agent, worker_input_messages
 from app.agents.callbacks_telemetry import TelemetryCallbackHandler
 from app.models.domain import (
     TaskRecord, TaskStatus, WorkerOutput, SupervisorReview, SupervisorDecision,
@@ -16,6 +16,7 @@ from app.models.schemas import WSEvent
 from app.core.event_bus import event_bus
 from app.services.agent_service import set_agent_status, get_agent
 from app.services.persistence import get_task, save_task
+from app.services.result_cache import SEED_PROMPT, remember_result
 from app.models.domain import AgentStatus
 from app.agents._tool_context import ToolContext, set_tool_context, reset_tool_context
 
@@ -24,7 +25,7 @@ logger = logging.getLogger(__name__)
 
 # ── Helper functions for task mutation via service layer ──
 
-def _persist_worker_outputs(task_id: str, results: list[WorkerResult], revision: int) -> None:
+def _persist_worker_outputs(task_id: str, results: list[dict], revision: int) -> None:
     task = get_task(task_id)
     if task:
         for r in results:
@@ -69,10 +70,35 @@ def _update_revision(task_id: str, new_revision: int) -> None:
         save_task(task)
 
 
+# Workers that missed the deadline but were left running (WORKER_LATE_RESULTS),
+# by task and agent; the next revision uses their result instead of a new run.
+_late_workers: dict[str, dict[str, asyncio.Task]] = {}
+
+
+async def _cancel_jobs(jobs) -> None:
+    """Cancel worker jobs and wait until their cleanup has run."""
+    jobs = list(jobs)
+    for job in jobs:
+        job.cancel()
+    await asyncio.gather(*jobs, return_exceptions=True)
+
+
+async def _discard_late_workers(task_id: str) -> None:
+    """Cancel workers still running past their deadline for *task_id*."""
+    await _cancel_jobs(_late_workers.pop(task_id, {}).values())
+
+
 # ── Graph Nodes ──
 
 async def dispatch_workers(state: SaladinState) -> dict:
-    """Run all assigned worker agents in parallel."""
+    """Run all assigned worker agents in parallel.
+
+    Each revision waits at most WORKER_TIMEOUT_SECONDS; the review then goes
+    ahead with the outputs that finished and the laggards are recorded as
+    timed out. Laggards are cancelled, or with WORKER_LATE_RESULTS left
+    running so their result joins the next revision.
+    """
+    from app.config import settings
     task_id = state["task_id"]
     agent_ids = state["assigned_agent_ids"]
     revision = state.get("current_revision", 0)
@@ -82,9 +108,7 @@ async def dispatch_workers(state: SaladinState) -> dict:
     if review and review.get("feedback"):
         feedback = review["feedback"]
 
-    results: list[WorkerResult] = []
-
-    async def run_single_worker(agent_id: str) -> WorkerResult | None:
+    async def run_single_worker(agent_id: str) -> dict | None:
         agent_config = get_agent(agent_id)
         if agent_config is None:
             logger.warning("Agent %s not found, skipping", agent_id)
@@ -102,18 +126,12 @@ async def dispatch_workers(state: SaladinState) -> dict:
             worker = create_worker_agent(
                 agent_id=agent_id,
                 custom_prompt=agent_config.system_prompt,
-                revision=revision,
-                revision_feedback=feedback,
                 llm_provider=agent_config.llm_provider,
                 llm_model=agent_config.llm_model,
             )
 
-            task_message = state["task_description"]
-            if feedback:
-                task_message += f"\n\nRevision feedback: {feedback}"
-
             result = await worker.ainvoke(
-                {"messages": [HumanMessage(content=task_message)]},
+                {"messages": worker_input_messages(state["task_description"], revision, feedback)},
                 config={"callbacks": [callback], "recursion_limit": 50},
             )
 
@@ -139,35 +157,76 @@ async def dispatch_workers(state: SaladinState) -> dict:
                 },
             ))
 
-            return WorkerResult(
-                agent_id=agent_id,
-                agent_name=agent_config.name,
-                output=output_text,
-            )
+            return {"agent_id": agent_id, "agent_name": agent_config.name, "output": output_text}
         except Exception as e:
             logger.exception("Worker %s failed: %s", agent_id, e)
             await set_agent_status(agent_id, AgentStatus.ERROR)
-            return WorkerResult(
-                agent_id=agent_id,
-                agent_name=agent_config.name if agent_config else agent_id,
-                output=f"Error: {e}",
-            )
+            return {
+                "agent_id": agent_id,
+                "agent_name": agent_config.name if agent_config else agent_id,
+                "output": f"Error: {e}",
+            }
         finally:
             reset_tool_context(token)
             await set_agent_status(agent_id, AgentStatus.IDLE)
 
-    # Run workers concurrently
-    tasks = [run_single_worker(aid) for aid in agent_ids]
-    worker_results = await asyncio.gather(*tasks)
-    results = [r for r in worker_results if r is not None]
+    # Run workers concurrently, picking up late results from the last revision
+    late = _late_workers.pop(task_id, {})
+    jobs = {
+        aid: late.pop(aid) if aid in late else asyncio.create_task(run_single_worker(aid))
+        for aid in agent_ids
+    }
+    await _cancel_jobs(late.values())  # agents no longer assigned
+    deadline = settings.WORKER_TIMEOUT_SECONDS
+    try:
+        await asyncio.wait(jobs.values(), timeout=deadline if deadline > 0 else None)
+    except asyncio.CancelledError:
+        # Graph timeout or shutdown: stop the workers along with this node
+        await _cancel_jobs(jobs.values())
+        raise
+
+    results = []
+    timed_out = []
+    cancelled = []
+    for aid, job in jobs.items():
+        if job.done():
+            if not job.cancelled() and job.result() is not None:
+                results.append(job.result())
+            continue
+        if settings.WORKER_LATE_RESULTS:
+            _late_workers.setdefault(task_id, {})[aid] = job
+            note = f"[Timed out after {deadline}s; a late result joins the next revision]"
+        else:
+            cancelled.append(job)
+            note = f"[Timed out after {deadline}s]"
+        agent_config = get_agent(aid)
+        timed_out.append({
+            "agent_id": aid,
+            "agent_name": agent_config.name if agent_config else aid,
+            "output": note,
+        })
+    # Let cancelled workers finish their cleanup (agent status, LLM slots)
+    # before the review starts
+    await _cancel_jobs(cancelled)
 
     logger.info(
-        "dispatch_workers: task=%s revision=%d workers_ran=%d results=%d",
-        task_id, revision, len(agent_ids), len(results),
+        "dispatch_workers: task=%s revision=%d workers_ran=%d results=%d timed_out=%d",
+        task_id, revision, len(agent_ids), len(results), len(timed_out),
     )
+    for wo in timed_out:
+        await event_bus.publish(WSEvent(
+            type="log",
+            data={
+                "task_id": task_id,
+                "level": "warning",
+                "message": f"Worker {wo['agent_name']} {wo['output']}",
+                "timestamp": datetime.now(UTC).isoformat(),
+            },
+        ))
 
-    # Persist worker outputs via service layer
-    _persist_worker_outputs(task_id, results, revision)
+    # Persist worker outputs via service layer; laggards are recorded but
+    # not passed on for review
+    _persist_worker_outputs(task_id, results + timed_out, revision)
 
     await event_bus.publish(WSEvent(
         type="task_update",
@@ -177,7 +236,12 @@ async def dispatch_workers(state: SaladinState) -> dict:
         },
     ))
 
-    return {"worker_outputs": results, "status": "under_review"}
+    # State keeps references only; the text is in the task record
+    refs = [
+        WorkerResult(agent_id=r["agent_id"], agent_name=r["agent_name"], output_ref=put_output(r["output"]))
+        for r in results
+    ]
+    return {"worker_outputs": refs, "status": "under_review"}
 
 
 async def review_node(state: SaladinState) -> dict:
@@ -270,6 +334,15 @@ async def review_node(state: SaladinState) -> dict:
     return result
 
 
+def after_dispatch(state: SaladinState) -> str:
+    """Review what finished; with no output at all, retry or give up."""
+    if state.get("worker_outputs"):
+        return "review"
+    if state.get("current_revision", 0) < state.get("max_revisions", 3):
+        return "revise"
+    return "fail"
+
+
 def should_continue(state: SaladinState) -> str:
     """Route based on supervisor decision."""
     review = state.get("supervisor_review")
@@ -295,12 +368,12 @@ async def approve_node(state: SaladinState) -> dict:
     task_id = state["task_id"]
     logger.info("approve_node: task=%s", task_id)
     outputs = state.get("worker_outputs", [])
-    final = "\n\n".join(
-        wo["output"] if isinstance(wo["output"], str) else str(wo["output"])
-        for wo in outputs
-    ) if outputs else ""
+    final = "\n\n".join(resolve_outputs(task_id, outputs))
 
     _finalize_task(task_id, TaskStatus.APPROVED, final)
+    task = get_task(task_id)
+    if task:
+        await remember_result(task)
 
     await event_bus.publish(WSEvent(
         type="task_update",
@@ -327,6 +400,22 @@ async def reject_node(state: SaladinState) -> dict:
     return {"final_output": final, "status": "rejected"}
 
 
+async def fail_node(state: SaladinState) -> dict:
+    """Finalize task as failed: still no worker output at the last revision."""
+    task_id = state["task_id"]
+    logger.info("fail_node: task=%s", task_id)
+    final = "No worker output to review: no assigned worker ran to completion"
+
+    _finalize_task(task_id, TaskStatus.FAILED, final)
+
+    await event_bus.publish(WSEvent(
+        type="task_update",
+        data={"action": "completed", "task": {"id": task_id, "status": "failed"}},
+    ))
+
+    return {"final_output": final, "status": "failed"}
+
+
 async def revise_node(state: SaladinState) -> dict:
     """Increment revision counter before re-dispatching to workers."""
     task_id = state["task_id"]
@@ -365,10 +454,19 @@ def build_graph(checkpointer=None) -> StateGraph:
     graph.add_node("approve", approve_node)
     graph.add_node("reject", reject_node)
     graph.add_node("revise", revise_node)
+    graph.add_node("fail", fail_node)
 
     graph.set_entry_point("dispatch_workers")
 
-    graph.add_edge("dispatch_workers", "review")
+    graph.add_conditional_edges(
+        "dispatch_workers",
+        after_dispatch,
+        {
+            "review": "review",
+            "revise": "revise",
+            "fail": "fail",
+        },
+    )
     graph.add_conditional_edges(
         "review",
         should_continue,
@@ -381,40 +479,40 @@ def build_graph(checkpointer=None) -> StateGraph:
     graph.add_edge("revise", "dispatch_workers")
     graph.add_edge("approve", END)
     graph.add_edge("reject", END)
+    graph.add_edge("fail", END)
 
     return graph.compile(checkpointer=checkpointer)
 
 
-def _get_checkpointer():
-    """Get PostgresSaver checkpointer when using postgres backend."""
-    from app.config import settings
-    if settings.STORAGE_BACKEND == "postgres":
-        try:
-            from langgraph.checkpoint.postgres import PostgresSaver
-            return PostgresSaver.from_conn_string(settings.DATABASE_URL)
-        except (ImportError, Exception) as e:
-            logger.warning("PostgresSaver not available: %s", e)
-    return None
-
-
 _compiled_graph = None
 _checkpointer = None
 
 
-async def run_graph(task: TaskRecord) -> None:
-    """Execute the full orchestration graph for a task."""
+def get_compiled_graph():
+    """The compiled graph, bound to the process-wide checkpointer (if open)."""
     global _compiled_graph, _checkpointer
+    from app.core.checkpoint import get_checkpointer
+    checkpointer = get_checkpointer()
+    if _compiled_graph is None or checkpointer is not _checkpointer:
+        _checkpointer = checkpointer
+        _compiled_graph = build_graph(checkpointer=checkpointer)
+    return _compiled_graph
 
-    if _compiled_graph is None:
-        _checkpointer = _get_checkpointer()
-        _compiled_graph = build_graph(checkpointer=_checkpointer)
-    compiled = _compiled_graph
+
+async def run_graph(task: TaskRecord, seed_output: str = "", resume: bool = False) -> None:
+    """Execute the full orchestration graph for a task.
+
+    ``seed_output`` is a prior approved result from the semantic cache,
+    appended to the task description for workers and supervisor. With
+    ``resume``, a run interrupted by a restart continues from the task's
+    latest checkpoint; without a checkpoint it starts over.
+    """
+    compiled = get_compiled_graph()
 
     initial_state: SaladinState = {
         "task_id": task.id,
-        "task_description": task.description,
+        "task_description": task.description + (SEED_PROMPT.format(output=seed_output) if seed_output else ""),
         "assigned_agent_ids": task.assigned_agents,
-        "messages": [],
         "worker_outputs": [],
         "supervisor_review": None,
         "current_revision": 0,
@@ -429,13 +527,22 @@ async def run_graph(task: TaskRecord) -> None:
     if _checkpointer:
         config["configurable"] = {"thread_id": task.id}
 
+    graph_input = initial_state
+    if resume and _checkpointer:
+        snapshot = await compiled.aget_state(config)
+        if snapshot.next:
+            logger.info("Resuming task %s from checkpoint before %s", task.id, ", ".join(snapshot.next))
+            graph_input = None
+
     from app.config import settings
     try:
         await asyncio.wait_for(
-            compiled.ainvoke(initial_state, config=config if config else None),
+            compiled.ainvoke(graph_input, config=config if config else None),
             timeout=settings.GRAPH_TIMEOUT_SECONDS,
         )
     except asyncio.TimeoutError:
         logger.error("Graph execution timed out for task %s after %ds", task.id, settings.GRAPH_TIMEOUT_SECONDS)
         _finalize_task(task.id, TaskStatus.FAILED, f"Execution timed out after {settings.GRAPH_TIMEOUT_SECONDS}s")
         raise
+    finally:
+        await _discard_late_workers(task.id)
@@ -1,10 +1,16 @@
 """LLM factory with lazy imports — only the installed provider's package is needed."""
 
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
 
 from langchain_core.language_models import BaseChatModel
 
 from app.config import settings
+from app.core.concurrency import concurrency
+from app.core.llm_cache import get_llm_cache
+from app.core.rate_limiter import rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +22,14 @@ DEFAULT_MODELS: dict[str, str] = {
     "ollama": "llama3",
 }
 
+# Built models are reused so each keeps its HTTP client and keep-alive
+# connections. Keyed by (provider, model, key digest, max_tokens, streaming,
+# cache). The full SHA-256 of the API key is used: a pooled model carries its
+# key, so a collision would serve one BYOK user with another's key. The short
+# rate_limiter.key() hash is only for bucket and metric labels.
+_pool: OrderedDict[tuple, BaseChatModel] = OrderedDict()
+_pool_lock = threading.Lock()
+
 
 def create_llm(
     provider: str = "",
@@ -23,66 +37,189 @@ def create_llm(
     api_key: str = "",
     base_url: str = "",
     max_tokens: int = 4096,
+    streaming: bool = False,
+    cache: bool = True,
 ) -> BaseChatModel:
     """Create a LangChain chat model for the given provider.
 
-    Falls back to global settings when arguments are empty.
+    Falls back to global settings when arguments are empty. ``streaming``
+    makes the model emit ``on_llm_new_token`` callbacks during generation.
+    Hosted providers get a rate limiter keyed by provider and API key hash,
+    applied by LangChain on every sync and async call, plus token-per-minute
+    budgeting when RATE_LIMIT_INPUT_TPM / RATE_LIMIT_OUTPUT_TPM are set.
+
+    Models are pooled (LRU, ``LLM_CLIENT_POOL_SIZE``) so repeated calls with
+    the same provider, model, key and settings share one HTTP client.
+
+    When LLM_CACHE_ENABLED is set, responses are served from the on-disk
+    exact-match cache; ``cache=False`` returns a model that never uses it.
     """
     provider = (provider or settings.LLM_PROVIDER).lower().strip()
     model = model or settings.LLM_MODEL or DEFAULT_MODELS.get(provider, "")
+    if provider == "ollama":
+        key_id = base_url or settings.OLLAMA_BASE_URL
+    else:
+        api_key = _resolve_api_key(provider, api_key)
+        key_id = _key_digest(api_key)
+
+    pool_key = (provider, model, key_id, max_tokens, streaming, cache)
+    with _pool_lock:
+        llm = _pool.get(pool_key)
+        if llm is not None:
+            _pool.move_to_end(pool_key)
+            return llm
+
+    llm = _build_llm(provider, model, api_key, base_url, max_tokens, streaming, cache)
+    if settings.LLM_CLIENT_POOL_SIZE > 0:
+        with _pool_lock:
+            _pool[pool_key] = llm
+            _pool.move_to_end(pool_key)
+            while len(_pool) > settings.LLM_CLIENT_POOL_SIZE:
+                _pool.popitem(last=False)
+    return llm
+
+
+def supports_prompt_caching(llm: BaseChatModel) -> bool:
+    """True if *llm* takes explicit prompt-cache breakpoints (Anthropic).
+
+    OpenAI and Gemini cache long shared prefixes automatically, so for them
+    only the prompt order matters: stable content first.
+    """
+    return settings.PROMPT_CACHING and getattr(llm, "_llm_type", "") == "anthropic-chat"
+
+
+def cacheable_content(llm: BaseChatModel, stable: str, rest: str = "") -> str | list[dict]:
+    """Message content with a cache breakpoint after *stable*, where supported.
+
+    For Anthropic the breakpoint caches everything before it, including the
+    tool schemas, which the API places ahead of the system prompt.
+    """
+    if not supports_prompt_caching(llm):
+        return stable + rest
+    blocks = [{"type": "text", "text": stable, "cache_control": {"type": "ephemeral"}}]
+    if rest:
+        blocks.append({"type": "text", "text": rest})
+    return blocks
+
+
+def clear_llm_pool() -> None:
+    """Drop all pooled models (e.g. after provider settings change)."""
+    with _pool_lock:
+        _pool.clear()
+
+
+def _key_digest(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+def _resolve_api_key(provider: str, api_key: str) -> str:
+    """Explicit key, then the per-request key, then the global setting."""
+    from app.core.key_context import get_request_keys
 
+    if api_key:
+        return api_key
+    keys = get_request_keys()
     if provider == "anthropic":
-        return _create_anthropic(model, api_key, max_tokens)
+        return keys.anthropic or settings.ANTHROPIC_API_KEY
+    if provider == "openai":
+        return keys.openai or settings.OPENAI_API_KEY
+    if provider == "gemini":
+        return keys.google or settings.GOOGLE_API_KEY
+    return ""
+
+
+def _build_llm(
+    provider: str, model: str, api_key: str, base_url: str, max_tokens: int, streaming: bool, cache: bool,
+) -> BaseChatModel:
+    # Only pass the flag when requested so default construction is unchanged.
+    # Ollama always streams internally, so it needs no flag.
+    extra = {"streaming": True} if streaming else {}
+    cache_kwargs = _cache_kwargs(cache, _key_digest(api_key) if api_key else "")
+
+    if provider == "anthropic":
+        return _create_anthropic(model, api_key, max_tokens, **extra, **cache_kwargs)
     elif provider == "openai":
-        return _create_openai(model, api_key, max_tokens)
+        return _create_openai(model, api_key, max_tokens, **extra, **cache_kwargs)
     elif provider == "gemini":
-        return _create_gemini(model, api_key, max_tokens)
+        return _create_gemini(model, api_key, max_tokens, **extra, **cache_kwargs)
     elif provider == "ollama":
-        return _create_ollama(model, base_url)
+        return _create_ollama(model, base_url, **cache_kwargs)
     else:
         raise ValueError(f"Unsupported LLM provider: {provider!r}")
 
 
-def _create_anthropic(model: str, api_key: str, max_tokens: int) -> BaseChatModel:
-    from langchain_anthropic import ChatAnthropic
-    from app.core.key_context import get_request_keys
+def _cache_kwargs(cache: bool, scope: str) -> dict:
+    """``cache=`` for the response cache: its view for *scope* (the API key digest), False, or nothing."""
+    llm_cache = get_llm_cache()
+    if llm_cache is None:
+        return {}
+    return {"cache": llm_cache.scoped(scope) if cache else False}
+
+
+def _limited(cls: type[BaseChatModel], provider: str, key: str, max_tokens: int, /, **kwargs) -> BaseChatModel:
+    """*cls* model holding adaptive concurrency and TPM limits around each call, if enabled."""
+    from app.agents.call_limits import CallLimits, limited_class
+
+    budget = rate_limiter.token_budget(provider, key)
+    if not settings.ADAPTIVE_CONCURRENCY and budget is None:
+        return cls(**kwargs)
+    llm = limited_class(cls)(**kwargs)
+    llm._call_limits = CallLimits(
+        rate_limiter.key(provider, key),
+        concurrency=concurrency if settings.ADAPTIVE_CONCURRENCY else None,
+        budget=budget,
+        registry=rate_limiter,
+        stats_key=rate_limiter.token_stats_key(provider, key),
+        max_tokens=max_tokens,
+    )
+    return llm
+
 
-    key = api_key or get_request_keys().anthropic or settings.ANTHROPIC_API_KEY
-    return ChatAnthropic(
+def _create_anthropic(model: str, api_key: str, max_tokens: int, **extra) -> BaseChatModel:
+    from langchain_anthropic import ChatAnthropic
+    key = api_key
+    return _limited(
+        ChatAnthropic, "anthropic", key, max_tokens,
         model=model,
         api_key=key,
         max_tokens=max_tokens,
+        rate_limiter=rate_limiter.for_model("anthropic", key),
+        **extra,
     )
 
 
-def _create_openai(model: str, api_key: str, max_tokens: int) -> BaseChatModel:
+def _create_openai(model: str, api_key: str, max_tokens: int, **extra) -> BaseChatModel:
     from langchain_openai import ChatOpenAI
-    from app.core.key_context import get_request_keys
-
-    key = api_key or get_request_keys().openai or settings.OPENAI_API_KEY
-    return ChatOpenAI(
+    key = api_key
+    return _limited(
+        ChatOpenAI, "openai", key, max_tokens,
         model=model,
         api_key=key,
         max_tokens=max_tokens,
+        rate_limiter=rate_limiter.for_model("openai", key),
+        **extra,
     )
 
 
-def _create_gemini(model: str, api_key: str, max_tokens: int) -> BaseChatModel:
+def _create_gemini(model: str, api_key: str, max_tokens: int, **extra) -> BaseChatModel:
     from langchain_google_genai import ChatGoogleGenerativeAI
-    from app.core.key_context import get_request_keys
-
-    key = api_key or get_request_keys().google or settings.GOOGLE_API_KEY
-    return ChatGoogleGenerativeAI(
+    key = api_key
+    return _limited(
+        ChatGoogleGenerativeAI, "gemini", key, max_tokens,
         model=model,
         google_api_key=key,
         max_output_tokens=max_tokens,
+        rate_limiter=rate_limiter.for_model("gemini", key),
+        **extra,
     )
 
 
-def _create_ollama(model: str, base_url: str) -> BaseChatModel:
+def _create_ollama(model: str, base_url: str, **extra) -> BaseChatModel:
+    # Local server with no provider quota — not rate limited
     from langchain_ollama import ChatOllama
 
     return ChatOllama(
         model=model,
         base_url=base_url or settings.OLLAMA_BASE_URL,
+        **extra,
     )
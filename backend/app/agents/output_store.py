@@ -0,0 +1,56 @@
+"""Worker output text kept out of the graph state.
+
+Graph state (and so every checkpoint) only carries a content hash per
+worker output. The text lives in a small in-process LRU and, durably, in
+the task record written by ``_persist_worker_outputs``, so a graph resumed
+in another process (e.g. after human approval) can still resolve it.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+OUTPUT_CACHE_SIZE = 256
+
+_outputs: OrderedDict[str, str] = OrderedDict()
+_outputs_lock = threading.Lock()
+
+
+def output_ref(text: str) -> str:
+    return hashlib.sha256(text.encode(errors="replace")).hexdigest()[:32]
+
+
+def put_output(text: str) -> str:
+    """Remember *text* in this process and return its reference."""
+    ref = output_ref(text)
+    with _outputs_lock:
+        _outputs[ref] = text
+        _outputs.move_to_end(ref)
+        while len(_outputs) > OUTPUT_CACHE_SIZE:
+            _outputs.popitem(last=False)
+    return ref
+
+
+def resolve_outputs(task_id: str, worker_outputs: list[dict]) -> list[str]:
+    """Texts for *worker_outputs* state entries, in order.
+
+    Entries from checkpoints written before outputs were stored by
+    reference still carry the text inline and are returned as-is.
+    """
+    texts: list[str | None] = []
+    with _outputs_lock:
+        for wo in worker_outputs:
+            if "output" in wo:
+                texts.append(wo["output"])
+            else:
+                texts.append(_outputs.get(wo["output_ref"]))
+
+    if any(text is None for text in texts):
+        from app.services.persistence import get_task
+        task = get_task(task_id)
+        stored = {output_ref(o.output): o.output for o in task.worker_outputs} if task else {}
+        texts = [
+            text if text is not None else stored.get(wo["output_ref"], "")
+            for wo, text in zip(worker_outputs, texts)
+        ]
+    return texts
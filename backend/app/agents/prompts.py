@@ -12,12 +12,16 @@ If you receive revision feedback from the supervisor, incorporate it to improve
 
 You also have self-improvement tools:
 - Use `append_improvement_note` when you notice code quality issues, bugs, or opportunities outside your current task scope. This logs observations to IMPROVEMENTS.md for future review.
-- Only use `create_task` to spawn a follow-up task when explicitly instructed to do so, or when you discover clearly related work that must be done separately.
+- Only use `create_task` to spawn a follow-up task when explicitly instructed to do so, or when you discover clearly related work that must be done separately."""
 
-Current task revision: {revision}
+# Sent with the task message rather than baked into the system prompt, so one
+# compiled worker agent serves every revision
+WORKER_REVISION_PROMPT = """Current task revision: {revision}
 {revision_feedback}"""
 
-SUPERVISOR_SYSTEM_PROMPT = """You are the Supervisor agent in the Saladin multi-agent system.
+# Split so the instructions and task description form a stable prefix across
+# revisions (a prompt-cache breakpoint goes between the two parts)
+SUPERVISOR_PROMPT_PREFIX = """You are the Supervisor agent in the Saladin multi-agent system.
 Your role is to review the outputs from worker agents and make a decision.
 
 You must evaluate each worker's output and respond with a JSON decision:
@@ -38,10 +42,14 @@ Approve if the output reasonably addresses the task.
 
 Important: Workers have access to tools (file I/O, code search, task creation, etc.). The worker's text output is a summary of work done — the actual work (file edits, task creation, code analysis) happens via tool calls you cannot see. If the worker describes actions taken via tools (e.g., "I created 5 follow-up tasks", "I wrote improvements to X file"), trust that the tool calls succeeded unless the summary is clearly fabricated or incoherent.
 
+Task description: {task_description}
+"""
+
+SUPERVISOR_PROMPT_REVIEW = """
 Current revision: {revision} of {max_revisions}
 If this is the final revision allowed, you should either approve or reject.
 
-Task description: {task_description}
-
 Worker outputs to review:
 {worker_outputs}"""
+
+SUPERVISOR_SYSTEM_PROMPT = SUPERVISOR_PROMPT_PREFIX + SUPERVISOR_PROMPT_REVIEW
@@ -1,6 +1,4 @@
-from typing import TypedDict, Annotated, Literal
-from langchain_core.messages import BaseMessage
-from langgraph.graph.message import add_messages
+from typing import TypedDict, Literal
 from pydantic import BaseModel, Field # Import BaseModel and Field
 
 from app.models.domain import SupervisorDecision
@@ -9,7 +7,8 @@ from app.models.domain import SupervisorDecision
 class WorkerResult(TypedDict):
     agent_id: str
     agent_name: str
-    output: str
+    # Text is resolved via app.agents.output_store, keeping checkpoints small
+    output_ref: str
 
 
 # Change ReviewResult to Pydantic BaseModel
@@ -26,7 +25,6 @@ class SaladinState(TypedDict):
     task_id: str
     task_description: str
     assigned_agent_ids: list[str]
-    messages: Annotated[list[BaseMessage], add_messages]
     worker_outputs: list[WorkerResult]
     supervisor_review: ReviewResult | None
     current_revision: int
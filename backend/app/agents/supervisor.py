@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 import re # Import re
@@ -5,49 +6,59 @@ from pydantic import ValidationError # Import ValidationError
 
 from langchain_core.messages import HumanMessage
 
-from app.agents.llm_factory import create_llm
-from app.agents.prompts import SUPERVISOR_SYSTEM_PROMPT
+from app.agents.llm_factory import cacheable_content, create_llm
+from app.agents.output_store import resolve_outputs
+from app.agents.prompts import SUPERVISOR_PROMPT_PREFIX, SUPERVISOR_PROMPT_REVIEW
 from app.agents.state import SaladinState, ReviewResult # ReviewResult is now a Pydantic model
+from app.core.tokens import count_tokens, truncate_to_tokens
 
 logger = logging.getLogger(__name__)
 
-MAX_OUTPUT_PER_WORKER = 4000
-MAX_TOTAL_OUTPUT = 12000
+MAX_OUTPUT_TOKENS_PER_WORKER = 1000
+MAX_TOTAL_OUTPUT_TOKENS = 3000
 
 
-def _smart_truncate(text: str, max_length: int) -> str:
-    """Intelligently truncate or summarize text."""
-    if len(text) <= max_length:
+async def _smart_truncate(text: str, max_tokens: int, provider: str = "") -> str:
+    """Intelligently truncate or summarize text to *max_tokens* of *provider*."""
+    if count_tokens(text, provider) <= max_tokens:
         return text
 
     try:
-        from app.agents.tools_summarize import summarize_text
-        return summarize_text.invoke({"text": text, "max_length": max_length})
+        from app.agents.tools_summarize import asummarize_text
+        return await asummarize_text(text, max_tokens)
     except Exception:
-        return text[:max_length] + "\n[... truncated ...]"
+        return truncate_to_tokens(text, max_tokens, provider, marker="\n[... truncated ...]")
 
 
 async def supervisor_review(state: SaladinState, llm_provider: str = "", llm_model: str = "") -> dict:
     """Supervisor node: reviews worker outputs and returns a decision."""
     llm = create_llm(provider=llm_provider, model=llm_model, max_tokens=2048)
 
-    # Format worker outputs for review with intelligent summarization
-    output_parts = []
-    for wo in state["worker_outputs"]:
-        text = _smart_truncate(wo["output"], MAX_OUTPUT_PER_WORKER)
-        output_parts.append(f"\n--- Worker: {wo['agent_name']} ---\n{text}")
+    # Format worker outputs for review, summarizing oversized ones concurrently
+    outputs = resolve_outputs(state.get("task_id", ""), state["worker_outputs"])
+    texts = await asyncio.gather(*(
+        _smart_truncate(output, MAX_OUTPUT_TOKENS_PER_WORKER, llm_provider) for output in outputs
+    ))
+    output_parts = [
+        f"\n--- Worker: {wo['agent_name']} ---\n{text}"
+        for wo, text in zip(state["worker_outputs"], texts)
+    ]
     outputs_text = "\n".join(output_parts)
-    if len(outputs_text) > MAX_TOTAL_OUTPUT:
-        outputs_text = _smart_truncate(outputs_text, MAX_TOTAL_OUTPUT)
+    outputs_text = await _smart_truncate(outputs_text, MAX_TOTAL_OUTPUT_TOKENS, llm_provider)
 
     revision = state.get("current_revision", 0)
     max_revisions = state.get("max_revisions", 3)
 
-    prompt = SUPERVISOR_SYSTEM_PROMPT.format(
-        revision=revision,
-        max_revisions=max_revisions,
-        task_description=state["task_description"],
-        worker_outputs=outputs_text,
+    # Instructions + task description are identical on every revision, so
+    # they form the cacheable prefix; revision and outputs follow it
+    prompt = cacheable_content(
+        llm,
+        SUPERVISOR_PROMPT_PREFIX.format(task_description=state["task_description"]),
+        SUPERVISOR_PROMPT_REVIEW.format(
+            revision=revision,
+            max_revisions=max_revisions,
+            worker_outputs=outputs_text,
+        ),
     )
 
     response = await llm.ainvoke([HumanMessage(content=prompt)])
@@ -55,10 +66,7 @@ async def supervisor_review(state: SaladinState, llm_provider: str = "", llm_mod
 
     decision = _parse_decision(content)
 
-    return {
-        "supervisor_review": decision,
-        "messages": [response],
-    }
+    return {"supervisor_review": decision}
 
 
 def _parse_decision(content: str) -> ReviewResult:
@@ -1,6 +1,6 @@
 
 import pytest
-from backend.app.agents.prompts import WORKER_SYSTEM_PROMPT, SUPERVISOR_SYSTEM_PROMPT
+from backend.app.agents.prompts import WORKER_SYSTEM_PROMPT, WORKER_REVISION_PROMPT, SUPERVISOR_SYSTEM_PROMPT
 
 def test_worker_system_prompt_structure():
     """Test that the worker system prompt contains key elements and placeholders."""
@@ -11,8 +11,8 @@ def test_worker_system_prompt_structure():
     assert "If you receive revision feedback from the supervisor" in WORKER_SYSTEM_PROMPT
     assert "Use `append_improvement_note`" in WORKER_SYSTEM_PROMPT
     assert "Use `create_task`" in WORKER_SYSTEM_PROMPT
-    assert "Current task revision: {revision}" in WORKER_SYSTEM_PROMPT
-    assert "{revision_feedback}" in WORKER_SYSTEM_PROMPT
+    assert "Current task revision: {revision}" in WORKER_REVISION_PROMPT
+    assert "{revision_feedback}" in WORKER_REVISION_PROMPT
 
 def test_worker_system_prompt_formatting():
     """Test that the worker system prompt can be formatted correctly."""
@@ -20,8 +20,7 @@ def test_worker_system_prompt_formatting():
     revision_num = 5
     feedback = "Please make it better."
     
-    formatted_prompt = WORKER_SYSTEM_PROMPT.format(
-        custom_prompt=custom_p,
+    formatted_prompt = WORKER_SYSTEM_PROMPT.format(custom_prompt=custom_p) + WORKER_REVISION_PROMPT.format(
         revision=revision_num,
         revision_feedback=feedback
     )
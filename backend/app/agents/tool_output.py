@@ -0,0 +1,195 @@
+"""Bounding coding tool output before it enters the LLM context.
+
+Results of ``list_files``, ``search_code`` and ``run_command`` within
+``TOOL_OUTPUT_MAX_TOKENS`` are returned exactly as produced. Larger ones go
+through ``compact_output``:
+
+1. runs of identical lines collapse to one line plus a repeat count;
+2. for ``search_code``, grep ``path:line:text`` hits are capped per file;
+3. if the result is still over budget, only its head and tail are returned,
+   and the full output is written to ``TOOL_OUTPUT_DIR``, outside the
+   workspace, so the agent can page through it with
+   ``read_file("output:<name>", offset, limit)``. Saved outputs are deleted
+   once older than ``TOOL_OUTPUT_RETENTION_SECONDS``.
+
+``read_file`` content is never rewritten: ``page_lines`` returns whole lines
+up to the budget and says which lines were shown and how to read on.
+"""
+
+import hashlib
+import itertools
+import logging
+import os
+import re
+import time
+from collections.abc import Iterable
+
+from app.config import settings
+from app.core.tokens import count_tokens, truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+# read_file paths with this prefix name a saved tool output, not a workspace file
+OUTPUT_PREFIX = "output:"
+GREP_HITS_PER_FILE = 5
+_TAIL_SHARE = 0.3  # share of the budget given to the end of the output
+
+_GREP_HIT = re.compile(r"^(?P<path>[^:\n]+):\d+:")
+
+
+def dedupe_lines(text: str) -> str:
+    """Collapse runs of identical consecutive lines."""
+    lines = text.split("\n")
+    out: list[str] = []
+    i = 0
+    while i < len(lines):
+        j = i + 1
+        while j < len(lines) and lines[j] == lines[i]:
+            j += 1
+        out.append(lines[i])
+        if j - i > 2:
+            out.append(f"[previous line repeated {j - i - 1} more times]")
+        elif j - i == 2:
+            out.append(lines[i])
+        i = j
+    return "\n".join(out)
+
+
+def collapse_grep_hits(text: str, per_file: int = GREP_HITS_PER_FILE) -> str:
+    """Keep the first *per_file* ``path:line:`` hits of each file."""
+    out: list[str] = []
+    counts: dict[str, int] = {}
+    for line in text.split("\n"):
+        match = _GREP_HIT.match(line)
+        if match is None:
+            out.append(line)
+            continue
+        path = match.group("path")
+        counts[path] = counts.get(path, 0) + 1
+        if counts[path] <= per_file:
+            out.append(line)
+    for path, count in counts.items():
+        if count > per_file:
+            out.append(f"[{path}: {count - per_file} more matches not shown]")
+    return "\n".join(out)
+
+
+def head_tail(text: str, max_tokens: int) -> str:
+    """The start and end of *text* within *max_tokens*, with the gap marked."""
+    if count_tokens(text) <= max_tokens:
+        return text
+    tail_tokens = int(max_tokens * _TAIL_SHARE)
+    head = truncate_to_tokens(text, max_tokens - tail_tokens)
+    # Cut at a line boundary so the head doesn't end mid-line
+    if "\n" in head:
+        head = head[:head.rindex("\n")]
+    rest = text.split("\n")[head.count("\n") + 1:]
+    # Whole lines from the end, as many as fit the tail's share
+    tail: list[str] = []
+    for line in reversed(rest):
+        tail_tokens -= count_tokens(line) + 1
+        if tail_tokens < 0:
+            break
+        tail.append(line)
+    tail.reverse()
+    omitted = len(rest) - len(tail)
+    return "\n".join([head, f"[... {omitted} lines omitted ...]", *tail])
+
+
+def spill_dir() -> str:
+    return os.path.realpath(settings.TOOL_OUTPUT_DIR)
+
+
+def spill(text: str, tool_name: str) -> str:
+    """Save *text* under TOOL_OUTPUT_DIR; return the ``output:<name>`` path for read_file."""
+    directory = spill_dir()
+    os.makedirs(directory, exist_ok=True)
+    digest = hashlib.sha256(text.encode(errors="replace")).hexdigest()[:12]
+    name = f"{tool_name}-{digest}.txt"
+    with open(os.path.join(directory, name), "w") as fh:
+        fh.write(text)
+
+    # Age-based, so a burst of tool calls can't delete a path a worker was
+    # just given
+    cutoff = time.time() - settings.TOOL_OUTPUT_RETENTION_SECONDS
+    for entry in os.scandir(directory):
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass
+    return OUTPUT_PREFIX + name
+
+
+def resolve_output_path(path: str) -> str:
+    """Absolute file for an ``output:<name>`` path; ValueError if it isn't one."""
+    name = path[len(OUTPUT_PREFIX):]
+    if not path.startswith(OUTPUT_PREFIX) or not name or os.path.basename(name) != name:
+        raise ValueError(f"Not a saved tool output: '{path}'")
+    return os.path.join(spill_dir(), name)
+
+
+def compact_output(text: str, tool_name: str) -> str:
+    """*text* if within budget, otherwise compacted as in the module docstring."""
+    max_tokens = settings.TOOL_OUTPUT_MAX_TOKENS
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    compacted = dedupe_lines(text)
+    if tool_name == "search_code":
+        compacted = collapse_grep_hits(compacted)
+    if count_tokens(compacted) <= max_tokens:
+        return compacted
+
+    try:
+        page_path = spill(text, tool_name)
+    except OSError as e:
+        logger.warning("Could not save full %s output: %s", tool_name, e)
+        return head_tail(compacted, max_tokens)
+    total_lines = text.count("\n") + 1
+    return (
+        head_tail(compacted, max_tokens)
+        + f"\n[Full output ({total_lines} lines) saved as {page_path};"
+        + " page through it with read_file(path, offset, limit)]"
+    )
+
+
+def page_lines(lines: Iterable[str], path: str, offset: int = 0, limit: int = 0) -> str:
+    """Lines *offset*.. of *lines* (at most *limit*), unchanged, within the budget.
+
+    When not everything requested fits, the result ends with a marker giving
+    the lines shown, the total, and the offset to continue from.
+    """
+    max_tokens = settings.TOOL_OUTPUT_MAX_TOKENS
+    end = offset + limit if limit else None
+    shown: list[str] = []
+    tokens = 0
+    total = offset
+    full = False
+    for total, line in enumerate(itertools.islice(lines, offset, None), start=offset + 1):
+        if full or (end is not None and total > end):
+            continue  # keep counting lines for the total
+        line_tokens = count_tokens(line)
+        if tokens + line_tokens > max_tokens:
+            full = True
+            if not shown:
+                # A single line over the budget: show its start, marked as cut
+                return (
+                    truncate_to_tokens(line, max_tokens)
+                    + f"\n[Line {offset + 1} of {path} is longer than the output limit and was cut;"
+                    + f" continue with read_file(path, offset={offset + 1})]"
+                )
+            continue
+        shown.append(line)
+        tokens += line_tokens
+
+    content = "".join(shown)
+    if not full:
+        return content
+    last = offset + len(shown)
+    if content and not content.endswith("\n"):
+        content += "\n"
+    return content + (
+        f"[Lines {offset + 1}-{last} of {total} in {path} shown;"
+        f" continue with read_file(path, offset={last}, limit=...)]"
+    )
@@ -30,12 +30,12 @@ def store_memory(content: str, agent_id: str = "") -> str:
 
 
 @tool
-def summarize_text(text: str, max_length: int = 3000) -> str:
+def summarize_text(text: str, max_tokens: int = 750) -> str:
     """Summarize long text into a concise version while preserving key information.
 
     Args:
         text: The text to summarize.
-        max_length: Maximum character length threshold.
+        max_tokens: Token budget threshold.
     """
     from app.agents.tools_summarize import summarize_text as _summarize
-    return _summarize.invoke({"text": text, "max_length": max_length})
+    return _summarize.invoke({"text": text, "max_tokens": max_tokens})
@@ -7,13 +7,11 @@ import subprocess
 
 from langchain_core.tools import tool
 
+from app.agents.tool_output import OUTPUT_PREFIX, compact_output, page_lines, resolve_output_path
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
-_OUTPUT_LIMIT = 50_000  # chars — prevents blowing up LLM context
-
-
 def _resolve_workspace_path(relative_path: str) -> str:
     """Resolve *relative_path* against WORKSPACE_DIR.
 
@@ -35,23 +33,29 @@ def _resolve_workspace_path(relative_path: str) -> str:
 
 
 @tool
-def read_file(path: str) -> str:
+def read_file(path: str, offset: int = 0, limit: int = 0) -> str:
     """Read the contents of a file in the workspace.
 
+    Long files are returned a page at a time; the result then ends with a
+    note giving the offset to continue from.
+
     Args:
-        path: Relative path inside the workspace (e.g. ``src/main.py``).
+        path: Relative path inside the workspace (e.g. ``src/main.py``), or
+            an ``output:<name>`` path given for a saved long tool output.
+        offset: First line to return, 0-based (default start of file).
+        limit: Max number of lines to return (0 = as many as fit).
     """
     try:
-        resolved = _resolve_workspace_path(path)
+        if path.startswith(OUTPUT_PREFIX):
+            resolved = resolve_output_path(path)
+        else:
+            resolved = _resolve_workspace_path(path)
     except ValueError as exc:
         return f"Error: {exc}"
 
     try:
         with open(resolved, "r", errors="replace") as fh:
-            content = fh.read(_OUTPUT_LIMIT)
-        if len(content) == _OUTPUT_LIMIT:
-            content += "\n... [truncated at 50 000 chars]"
-        return content
+            return page_lines(fh, path, offset, limit)
     except FileNotFoundError:
         return f"Error: file not found — {path}"
     except Exception as exc:
@@ -113,9 +117,7 @@ def list_files(directory: str = ".", pattern: str = "*") -> str:
         return "No files matched."
 
     output = "\n".join(rel_paths)
-    if len(output) > _OUTPUT_LIMIT:
-        output = output[:_OUTPUT_LIMIT] + "\n... [truncated]"
-    return output
+    return compact_output(output, "list_files")
 
 
 # ---------------------------------------------------------------------------
@@ -154,9 +156,7 @@ def search_code(query: str, path: str = ".", file_pattern: str = "") -> str:
     workspace = os.path.realpath(settings.WORKSPACE_DIR)
     output = output.replace(workspace + os.sep, "")
 
-    if len(output) > _OUTPUT_LIMIT:
-        output = output[:_OUTPUT_LIMIT] + "\n... [truncated]"
-    return output
+    return compact_output(output, "search_code")
 
 
 # ---------------------------------------------------------------------------
@@ -201,9 +201,7 @@ def _run_local(command: str, timeout: int) -> str:
         stderr = result.stderr or ""
         output = f"STDOUT:\n{stdout}\nSTDERR:\n{stderr}\nEXIT CODE: {result.returncode}"
 
-        if len(output) > _OUTPUT_LIMIT:
-            output = output[:_OUTPUT_LIMIT] + "\n... [truncated]"
-        return output
+        return compact_output(output, "run_command")
 
     except subprocess.TimeoutExpired:
         return f"Error: command timed out after {effective_timeout}s"
@@ -253,9 +251,7 @@ def _run_docker(command: str, timeout: int) -> str:
 
         output = f"STDOUT:\n{stdout}\nSTDERR:\n{stderr}\nEXIT CODE: {exit_code}"
 
-        if len(output) > _OUTPUT_LIMIT:
-            output = output[:_OUTPUT_LIMIT] + "\n... [truncated]"
-        return output
+        return compact_output(output, "run_command")
 
     except Exception as exc:
         return f"Error running command: {exc}"
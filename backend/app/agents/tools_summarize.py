@@ -1,37 +1,209 @@
-"""Summarization tool — compresses long text using a fast/cheap LLM."""
+"""Summarization tool — compresses long text using a fast/cheap LLM.
 
+Summaries are cached by content hash, so the same worker output reviewed on
+several revisions is only summarized once. ``asummarize_text`` is the async
+entry point for callers already on the event loop (e.g. supervisor review).
+
+Budgets are in tokens (``app.core.tokens``). Text longer than one prompt is
+summarized map-reduce style: split on paragraph/line boundaries into chunks,
+summarize the chunks concurrently (at most SUMMARY_MAX_PARALLEL at a time), then summarize the joined chunk
+summaries — repeating the reduce while they are still too long.
+"""
+
+import asyncio
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 from langchain_core.tools import tool
 from langchain_core.messages import HumanMessage
 
+from app.core.tokens import count_tokens, split_at_tokens, truncate_to_tokens
+
 logger = logging.getLogger(__name__)
 
-DEFAULT_MAX_LENGTH = 3000  # characters threshold
+DEFAULT_MAX_TOKENS = 750  # texts within this budget are returned as-is
+CHUNK_TOKENS = 2000  # tokens of source text per summarization prompt
+SUMMARY_MAX_PARALLEL = 4
+MAX_REDUCE_ROUNDS = 3
+SUMMARY_CACHE_SIZE = 256
+
+SUMMARY_PROMPT = (
+    "Summarize the following text concisely while preserving all key information, "
+    "facts, and conclusions. Keep the summary under 2000 characters.\n\n"
+    "Text:\n{text}"
+)
+
+CHUNK_PROMPT = (
+    "The following is part {index} of {total} of a longer text. Summarize it concisely, "
+    "keeping every fact, number, name, error and conclusion a reader of the full text "
+    "would need. Keep the summary under 1500 characters.\n\n"
+    "Text:\n{text}"
+)
+
+_summary_cache: OrderedDict[str, str] = OrderedDict()
+_summary_cache_lock = threading.Lock()
+
+
+def _cache_key(*parts: object) -> str:
+    return hashlib.sha256("\0".join(str(p) for p in parts).encode()).hexdigest()
+
+
+def _cached(key: str) -> str | None:
+    with _summary_cache_lock:
+        summary = _summary_cache.get(key)
+        if summary is not None:
+            _summary_cache.move_to_end(key)
+        return summary
+
+
+def _store(key: str, summary: str) -> None:
+    with _summary_cache_lock:
+        _summary_cache[key] = summary
+        _summary_cache.move_to_end(key)
+        while len(_summary_cache) > SUMMARY_CACHE_SIZE:
+            _summary_cache.popitem(last=False)
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    return truncate_to_tokens(text, max_tokens, marker="\n[... truncated ...]")
+
+
+def split_chunks(text: str, chunk_tokens: int = CHUNK_TOKENS, provider: str = "") -> list[str]:
+    """Split *text* into chunks of at most *chunk_tokens* tokens.
+
+    Prefers paragraph breaks, then line breaks, and only cuts mid-line for
+    single lines longer than a chunk.
+    """
+    if count_tokens(text, provider) <= chunk_tokens:
+        return [text]
+
+    pieces: list[tuple[str, int]] = []
+    for para in text.split("\n\n"):
+        para_tokens = count_tokens(para, provider)
+        if para_tokens <= chunk_tokens:
+            pieces.append((para, para_tokens))
+            continue
+        for line in para.split("\n"):
+            while (line_tokens := count_tokens(line, provider)) > chunk_tokens:
+                head, line = split_at_tokens(line, chunk_tokens, provider)
+                pieces.append((head, count_tokens(head, provider)))
+            pieces.append((line, line_tokens))
+
+    chunks: list[str] = []
+    current, current_tokens = "", 0
+    for piece, piece_tokens in pieces:
+        # +1 for the paragraph separator
+        if current and current_tokens + 1 + piece_tokens > chunk_tokens:
+            chunks.append(current)
+            current, current_tokens = "", 0
+        current = f"{current}\n\n{piece}" if current else piece
+        current_tokens += piece_tokens + (1 if current_tokens else 0)
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _chunk_prompt(chunk: str, index: int, total: int) -> list:
+    if total == 1:
+        return [HumanMessage(content=SUMMARY_PROMPT.format(text=chunk))]
+    return [HumanMessage(content=CHUNK_PROMPT.format(index=index, total=total, text=chunk))]
+
+
+def _join(summaries: list[str]) -> str:
+    return "\n\n".join(summaries)
+
+
+async def _amap_reduce(text: str) -> str:
+    from app.agents.llm_factory import create_llm
+    # Use a fast/cheap model for summarization
+    llm = create_llm(max_tokens=1024)
+    semaphore = asyncio.Semaphore(SUMMARY_MAX_PARALLEL)
+
+    async def summarize_chunk(chunk: str, index: int, total: int) -> str:
+        key = _cache_key("chunk", total > 1, chunk)
+        if (summary := _cached(key)) is not None:
+            return summary
+        async with semaphore:
+            response = await llm.ainvoke(_chunk_prompt(chunk, index, total))
+        summary = str(response.content)
+        _store(key, summary)
+        return summary
+
+    for _ in range(MAX_REDUCE_ROUNDS):
+        chunks = split_chunks(text)
+        summaries = await asyncio.gather(*(
+            summarize_chunk(chunk, i, len(chunks)) for i, chunk in enumerate(chunks, start=1)
+        ))
+        text = _join(summaries)
+        if len(chunks) == 1:
+            return text
+    return text
+
+
+def _map_reduce_sync(text: str) -> str:
+    from app.agents.llm_factory import create_llm
+    llm = create_llm(max_tokens=1024)
+
+    def summarize_chunk(args: tuple[str, int, int]) -> str:
+        chunk, index, total = args
+        key = _cache_key("chunk", total > 1, chunk)
+        if (summary := _cached(key)) is not None:
+            return summary
+        summary = str(llm.invoke(_chunk_prompt(chunk, index, total)).content)
+        _store(key, summary)
+        return summary
+
+    # Threads, not a new event loop: pooled models' async clients belong to
+    # the main loop, while their sync clients are safe to share
+    with ThreadPoolExecutor(max_workers=SUMMARY_MAX_PARALLEL) as pool:
+        for _ in range(MAX_REDUCE_ROUNDS):
+            chunks = split_chunks(text)
+            total = len(chunks)
+            summaries = list(pool.map(summarize_chunk, [(c, i, total) for i, c in enumerate(chunks, start=1)]))
+            text = _join(summaries)
+            if total == 1:
+                return text
+    return text
+
+
+async def asummarize_text(text: str, max_tokens: int = DEFAULT_MAX_TOKENS) -> str:
+    """Async, cached variant of ``summarize_text`` — never blocks the event loop."""
+    if count_tokens(text) <= max_tokens:
+        return text
+    key = _cache_key(max_tokens, text)
+    if (summary := _cached(key)) is not None:
+        return summary
+
+    try:
+        summary = await _amap_reduce(text)
+    except Exception as e:
+        logger.warning("Summarization failed, using truncation: %s", e)
+        return _truncate(text, max_tokens)
+    _store(key, summary)
+    return summary
 
 
 @tool
-def summarize_text(text: str, max_length: int = DEFAULT_MAX_LENGTH) -> str:
+def summarize_text(text: str, max_tokens: int = DEFAULT_MAX_TOKENS) -> str:
     """Summarize long text into a concise version while preserving key information.
 
     Args:
         text: The text to summarize.
-        max_length: Maximum character length threshold. Text shorter than this is returned as-is.
+        max_tokens: Token budget threshold. Text within this many tokens is returned as-is.
     """
-    if len(text) <= max_length:
+    if count_tokens(text) <= max_tokens:
         return text
+    key = _cache_key(max_tokens, text)
+    if (summary := _cached(key)) is not None:
+        return summary
 
     try:
-        from app.agents.llm_factory import create_llm
-        # Use a fast/cheap model for summarization
-        llm = create_llm(max_tokens=1024)
-        prompt = (
-            "Summarize the following text concisely while preserving all key information, "
-            "facts, and conclusions. Keep the summary under 2000 characters.\n\n"
-            f"Text:\n{text[:8000]}"
-        )
-        response = llm.invoke([HumanMessage(content=prompt)])
-        return str(response.content)
+        summary = _map_reduce_sync(text)
     except Exception as e:
         logger.warning("Summarization failed, using truncation: %s", e)
-        return text[:max_length] + "\n[... truncated ...]"
+        return _truncate(text, max_tokens)
+    _store(key, summary)
+    return summary
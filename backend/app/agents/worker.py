@@ -1,9 +1,16 @@
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
+from typing import Any
 
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import HumanMessage, SystemMessage
 from langgraph.prebuilt import create_react_agent
 
-from app.agents.llm_factory import create_llm
-from app.agents.prompts import WORKER_SYSTEM_PROMPT
+from app.agents.context import make_context_hook
+from app.agents.llm_factory import cacheable_content, create_llm
+from app.agents.prompts import WORKER_REVISION_PROMPT, WORKER_SYSTEM_PROMPT
 from app.agents.tools import search_memory, store_memory, summarize_text
 from app.agents.tools_code import read_file, write_file, list_files, search_code, run_command
 from app.agents.tools_tasks import create_task
@@ -27,27 +34,28 @@ TOOL_REGISTRY = {
 }
 
 
+# Compiled agents keyed by (agent_id, config version, tool names). The model is
+# stored alongside so a different pooled client (e.g. another request's API
+# key) gets its own compiled graph.
+_agent_cache: OrderedDict[tuple, tuple[BaseChatModel, Any]] = OrderedDict()
+_agent_cache_lock = threading.Lock()
+_AGENT_CACHE_SIZE = 64
+
+
 def create_worker_agent(
     agent_id: str,
     custom_prompt: str = "",
-    revision: int = 0,
-    revision_feedback: str = "",
     llm_provider: str = "",
     llm_model: str = "",
     tools: list | None = None,
 ):
-    """Create a ReAct worker agent with memory and summarization tools."""
-    llm = create_llm(provider=llm_provider, model=llm_model, max_tokens=4096)
-
-    feedback_text = ""
-    if revision_feedback:
-        feedback_text = f"Supervisor feedback from previous revision:\n{revision_feedback}"
+    """Return a compiled ReAct worker agent, reusing one from the cache when possible.
 
-    system_prompt = WORKER_SYSTEM_PROMPT.format(
-        custom_prompt=custom_prompt or "No additional instructions.",
-        revision=revision,
-        revision_feedback=feedback_text,
-    )
+    Revision number and supervisor feedback are not part of the agent; pass
+    them in the input via ``worker_input_messages``.
+    """
+    # Stream tokens so TelemetryCallbackHandler can forward live deltas
+    llm = create_llm(provider=llm_provider, model=llm_model, max_tokens=4096, streaming=True)
 
     # Use provided tools or dynamically load default tools from config
     if tools is None:
@@ -60,10 +68,52 @@ def create_worker_agent(
                 logger.warning(f"Tool '{tool_name}' not found in TOOL_REGISTRY.")
         tools = default_tools
 
+    config_version = hashlib.sha256(
+        "\0".join((custom_prompt, llm_provider, llm_model)).encode()
+    ).hexdigest()[:16]
+    cache_key = (agent_id, config_version, tuple(t.name for t in tools))
+    with _agent_cache_lock:
+        cached = _agent_cache.get(cache_key)
+        if cached is not None and cached[0] is llm:
+            _agent_cache.move_to_end(cache_key)
+            return cached[1]
+
+    system_prompt = WORKER_SYSTEM_PROMPT.format(
+        custom_prompt=custom_prompt or "No additional instructions.",
+    )
+    context_hook = None
+    if settings.WORKER_CONTEXT_MAX_TOKENS > 0:
+        context_hook = make_context_hook(
+            settings.WORKER_CONTEXT_MAX_TOKENS,
+            settings.WORKER_CONTEXT_KEEP_RECENT,
+            provider=llm_provider,
+        )
     agent = create_react_agent(
         model=llm,
         tools=tools,
-        prompt=system_prompt,
+        # Breakpoint after the system prompt caches it together with the
+        # tool schemas for every ReAct step
+        prompt=SystemMessage(content=cacheable_content(llm, system_prompt)),
+        pre_model_hook=context_hook,
     )
 
+    with _agent_cache_lock:
+        _agent_cache[cache_key] = (llm, agent)
+        _agent_cache.move_to_end(cache_key)
+        while len(_agent_cache) > _AGENT_CACHE_SIZE:
+            _agent_cache.popitem(last=False)
     return agent
+
+
+def worker_input_messages(task_description: str, revision: int = 0, revision_feedback: str = "") -> list:
+    """Input messages for one worker run, including the revision context."""
+    messages = [HumanMessage(content=task_description)]
+    if revision or revision_feedback:
+        feedback_text = ""
+        if revision_feedback:
+            feedback_text = f"Supervisor feedback from previous revision:\n{revision_feedback}"
+        messages.append(HumanMessage(content=WORKER_REVISION_PROMPT.format(
+            revision=revision,
+            revision_feedback=feedback_text,
+        )))
+    return messages
@@ -28,14 +28,15 @@ async def approve_task(task_id: str, data: HumanDecision):
 
     # Resume the graph with the human decision
     try:
-        from app.agents.graph import _compiled_graph, _checkpointer
+        from app.agents.graph import get_compiled_graph
+        from app.core.checkpoint import get_checkpointer
         from datetime import datetime, UTC
         from app.models.domain import SupervisorReview, SupervisorDecision
 
-        if _compiled_graph and _checkpointer:
+        if get_checkpointer() is not None:
             from langgraph.types import Command
             config = {"configurable": {"thread_id": task_id}}
-            await _compiled_graph.ainvoke(
+            await get_compiled_graph().ainvoke(
                 Command(resume={
                     "decision": data.decision,
                     "feedback": data.feedback,
@@ -67,6 +68,9 @@ async def approve_task(task_id: str, data: HumanDecision):
                 task.current_revision += 1
             task.updated_at = datetime.now(UTC).isoformat()
             save_task(task)
+            if task.status == TaskStatus.APPROVED:
+                from app.services.result_cache import remember_result
+                await remember_result(task)
 
             # Broadcast the status change
             await event_bus.publish(WSEvent(
@@ -84,12 +88,9 @@ async def approve_task(task_id: str, data: HumanDecision):
 
             # If revise, re-run the graph in background
             if data.decision == "revise":
-                import asyncio
-                from app.services.task_service import _run_task
-                bg = asyncio.create_task(_run_task(task))
-                from app.services.task_service import _running_tasks
-                _running_tasks.add(bg)
-                bg.add_done_callback(_running_tasks.discard)
+                from app.core.key_context import get_request_keys
+                from app.services.scheduler import scheduler
+                scheduler.submit(task, keys=get_request_keys())
 
     except Exception as e:
         logger.exception("Failed to resume graph for task %s: %s", task_id, e)
@@ -0,0 +1,138 @@
+"""Server-Sent Events stream of a single task's progress.
+
+For clients that cannot use ``/ws`` (CLI tools, proxies that block
+WebSockets). Events come from the shared event bus, are filtered to one
+task server-side, and can be resumed with the standard ``Last-Event-ID``
+header. Event IDs are ``<epoch>:<seq>`` so an ID from before a server
+restart is recognised and answered with ``resync_required``.
+"""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Header, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from app.config import settings
+from app.core.event_bus import event_bus
+from app.models.domain import TERMINAL_STATUSES
+from app.models.schemas import WSEvent
+from app.services import task_service
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/tasks", tags=["events"])
+
+_TERMINAL_VALUES = {s.value for s in TERMINAL_STATUSES}
+
+
+@router.get("/{task_id}/events")
+async def task_events(
+    task_id: str,
+    request: Request,
+    last_event_id: str | None = Header(None),
+):
+    if task_service.get_task(task_id) is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    resume = None if last_event_id is None else _parse_event_id(last_event_id)
+    return StreamingResponse(
+        _stream(request, task_id, resume),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _stream(
+    request: Request,
+    task_id: str,
+    resume: tuple[str, int] | None,
+) -> AsyncIterator[str]:
+    """Send a snapshot (or the replay after *resume*), then live events.
+
+    The listener is registered here rather than in the route, so its
+    ``finally`` always runs: a client gone before streaming starts never
+    registers one.
+    """
+    # Register and note the bus position before reading the task, so every
+    # event newer than the snapshot (or the replay) reaches the listener;
+    # `sent` drops the overlap between them and live events.
+    listener = event_bus.add_listener()
+    sent = event_bus.latest_seq
+    try:
+        if resume is None:
+            task = task_service.get_task(task_id)
+            if task is None:
+                return
+            snapshot = WSEvent(
+                type="task_update",
+                data={"action": "snapshot", "task": task_service.task_summary(task)},
+            )
+            yield _format(snapshot)
+            if _is_terminal(snapshot):
+                return
+        else:
+            missed = event_bus.replay_since(resume[1], resume[0])
+            if missed is None:
+                yield _format(WSEvent(
+                    type="resync_required",
+                    data={"task_id": task_id, "latest_seq": sent, "epoch": event_bus.epoch},
+                ))
+            else:
+                for event in missed:
+                    if _event_task_id(event) == task_id:
+                        yield _format(event)
+                        if _is_terminal(event):
+                            return
+                    sent = max(sent, event.seq)
+
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(
+                    listener.get(), timeout=settings.SSE_HEARTBEAT_INTERVAL,
+                )
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if event.seq and event.seq <= sent:
+                continue
+            if _event_task_id(event) != task_id:
+                continue
+            if event.seq:
+                sent = event.seq
+            yield _format(event)
+            if _is_terminal(event):
+                return
+    finally:
+        event_bus.remove_listener(listener)
+
+
+def _parse_event_id(value: str) -> tuple[str, int]:
+    """``(epoch, seq)`` of a ``Last-Event-ID``; unparsable IDs get an empty epoch."""
+    epoch, _, seq = value.strip().rpartition(":")
+    try:
+        return epoch, max(int(seq), 0)
+    except ValueError:
+        return "", 0
+
+
+def _event_task_id(event: WSEvent) -> str:
+    task = event.data.get("task")
+    if isinstance(task, dict):
+        return task.get("id", "")
+    return event.data.get("task_id", "")
+
+
+def _is_terminal(event: WSEvent) -> bool:
+    task = event.data.get("task")
+    return event.type == "task_update" and isinstance(task, dict) and task.get("status") in _TERMINAL_VALUES
+
+
+def _format(event: WSEvent) -> str:
+    lines = []
+    if event.seq:
+        lines.append(f"id: {event.epoch}:{event.seq}")
+    lines.append(f"event: {event.type}")
+    lines.append(f"data: {event.model_dump_json()}")
+    return "\n".join(lines) + "\n\n"
@@ -5,7 +5,11 @@ from datetime import datetime, UTC
 from fastapi import APIRouter
 
 from app.config import settings
+from app.core.concurrency import concurrency
+from app.core.llm_cache import get_llm_cache
+from app.core.rate_limiter import rate_limiter
 from app.services import agent_service, task_service
+from app.services.scheduler import scheduler
 
 router = APIRouter(tags=["health"])
 
@@ -27,6 +31,7 @@ async def health_details() -> dict:
     sandbox_mode = settings.SANDBOX_MODE
     llm_provider = settings.LLM_PROVIDER
     llm_model = settings.LLM_MODEL
+    llm_cache = get_llm_cache()
 
     return {
         "status": "ok",
@@ -37,4 +42,8 @@ async def health_details() -> dict:
         "sandbox_mode": sandbox_mode,
         "llm_provider": llm_provider,
         "llm_model": llm_model,
+        "scheduler": scheduler.stats(),
+        "rate_limits": rate_limiter.stats(),
+        "provider_concurrency": concurrency.stats(),
+        "llm_cache": llm_cache.stats() if llm_cache else None,
     }
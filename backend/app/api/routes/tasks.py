@@ -1,7 +1,9 @@
+from typing import Literal
+
 from fastapi import APIRouter, HTTPException, Query
 
-from app.models.schemas import TaskCreate, TaskResponse, TaskListResponse
-from app.services import task_service
+from app.models.schemas import TaskCreate, TaskResponse, TaskListResponse, TaskChangesResponse
+from app.services import task_service, task_waiters
 
 router = APIRouter(prefix="/api/tasks", tags=["tasks"])
 
@@ -12,6 +14,21 @@ async def list_tasks(skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, l
     return [_to_list_response(t) for t in tasks]
 
 
+# Declared before /{task_id} so "changes" isn't captured as a task ID
+@router.get("/changes", response_model=TaskChangesResponse)
+async def list_task_changes(since: str = "", limit: int = Query(100, ge=1, le=500)):
+    """Delta sync: summaries of tasks updated since the *since* cursor."""
+    try:
+        tasks, cursor, has_more = task_service.list_task_changes(since, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "tasks": [_to_list_response(t) for t in tasks],
+        "cursor": cursor,
+        "has_more": has_more,
+    }
+
+
 @router.get("/{task_id}", response_model=TaskResponse)
 async def get_task(task_id: str):
     task = task_service.get_task(task_id)
@@ -20,6 +37,23 @@ async def get_task(task_id: str):
     return _to_detail_response(task)
 
 
+@router.get("/{task_id}/wait", response_model=TaskResponse)
+async def wait_for_task(
+    task_id: str,
+    timeout: float = Query(60, gt=0, le=300),
+    until: Literal["terminal", "settled"] = "terminal",
+):
+    """Long-poll: return the task once it reaches *until*, or its current state after *timeout*."""
+    task = task_service.get_task(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    statuses = task_waiters.WAIT_TARGETS[until]
+    if task.status not in statuses:
+        await task_waiters.wait_for_status(task_id, statuses, timeout)
+        task = task_service.get_task(task_id) or task
+    return _to_detail_response(task)
+
+
 @router.post("", response_model=TaskResponse, status_code=201)
 async def create_task(data: TaskCreate):
     task = await task_service.create_task(data)
@@ -75,4 +109,6 @@ def _to_detail_response(task) -> dict:
         "depth": task.depth,
         "child_task_ids": task.child_task_ids,
         "spawned_by_agent": task.spawned_by_agent,
+        "cache_decision": task.cache_decision,
+        "cache_source_task_id": task.cache_source_task_id,
     }
@@ -1,7 +1,8 @@
 import asyncio
+import json
 import logging
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
 
 from app.config import settings
 from app.core.ws_manager import ws_manager
@@ -12,16 +13,22 @@ router = APIRouter()
 
 
 @router.websocket("/ws")
-async def websocket_endpoint(ws: WebSocket):
-    await ws_manager.connect(ws)
+async def websocket_endpoint(
+    ws: WebSocket,
+    since: int | None = Query(None, ge=0),
+    epoch: str | None = Query(None),
+):
+    # ?since=<seq>&epoch=<epoch> replays events missed while the client was disconnected
+    await ws_manager.connect(ws, since=since, epoch=epoch)
     try:
         while True:
             try:
                 # Wait for client message with heartbeat timeout
-                await asyncio.wait_for(
+                message = await asyncio.wait_for(
                     ws.receive_text(),
                     timeout=settings.WS_HEARTBEAT_INTERVAL,
                 )
+                _handle_client_message(ws, message)
             except asyncio.TimeoutError:
                 # Send ping to check if client is alive
                 try:
@@ -35,3 +42,21 @@ async def websocket_endpoint(ws: WebSocket):
         logger.error(f"WebSocket error for client {ws.client}: {e}", exc_info=True)
     finally:
         await ws_manager.disconnect(ws)
+
+
+def _handle_client_message(ws: WebSocket, message: str) -> None:
+    """Apply subscribe/unsubscribe requests for task-scoped stream events.
+
+    Clients send ``{"type": "subscribe", "task_id": "..."}`` to receive
+    ``worker_token`` deltas for that task. Anything else (e.g. pong) is ignored.
+    """
+    try:
+        msg = json.loads(message)
+    except ValueError:
+        return
+    if not isinstance(msg, dict) or not msg.get("task_id"):
+        return
+    if msg.get("type") == "subscribe":
+        ws_manager.subscribe(ws, str(msg["task_id"]))
+    elif msg.get("type") == "unsubscribe":
+        ws_manager.unsubscribe(ws, str(msg["task_id"]))
@@ -20,19 +20,54 @@ class Settings(BaseSettings):
     # Storage
     STORAGE_BACKEND: str = "memory"  # "memory" | "postgres"
     DATABASE_URL: str = "sqlite:///./saladin.db"
+    CHECKPOINT_POOL_SIZE: int = 10  # max Postgres connections for graph checkpoints
+    CHECKPOINT_SQLITE_PATH: str = "./checkpoints.db"  # used when DATABASE_URL is SQLite
+    CHECKPOINT_KEEP_ACTIVE: int = 5  # checkpoints kept per running/interrupted task
+    CHECKPOINT_RETENTION_SECONDS: int = 7 * 86400  # finished tasks' threads deleted after this (0 = never)
+    CHECKPOINT_PRUNE_INTERVAL_SECONDS: int = 600  # 0 = no background pruning
+    CHECKPOINT_COMPRESSION: str = "zstd"  # "zstd" | "zlib" | "none"
+    CHECKPOINT_COMPRESS_MIN_BYTES: int = 2048  # smaller payloads are stored uncompressed
 
     CHROMA_PERSIST_DIR: str = "./chroma_data"
     CORS_ORIGINS: list[str] = ["http://localhost:5173"]
     WS_HEARTBEAT_INTERVAL: int = 30
+    EVENT_REPLAY_BUFFER_SIZE: int = 1000  # events kept for /ws?since= resume
+    TOKEN_STREAM_FLUSH_MS: int = 50  # batch window for worker_token deltas
+    SSE_HEARTBEAT_INTERVAL: int = 15  # seconds between SSE keep-alive comments
     MAX_REVISIONS: int = 3
 
     # Redis / queue
     REDIS_URL: str = "redis://localhost:6379"
     USE_QUEUE: bool = False
     RATE_LIMIT_RPM: int = 60
+    # Tokens-per-minute limits per provider key (0 = disabled)
+    RATE_LIMIT_INPUT_TPM: int = 0
+    RATE_LIMIT_OUTPUT_TPM: int = 0
+    # Adaptive (AIMD) in-flight LLM call limit per provider key
+    ADAPTIVE_CONCURRENCY: bool = True
+    ADAPTIVE_INITIAL_CONCURRENCY: int = 4
+    ADAPTIVE_MIN_CONCURRENCY: int = 1
+    ADAPTIVE_MAX_CONCURRENCY: int = 16
+    # Max distinct LLM clients kept alive for reuse (0 = build per call)
+    LLM_CLIENT_POOL_SIZE: int = 32
+    # Exact-match LLM response cache (opt-in)
+    LLM_CACHE_ENABLED: bool = False
+    LLM_CACHE_PATH: str = "./llm_cache.db"
+    LLM_CACHE_MAX_MB: int = 256
+    LLM_CACHE_TTL_SECONDS: int = 86400
+    # Mark stable prompt prefixes for provider-side prompt caching
+    PROMPT_CACHING: bool = True
+    # Semantic result cache: reuse approved results for near-duplicate tasks
+    SEMANTIC_CACHE_ENABLED: bool = False
+    SEMANTIC_CACHE_THRESHOLD: float = 0.92  # cosine similarity
+    SEMANTIC_CACHE_MODE: str = "seed"  # "seed" | "return"
 
     # Graph execution
     GRAPH_TIMEOUT_SECONDS: int = 600  # 10 minute global timeout per task
+    WORKER_TIMEOUT_SECONDS: int = 300  # per-worker deadline per revision; 0 disables
+    WORKER_LATE_RESULTS: bool = False  # let timed-out workers finish into the next revision
+    MAX_CONCURRENT_GRAPHS: int = 4  # scheduler cap; extra tasks wait in a priority queue
+    RECOVER_TASKS_ON_STARTUP: bool = True  # requeue/resume tasks orphaned by a restart
 
     # Self-improvement safety limits
     MAX_TASK_DEPTH: int = 3
@@ -49,6 +84,11 @@ class Settings(BaseSettings):
     SANDBOX_TIMEOUT: int = 30
     SANDBOX_NETWORK: bool = False
     SANDBOX_VOLUME_NAME: str = "saladin_workspace"
+    # Coding tool results over this are cut to head + tail and saved in full
+    # under TOOL_OUTPUT_DIR (outside the workspace) for paging
+    TOOL_OUTPUT_MAX_TOKENS: int = 4000
+    TOOL_OUTPUT_DIR: str = "./tool_outputs"
+    TOOL_OUTPUT_RETENTION_SECONDS: int = 86400
 
     # Broadcast loop
     BROADCAST_ERROR_DELAY: int = 5
@@ -58,6 +98,10 @@ class Settings(BaseSettings):
     SANDBOX_PULL_RETRIES: int = 3
     SANDBOX_PULL_RETRY_DELAY: int = 10
 
+    # Worker ReAct context: older steps are summarized/dropped past this budget
+    WORKER_CONTEXT_MAX_TOKENS: int = 24000  # 0 = send the full history
+    WORKER_CONTEXT_KEEP_RECENT: int = 6  # most recent messages always sent verbatim
+
     # Worker Agent Tools
     DEFAULT_WORKER_TOOL_NAMES: list[str] = [
         "search_memory",
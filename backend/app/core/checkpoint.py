@@ -0,0 +1,227 @@
+"""LangGraph checkpointer lifecycle.
+
+Checkpoints are written after every graph node, so the saver must be async:
+``AsyncPostgresSaver`` on a bounded psycopg pool for a Postgres
+``DATABASE_URL``, ``AsyncSqliteSaver`` otherwise. The saver is opened once
+per process (FastAPI lifespan / ARQ worker startup) and closed on shutdown.
+With the in-memory storage backend there is no checkpointer. Payloads are
+compressed by ``app.core.serde.CompressedSerializer``.
+
+``prune_checkpoints`` bounds the checkpoint tables: threads of terminal
+tasks keep only their latest checkpoint and are deleted after
+``CHECKPOINT_RETENTION_SECONDS``; other threads keep the latest
+``CHECKPOINT_KEEP_ACTIVE``. The API process runs it periodically via
+``prune_loop``.
+"""
+
+import asyncio
+import logging
+import re
+from datetime import UTC, datetime
+
+from app.config import settings
+from app.core.serde import make_checkpoint_serde
+
+logger = logging.getLogger(__name__)
+
+_checkpointer = None
+_conn = None  # psycopg pool or aiosqlite connection behind the saver
+_close = None  # coroutine function releasing _conn
+
+
+def get_checkpointer():
+    """The open checkpointer, or None when disabled or not opened."""
+    return _checkpointer
+
+
+def _postgres_conninfo(url: str) -> str:
+    # SQLAlchemy URLs name a driver ("postgresql+psycopg2://"); psycopg doesn't
+    return re.sub(r"^postgres(ql)?(\+\w+)?://", "postgresql://", url)
+
+
+async def _open_postgres():
+    from psycopg.rows import dict_row
+    from psycopg_pool import AsyncConnectionPool
+    from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+
+    pool = AsyncConnectionPool(
+        _postgres_conninfo(settings.DATABASE_URL),
+        min_size=1,
+        max_size=settings.CHECKPOINT_POOL_SIZE,
+        kwargs={"autocommit": True, "prepare_threshold": 0, "row_factory": dict_row},
+        open=False,
+    )
+    await pool.open()
+    saver = AsyncPostgresSaver(pool, serde=make_checkpoint_serde())
+    await saver.setup()
+    return saver, pool, pool.close
+
+
+async def _open_sqlite():
+    import aiosqlite
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+    # Separate file: checkpoint writes would otherwise contend for the
+    # database lock with the task repository's engine
+    conn = await aiosqlite.connect(settings.CHECKPOINT_SQLITE_PATH)
+    saver = AsyncSqliteSaver(conn, serde=make_checkpoint_serde())
+    await saver.setup()
+    return saver, conn, conn.close
+
+
+async def open_checkpointer():
+    """Open the process-wide checkpointer for the configured backend."""
+    global _checkpointer, _conn, _close
+    if _checkpointer is not None or settings.STORAGE_BACKEND != "postgres":
+        return _checkpointer
+
+    is_postgres = settings.DATABASE_URL.startswith("postgres")
+    try:
+        _checkpointer, _conn, _close = await (_open_postgres() if is_postgres else _open_sqlite())
+    except Exception as e:
+        logger.warning("Checkpointer not available, running without: %s", e)
+        return None
+    logger.info("Checkpointer opened (%s)", type(_checkpointer).__name__)
+    return _checkpointer
+
+
+async def close_checkpointer() -> None:
+    """Close the checkpointer's pool or connection."""
+    global _checkpointer, _conn, _close
+    if _close is not None:
+        try:
+            await _close()
+        except Exception as e:
+            logger.warning("Error closing checkpointer: %s", e)
+    _checkpointer = None
+    _conn = None
+    _close = None
+
+
+# ---------------------------------------------------------------------------
+# Pruning
+# ---------------------------------------------------------------------------
+
+# Keep the newest N checkpoints per namespace (checkpoint IDs sort by time),
+# then drop writes and blobs no remaining checkpoint refers to.
+_PG_KEEP_LATEST = (
+    """
+    DELETE FROM checkpoints c USING (
+        SELECT checkpoint_ns, checkpoint_id,
+               ROW_NUMBER() OVER (PARTITION BY checkpoint_ns ORDER BY checkpoint_id DESC) AS rn
+        FROM checkpoints WHERE thread_id = %(thread_id)s
+    ) r
+    WHERE c.thread_id = %(thread_id)s AND c.checkpoint_ns = r.checkpoint_ns
+      AND c.checkpoint_id = r.checkpoint_id AND r.rn > %(keep)s
+    """,
+    """
+    DELETE FROM checkpoint_writes w
+    WHERE w.thread_id = %(thread_id)s AND NOT EXISTS (
+        SELECT 1 FROM checkpoints c
+        WHERE c.thread_id = w.thread_id AND c.checkpoint_ns = w.checkpoint_ns
+          AND c.checkpoint_id = w.checkpoint_id
+    )
+    """,
+    """
+    DELETE FROM checkpoint_blobs b
+    WHERE b.thread_id = %(thread_id)s AND NOT EXISTS (
+        SELECT 1 FROM checkpoints c
+        WHERE c.thread_id = b.thread_id AND c.checkpoint_ns = b.checkpoint_ns
+          AND c.checkpoint -> 'channel_versions' ->> b.channel = b.version
+    )
+    """,
+)
+
+_SQLITE_KEEP_LATEST = (
+    """
+    DELETE FROM checkpoints
+    WHERE thread_id = :thread_id AND (checkpoint_ns, checkpoint_id) IN (
+        SELECT checkpoint_ns, checkpoint_id FROM (
+            SELECT checkpoint_ns, checkpoint_id,
+                   ROW_NUMBER() OVER (PARTITION BY checkpoint_ns ORDER BY checkpoint_id DESC) AS rn
+            FROM checkpoints WHERE thread_id = :thread_id
+        ) WHERE rn > :keep
+    )
+    """,
+    """
+    DELETE FROM writes
+    WHERE thread_id = :thread_id AND NOT EXISTS (
+        SELECT 1 FROM checkpoints c
+        WHERE c.thread_id = writes.thread_id AND c.checkpoint_ns = writes.checkpoint_ns
+          AND c.checkpoint_id = writes.checkpoint_id
+    )
+    """,
+)
+
+
+async def _thread_ids() -> list[str]:
+    query = "SELECT DISTINCT thread_id FROM checkpoints"
+    if settings.DATABASE_URL.startswith("postgres"):
+        async with _conn.connection() as conn:
+            rows = await (await conn.execute(query)).fetchall()
+        return [row["thread_id"] for row in rows]
+    async with _checkpointer.lock:
+        async with _conn.execute(query) as cursor:
+            return [row[0] for row in await cursor.fetchall()]
+
+
+async def _keep_latest(thread_id: str, keep: int) -> None:
+    params = {"thread_id": thread_id, "keep": keep}
+    if settings.DATABASE_URL.startswith("postgres"):
+        async with _conn.connection() as conn:
+            for statement in _PG_KEEP_LATEST:
+                await conn.execute(statement, params)
+        return
+    async with _checkpointer.lock:
+        for statement in _SQLITE_KEEP_LATEST:
+            await _conn.execute(statement, params)
+        await _conn.commit()
+
+
+def _age_seconds(timestamp: str) -> float:
+    try:
+        then = datetime.fromisoformat(timestamp)
+    except ValueError:
+        return 0.0
+    if then.tzinfo is None:
+        then = then.replace(tzinfo=UTC)
+    return (datetime.now(UTC) - then).total_seconds()
+
+
+async def prune_checkpoints() -> dict[str, int]:
+    """Apply the retention policy to every checkpointed thread once."""
+    from app.core.repository import get_task_repo
+    from app.models.domain import TERMINAL_STATUSES
+
+    stats = {"deleted": 0, "pruned": 0}
+    if _checkpointer is None:
+        return stats
+
+    thread_ids = await _thread_ids()
+    # One query for every thread, off the event loop
+    tasks = await asyncio.to_thread(get_task_repo().status_by_id, thread_ids)
+    for thread_id in thread_ids:
+        status, updated_at = tasks.get(thread_id, (None, ""))
+        if status is None or (
+            status in TERMINAL_STATUSES
+            and settings.CHECKPOINT_RETENTION_SECONDS > 0
+            and _age_seconds(updated_at) > settings.CHECKPOINT_RETENTION_SECONDS
+        ):
+            await _checkpointer.adelete_thread(thread_id)
+            stats["deleted"] += 1
+            continue
+        keep = 1 if status in TERMINAL_STATUSES else settings.CHECKPOINT_KEEP_ACTIVE
+        await _keep_latest(thread_id, max(keep, 1))
+        stats["pruned"] += 1
+    return stats
+
+
+async def prune_loop() -> None:
+    """Run ``prune_checkpoints`` every CHECKPOINT_PRUNE_INTERVAL_SECONDS."""
+    while True:
+        await asyncio.sleep(settings.CHECKPOINT_PRUNE_INTERVAL_SECONDS)
+        try:
+            stats = await prune_checkpoints()
+            logger.info("Checkpoint pruning: %(deleted)d threads deleted, %(pruned)d compacted", stats)
+        except Exception as e:
+            logger.warning("Checkpoint pruning failed: %s", e)
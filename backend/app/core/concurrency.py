@@ -0,0 +1,198 @@
+"""Adaptive (AIMD) concurrency control per provider key.
+
+Each provider key gets a controller that limits in-flight LLM calls. The
+limit grows by roughly one slot per window of successful calls (additive
+increase) and is halved when the provider answers with a rate-limit or
+overload error (multiplicative decrease). Slow responses hold the limit
+steady instead of growing it. Limit changes are pushed to the RPM bucket
+for the same key.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+
+from app.config import settings
+from app.core.rate_limiter import rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses providers use for "slow down": 429 rate limit, 503 unavailable,
+# 529 Anthropic overloaded
+_OVERLOAD_STATUS_CODES = {429, 503, 529}
+_OVERLOAD_MARKERS = ("rate limit", "rate_limit", "ratelimit", "overloaded", "resource exhausted", "resource_exhausted", "too many requests")
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """True if *error* looks like a provider rate-limit or overload response."""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        response = getattr(error, "response", None)
+        status = getattr(response, "status_code", None)
+    if status in _OVERLOAD_STATUS_CODES:
+        return True
+    text = f"{type(error).__name__} {error}".lower()
+    return any(marker in text for marker in _OVERLOAD_MARKERS)
+
+
+class AIMDController:
+    """Additive-increase / multiplicative-decrease limit on concurrent calls.
+
+    State is guarded by a thread lock because sync model calls run in worker
+    threads. Async callers wait on an ``asyncio.Condition``, sync callers on
+    a ``threading.Condition``; both are woken when a slot frees up or the
+    limit grows.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int = 1,
+        maximum: int = 16,
+        backoff: float = 0.5,
+        cooldown: float = 5.0,
+        slow_factor: float = 2.0,
+    ) -> None:
+        self.minimum = minimum
+        self.maximum = maximum
+        self.initial = min(max(initial, minimum), maximum)
+        self.limit = float(self.initial)
+        self.backoff = backoff
+        self.cooldown = cooldown  # one cut per burst of in-flight failures
+        self.slow_factor = slow_factor
+        self.in_flight = 0
+        self.latency_ewma: float | None = None
+        self._last_cut = 0.0
+        self._lock = threading.Lock()
+        self._freed = threading.Condition(self._lock)
+        # Created on first async wait, for the loop that waits
+        self._waiters: asyncio.Condition | None = None
+        self._waiters_loop: asyncio.AbstractEventLoop | None = None
+        self._wakeups: set[asyncio.Task] = set()
+
+    def _take(self) -> bool:
+        if self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return True
+        return False
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            return self._take()
+
+    async def acquire(self) -> float:
+        """Wait for a free slot. Returns seconds spent waiting."""
+        start = time.monotonic()
+        if not self.try_acquire():
+            loop = asyncio.get_running_loop()
+            if self._waiters_loop is not loop:
+                self._waiters, self._waiters_loop = asyncio.Condition(), loop
+            waiters = self._waiters
+            async with waiters:
+                await waiters.wait_for(self.try_acquire)
+        return time.monotonic() - start
+
+    def acquire_sync(self) -> float:
+        """Blocking variant of acquire() for synchronous model calls."""
+        start = time.monotonic()
+        with self._freed:
+            self._freed.wait_for(self._take)
+        return time.monotonic() - start
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            self._freed.notify()
+        self._wake()
+
+    def _wake(self) -> None:
+        """Have async waiters re-check for a slot; callable from any thread."""
+        waiters, loop = self._waiters, self._waiters_loop
+        if waiters is None or loop.is_closed():
+            return
+
+        async def notify() -> None:
+            async with waiters:
+                waiters.notify_all()
+
+        def schedule() -> None:
+            task = loop.create_task(notify())
+            self._wakeups.add(task)
+            task.add_done_callback(self._wakeups.discard)
+
+        loop.call_soon_threadsafe(schedule)
+
+    def on_success(self, latency: float) -> bool:
+        """Record a successful call. Returns True if the limit changed."""
+        with self._lock:
+            baseline = self.latency_ewma
+            self.latency_ewma = latency if baseline is None else 0.9 * baseline + 0.1 * latency
+            if baseline is not None and latency > self.slow_factor * baseline:
+                return False  # provider is slowing down — hold
+            old = int(self.limit)
+            self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            grew = int(self.limit) != old
+            if grew:
+                self._freed.notify_all()
+        if grew:
+            self._wake()
+        return grew
+
+    def on_overload(self) -> bool:
+        """Record a rate-limit/overload error. Returns True if the limit changed."""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_cut < self.cooldown:
+                return False
+            self._last_cut = now
+            old = self.limit
+            self.limit = max(float(self.minimum), self.limit * self.backoff)
+            return self.limit != old
+
+    @property
+    def ratio(self) -> float:
+        """Current limit relative to the starting limit, capped at 1."""
+        return min(1.0, self.limit / self.initial)
+
+
+class ConcurrencyRegistry:
+    """AIMD controllers keyed like the rate limiter buckets ("provider:key_hash")."""
+
+    def __init__(self) -> None:
+        self._controllers: dict[str, AIMDController] = {}
+
+    def get(self, key: str) -> AIMDController:
+        if key not in self._controllers:
+            self._controllers[key] = AIMDController(
+                initial=settings.ADAPTIVE_INITIAL_CONCURRENCY,
+                minimum=settings.ADAPTIVE_MIN_CONCURRENCY,
+                maximum=settings.ADAPTIVE_MAX_CONCURRENCY,
+            )
+        return self._controllers[key]
+
+    def record_success(self, key: str, latency: float) -> None:
+        if self.get(key).on_success(latency):
+            self._changed(key)
+
+    def record_overload(self, key: str) -> None:
+        if self.get(key).on_overload():
+            logger.warning("Provider %s overloaded, concurrency cut to %d", key, int(self.get(key).limit))
+            self._changed(key)
+
+    def _changed(self, key: str) -> None:
+        # Pace the RPM bucket in proportion to the allowed concurrency
+        rate_limiter.set_rate_factor(key, self.get(key).ratio)
+
+    def stats(self) -> dict[str, dict]:
+        return {
+            key: {
+                "limit": int(c.limit),
+                "in_flight": c.in_flight,
+                "latency_ewma": round(c.latency_ewma, 3) if c.latency_ewma is not None else None,
+            }
+            for key, c in self._controllers.items()
+        }
+
+
+concurrency = ConcurrencyRegistry()
@@ -2,6 +2,7 @@
 
 import logging
 
+from sqlalchemy import inspect, literal, text
 from sqlmodel import SQLModel, Session, create_engine
 
 from app.config import settings
@@ -24,8 +25,60 @@ def init_db():
     # Import models so SQLModel registers them
     import app.models.database  # noqa: F401
     SQLModel.metadata.create_all(engine)
+    add_missing_columns(engine)
+    create_missing_indexes(engine)
     logger.info("Database tables initialized")
 
 
+def add_missing_columns(engine) -> None:
+    """Add columns declared on models to tables that existed before them.
+
+    Existing rows get the column's scalar default (e.g. "" for the
+    tasks.cache_* columns), so they load like rows written afterwards.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    preparer = engine.dialect.identifier_preparer
+    for table in SQLModel.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {col["name"] for col in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            ddl = (
+                f"ALTER TABLE {preparer.format_table(table)}"
+                f" ADD COLUMN {preparer.format_column(column)} {column.type.compile(dialect=engine.dialect)}"
+            )
+            if column.default is not None and column.default.is_scalar:
+                default = literal(column.default.arg).compile(
+                    dialect=engine.dialect, compile_kwargs={"literal_binds": True},
+                )
+                ddl += f" DEFAULT {default}"
+                if not column.nullable:
+                    ddl += " NOT NULL"
+            with engine.begin() as conn:
+                conn.execute(text(ddl))
+            logger.info("Added column %s.%s", table.name, column.name)
+
+
+def create_missing_indexes(engine) -> None:
+    """Add indexes declared on models to tables that existed before them.
+
+    create_all() skips existing tables entirely, so an index added to a
+    model later (e.g. tasks.updated_at) would only exist on fresh databases.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    for table in SQLModel.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {ix["name"] for ix in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(engine)
+                logger.info("Created index %s on %s", index.name, table.name)
+
+
 def get_session() -> Session:
     return Session(get_engine())
@@ -1,16 +1,34 @@
 import asyncio
 import logging
+import uuid
+from collections import deque
 
-from app.models.schemas import WSEvent
+from app.config import settings
+from app.models.schemas import STREAM_EVENT_TYPES, WSEvent
 
 logger = logging.getLogger(__name__)
 
 
 class EventBus:
-    def __init__(self, maxsize: int = 1000) -> None:
+    def __init__(self, maxsize: int = 1000, replay_size: int | None = None) -> None:
         self._queue: asyncio.Queue[WSEvent] = asyncio.Queue(maxsize=maxsize)
+        # Monotonic sequence numbers + bounded replay buffer for resume-on-reconnect
+        self._seq = 0
+        # Sequence numbers restart with the process; the epoch tells a resuming
+        # client whether its seq came from this bus at all
+        self.epoch = uuid.uuid4().hex[:12]
+        self._replay: deque[WSEvent] = deque(
+            maxlen=replay_size if replay_size is not None else settings.EVENT_REPLAY_BUFFER_SIZE
+        )
+        # Extra per-consumer queues (e.g. SSE streams) fed alongside the main queue
+        self._listeners: set[asyncio.Queue[WSEvent]] = set()
 
     async def publish(self, event: WSEvent) -> None:
+        if event.type not in STREAM_EVENT_TYPES:
+            self._seq += 1
+            event.seq = self._seq
+            event.epoch = self.epoch
+            self._replay.append(event)
         try:
             self._queue.put_nowait(event)
         except asyncio.QueueFull:
@@ -21,6 +39,12 @@ class EventBus:
                 logger.debug("Attempted to drop event from an already empty queue.")
             self._queue.put_nowait(event)
             logger.warning("Event bus full, dropped oldest event")
+        for listener in self._listeners:
+            try:
+                listener.put_nowait(event)
+            except asyncio.QueueFull:
+                # Slow consumer — it can resume from its last seq via replay
+                logger.debug("Event listener full, dropped event seq=%d", event.seq)
 
     async def subscribe(self) -> WSEvent:
         return await self._queue.get()
@@ -28,5 +52,34 @@ class EventBus:
     def empty(self) -> bool:
         return self._queue.empty()
 
+    def add_listener(self, maxsize: int = 1000) -> asyncio.Queue[WSEvent]:
+        """Register an extra consumer queue that receives every published event."""
+        listener: asyncio.Queue[WSEvent] = asyncio.Queue(maxsize=maxsize)
+        self._listeners.add(listener)
+        return listener
+
+    def remove_listener(self, listener: asyncio.Queue[WSEvent]) -> None:
+        self._listeners.discard(listener)
+
+    @property
+    def latest_seq(self) -> int:
+        return self._seq
+
+    def replay_since(self, seq: int, epoch: str | None) -> list[WSEvent] | None:
+        """Return buffered events with a sequence number greater than *seq*.
+
+        Returns None when the gap can't be replayed — either the missed events
+        have already fallen out of the ring buffer, or *seq* belongs to another
+        *epoch* (the server restarted and the counter was reset). Callers
+        should treat None as "reload a full snapshot".
+        """
+        if epoch != self.epoch or seq > self._seq:
+            return None
+        if seq == self._seq:
+            return []
+        if not self._replay or self._replay[0].seq > seq + 1:
+            return None
+        return [e for e in self._replay if e.seq > seq]
+
 
 event_bus = EventBus()
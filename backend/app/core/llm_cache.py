@@ -0,0 +1,198 @@
+"""Exact-match LLM response cache stored in a size-bounded SQLite file.
+
+Plugged into chat models through LangChain's ``cache=`` hook, which keys
+lookups on the serialized messages (message ids stripped) and the model's
+``llm_string`` (provider, model and call parameters). Models get a
+``scoped`` view per API key, so BYOK tenants never share entries even when
+prompt and model match. Entries expire after
+a TTL and the least recently used ones are evicted once the total stored
+size passes the limit. Hits are marked in ``response_metadata`` so
+callbacks can tell them apart from real provider calls.
+"""
+
+import contextvars
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+CACHE_HIT_KEY = "llm_cache_hit"
+
+_bypass: contextvars.ContextVar[bool] = contextvars.ContextVar("llm_cache_bypass", default=False)
+
+
+@contextmanager
+def bypass_llm_cache() -> Iterator[None]:
+    """Skip the response cache (no lookup, no store) for calls made inside the block."""
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def is_cache_hit(response: Any) -> bool:
+    """True if an LLMResult was served from the response cache."""
+    for generations in getattr(response, "generations", None) or []:
+        for gen in generations:
+            message = getattr(gen, "message", None)
+            if message is not None and message.response_metadata.get(CACHE_HIT_KEY):
+                return True
+    return False
+
+
+class SQLiteLRUCache(BaseCache):
+    """LangChain cache backed by one SQLite table with TTL and LRU eviction."""
+
+    def __init__(self, path: str, max_bytes: int, ttl_seconds: int) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_accessed ON llm_cache (accessed_at)")
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\0{prompt}".encode()).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Sequence | None:
+        if _bypass.get():
+            return None
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, size, created_at FROM llm_cache WHERE key = ?", (key,),
+            ).fetchone()
+            if row is not None and now - row[2] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._total_bytes -= row[1]
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        try:
+            generations = loads(row[0], allowed_objects="core")
+        except Exception as e:
+            logger.warning("Dropping unreadable LLM cache entry: %s", e)
+            return None
+        for gen in generations:
+            message = getattr(gen, "message", None)
+            if message is not None:
+                message.response_metadata[CACHE_HIT_KEY] = True
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence) -> None:
+        if _bypass.get():
+            return
+        value = dumps(list(return_val))
+        size = len(value)
+        if size > self.max_bytes:
+            return
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if old is not None:
+                self._total_bytes -= old[0]
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now),
+            )
+            self._total_bytes += size
+            self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until under max_bytes. Caller holds the lock."""
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM llm_cache ORDER BY accessed_at LIMIT 32",
+            ).fetchall()
+            if not rows:
+                self._total_bytes = 0
+                return
+            for key, size in rows:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._total_bytes -= size
+                if self._total_bytes <= self.max_bytes:
+                    return
+
+    def scoped(self, scope: str) -> BaseCache:
+        """View of this cache whose entries are only visible under *scope*."""
+        return _ScopedCache(self, scope) if scope else self
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._total_bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+class _ScopedCache(BaseCache):
+    """Entries of a shared cache, namespaced by a scope such as an API key digest."""
+
+    def __init__(self, inner: SQLiteLRUCache, scope: str) -> None:
+        self.inner = inner
+        self.scope = scope
+
+    def lookup(self, prompt: str, llm_string: str) -> Sequence | None:
+        return self.inner.lookup(prompt, f"{self.scope}\0{llm_string}")
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence) -> None:
+        self.inner.update(prompt, f"{self.scope}\0{llm_string}", return_val)
+
+    def clear(self, **kwargs: Any) -> None:
+        self.inner.clear(**kwargs)
+
+
+_cache: SQLiteLRUCache | None = None
+
+
+def get_llm_cache() -> SQLiteLRUCache | None:
+    """Shared response cache, or None when LLM_CACHE_ENABLED is off."""
+    global _cache
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = SQLiteLRUCache(
+            settings.LLM_CACHE_PATH,
+            max_bytes=settings.LLM_CACHE_MAX_MB * 1024 * 1024,
+            ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+        )
+    return _cache
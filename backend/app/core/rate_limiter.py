@@ -1,9 +1,13 @@
-"""Async rate limiter using leaky bucket algorithm."""
+"""Rate limiter using leaky bucket algorithm, usable from sync and async code."""
 
 import asyncio
 import hashlib
 import logging
+import threading
 import time
+from dataclasses import dataclass
+
+from langchain_core.rate_limiters import BaseRateLimiter
 
 from app.config import settings
 
@@ -11,7 +15,12 @@ logger = logging.getLogger(__name__)
 
 
 class LeakyBucket:
-    """Async leaky bucket rate limiter."""
+    """Leaky bucket rate limiter.
+
+    Callers reserve a token up front (the balance may go negative) and then
+    sleep for their share of the deficit, so concurrent waiters are served in
+    order without holding a lock while sleeping.
+    """
 
     def __init__(self, rate: float, capacity: int):
         """
@@ -21,27 +30,153 @@ class LeakyBucket:
         """
         self.rate = rate
         self.capacity = capacity
-        self._tokens = capacity
+        self._tokens = float(capacity)
         self._last_time = time.monotonic()
-        self._lock = asyncio.Lock()
+        # threading.Lock: the critical section never awaits, and sync callers
+        # (e.g. summarize_text.invoke) may run outside the event loop thread
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last_time
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._last_time = now
+
+    def _reserve(self, amount: float = 1.0) -> float:
+        """Take *amount* tokens and return how long the caller must wait for them."""
+        with self._lock:
+            self._refill()
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
 
-    async def acquire(self) -> None:
-        """Wait until a token is available."""
-        async with self._lock:
-            now = time.monotonic()
-            elapsed = now - self._last_time
-            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
-            self._last_time = now
+    def adjust(self, delta: float) -> None:
+        """Charge (positive) or refund (negative) tokens after the fact."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens - delta)
 
+    def try_acquire(self) -> bool:
+        """Take a token only if one is available right now."""
+        with self._lock:
+            self._refill()
             if self._tokens >= 1:
                 self._tokens -= 1
-                return
+                return True
+            return False
 
-            # Wait for a token
-            wait_time = (1 - self._tokens) / self.rate
+    async def acquire(self, amount: float = 1.0) -> float:
+        """Wait until *amount* tokens are available. Returns seconds spent waiting."""
+        wait_time = self._reserve(amount)
+        if wait_time > 0:
             await asyncio.sleep(wait_time)
-            self._tokens = 0
-            self._last_time = time.monotonic()
+        return wait_time
+
+    def acquire_sync(self, amount: float = 1.0) -> float:
+        """Blocking variant of acquire() for synchronous model calls."""
+        wait_time = self._reserve(amount)
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return wait_time
+
+
+@dataclass
+class LimiterStats:
+    acquisitions: int = 0
+    waits: int = 0  # acquisitions that had to wait
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+    def record(self, waited: float) -> None:
+        self.acquisitions += 1
+        if waited > 0:
+            self.waits += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+
+class ModelRateLimiter(BaseRateLimiter):
+    """LangChain rate limiter backed by a registry bucket.
+
+    Passed as ``rate_limiter=`` to chat models so every invoke/ainvoke/stream
+    call is throttled at the model layer, with no changes at call sites.
+    """
+
+    def __init__(self, registry: "RateLimiterRegistry", bucket_key: str) -> None:
+        self._registry = registry
+        self._bucket_key = bucket_key
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        bucket = self._registry.get_bucket_by_key(self._bucket_key)
+        if not blocking:
+            return bucket.try_acquire()
+        self._registry.record_wait(self._bucket_key, bucket.acquire_sync())
+        return True
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        bucket = self._registry.get_bucket_by_key(self._bucket_key)
+        if not blocking:
+            return bucket.try_acquire()
+        self._registry.record_wait(self._bucket_key, await bucket.acquire())
+        return True
+
+
+class TokenBudget:
+    """Input and output tokens-per-minute buckets for one provider key.
+
+    Callers reserve an estimate before a request and reconcile with the
+    actual usage afterwards, so the buckets track real consumption. Either
+    bucket is None when its TPM limit is disabled (0).
+    """
+
+    # Initial guess for output tokens per call, before any usage is observed
+    DEFAULT_EXPECTED_OUTPUT = 512
+
+    def __init__(self, input_tpm: int, output_tpm: int) -> None:
+        self.input = LeakyBucket(rate=input_tpm / 60.0, capacity=input_tpm) if input_tpm > 0 else None
+        self.output = LeakyBucket(rate=output_tpm / 60.0, capacity=output_tpm) if output_tpm > 0 else None
+        self._avg_output = float(self.DEFAULT_EXPECTED_OUTPUT)
+
+    def expected_output(self, max_tokens: int) -> int:
+        """Output reservation: running average of observed output, capped at max_tokens."""
+        return int(min(max_tokens, self._avg_output))
+
+    async def reserve(self, input_tokens: int, output_tokens: int) -> float:
+        waited = 0.0
+        if self.input is not None:
+            waited += await self.input.acquire(input_tokens)
+        if self.output is not None:
+            waited += await self.output.acquire(output_tokens)
+        return waited
+
+    def reserve_sync(self, input_tokens: int, output_tokens: int) -> float:
+        """Blocking variant of reserve() for synchronous model calls."""
+        waited = 0.0
+        if self.input is not None:
+            waited += self.input.acquire_sync(input_tokens)
+        if self.output is not None:
+            waited += self.output.acquire_sync(output_tokens)
+        return waited
+
+    def reconcile(self, reserved: tuple[int, int], actual: tuple[int, int]) -> None:
+        """Correct a reservation with the (input, output) usage the provider reported."""
+        if self.input is not None:
+            self.input.adjust(actual[0] - reserved[0])
+        if self.output is not None:
+            self.output.adjust(actual[1] - reserved[1])
+        self._avg_output = 0.8 * self._avg_output + 0.2 * actual[1]
+
+    def release(self, reserved: tuple[int, int]) -> None:
+        """Refund the output reservation of a call that failed before generating."""
+        if self.output is not None:
+            self.output.adjust(-reserved[1])
+
+    def refund(self, reserved: tuple[int, int]) -> None:
+        """Refund a whole reservation for a call that never reached the provider."""
+        if self.input is not None:
+            self.input.adjust(-reserved[0])
+        self.release(reserved)
 
 
 class RateLimiterRegistry:
@@ -52,22 +187,70 @@ class RateLimiterRegistry:
 
     def __init__(self):
         self._buckets: dict[str, LeakyBucket] = {}
+        self._token_budgets: dict[str, TokenBudget] = {}
+        self._stats: dict[str, LimiterStats] = {}
 
     def _bucket_key(self, provider: str, api_key: str) -> str:
         key_hash = hashlib.sha256(api_key.encode()).hexdigest()[:8] if api_key else "default"
         return f"{provider}:{key_hash}"
 
+    def key(self, provider: str, api_key: str = "") -> str:
+        """Bucket key for *provider*/*api_key*, shared with the concurrency controllers."""
+        return self._bucket_key(provider, api_key)
+
     def get_bucket(self, provider: str, api_key: str = "") -> LeakyBucket:
-        key = self._bucket_key(provider, api_key)
+        return self.get_bucket_by_key(self._bucket_key(provider, api_key))
+
+    def get_bucket_by_key(self, key: str) -> LeakyBucket:
         if key not in self._buckets:
             rpm = settings.RATE_LIMIT_RPM
             rate = rpm / 60.0  # Convert RPM to tokens per second
             self._buckets[key] = LeakyBucket(rate=rate, capacity=max(5, rpm // 10))
         return self._buckets[key]
 
+    def set_rate_factor(self, key: str, factor: float) -> None:
+        """Scale a bucket's leak rate to *factor* of the configured RPM (0 < factor <= 1)."""
+        factor = min(1.0, max(0.05, factor))
+        self.get_bucket_by_key(key).rate = settings.RATE_LIMIT_RPM / 60.0 * factor
+
     async def acquire(self, provider: str, api_key: str = "") -> None:
-        bucket = self.get_bucket(provider, api_key)
-        await bucket.acquire()
+        key = self._bucket_key(provider, api_key)
+        self.record_wait(key, await self.get_bucket_by_key(key).acquire())
+
+    def for_model(self, provider: str, api_key: str = "") -> ModelRateLimiter:
+        """LangChain-compatible limiter for a model bound to *provider* and *api_key*."""
+        return ModelRateLimiter(self, self._bucket_key(provider, api_key))
+
+    def token_budget(self, provider: str, api_key: str = "") -> TokenBudget | None:
+        """Shared TPM buckets for *provider*/*api_key*, or None if TPM limits are off."""
+        if settings.RATE_LIMIT_INPUT_TPM <= 0 and settings.RATE_LIMIT_OUTPUT_TPM <= 0:
+            return None
+        key = self._bucket_key(provider, api_key)
+        if key not in self._token_budgets:
+            self._token_budgets[key] = TokenBudget(
+                settings.RATE_LIMIT_INPUT_TPM, settings.RATE_LIMIT_OUTPUT_TPM,
+            )
+        return self._token_budgets[key]
+
+    def token_stats_key(self, provider: str, api_key: str = "") -> str:
+        return self._bucket_key(provider, api_key) + ":tokens"
+
+    def record_wait(self, key: str, waited: float) -> None:
+        self._stats.setdefault(key, LimiterStats()).record(waited)
+        if waited > 0:
+            logger.debug("Rate limiter %s waited %.2fs", key, waited)
+
+    def stats(self) -> dict[str, dict]:
+        """Wait-time metrics per bucket (keys never contain raw API keys)."""
+        return {
+            key: {
+                "acquisitions": s.acquisitions,
+                "waits": s.waits,
+                "wait_seconds_total": round(s.wait_seconds_total, 3),
+                "wait_seconds_max": round(s.wait_seconds_max, 3),
+            }
+            for key, s in self._stats.items()
+        }
 
 
 # Singleton
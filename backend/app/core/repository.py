@@ -35,6 +35,9 @@ class TaskRepository(Protocol):
     def count(self) -> int: ...
     def count_by_parent(self, parent_task_id: str) -> int: ...
     def count_auto_created(self) -> int: ...
+    def list_changed_since(self, updated_at: str, task_id: str = "", limit: int = 100) -> list[TaskRecord]: ...
+    def list_by_status(self, statuses: list[TaskStatus]) -> list[TaskRecord]: ...
+    def status_by_id(self, task_ids: list[str]) -> dict[str, tuple[TaskStatus, str]]: ...
 
 
 # ── In-Memory Implementations ──
@@ -79,9 +82,33 @@ class InMemoryTaskRepo:
     def count_auto_created(self) -> int:
         return sum(1 for t in store.tasks.values() if t.parent_task_id)
 
+    def list_changed_since(self, updated_at: str, task_id: str = "", limit: int = 100) -> list[TaskRecord]:
+        """Tasks ordered by (updated_at, id) strictly after the given position."""
+        changed = [
+            t for t in store.tasks.values()
+            if (t.updated_at, t.id) > (updated_at, task_id)
+        ]
+        changed.sort(key=lambda t: (t.updated_at, t.id))
+        return changed[:limit]
+
+    def list_by_status(self, statuses: list[TaskStatus]) -> list[TaskRecord]:
+        """Tasks in any of *statuses*, oldest first."""
+        matching = [t for t in store.tasks.values() if t.status in statuses]
+        return sorted(matching, key=lambda t: t.created_at)
+
+    def status_by_id(self, task_ids: list[str]) -> dict[str, tuple[TaskStatus, str]]:
+        """(status, updated_at) of each task in *task_ids* that exists."""
+        return {
+            tid: (store.tasks[tid].status, store.tasks[tid].updated_at)
+            for tid in task_ids if tid in store.tasks
+        }
+
 
 # ── SQL Implementations ──
 
+# Ids per IN (...) query; well under SQLite's bound-parameter limit
+_IN_BATCH = 500
+
 
 class SQLAgentRepo:
     def list(self, skip: int = 0, limit: int = 100) -> list[AgentConfig]:
@@ -185,6 +212,8 @@ class SQLTaskRepo:
                 existing.depth = task.depth
                 existing.child_task_ids = task.child_task_ids
                 existing.spawned_by_agent = task.spawned_by_agent
+                existing.cache_decision = task.cache_decision
+                existing.cache_source_task_id = task.cache_source_task_id
             else:
                 row = TaskDB(
                     id=task.id,
@@ -201,6 +230,8 @@ class SQLTaskRepo:
                     depth=task.depth,
                     child_task_ids=task.child_task_ids,
                     spawned_by_agent=task.spawned_by_agent,
+                    cache_decision=task.cache_decision,
+                    cache_source_task_id=task.cache_source_task_id,
                 )
                 session.add(row)
 
@@ -255,6 +286,74 @@ class SQLTaskRepo:
                 select(func.count()).select_from(TaskDB).where(TaskDB.parent_task_id != "")
             ).one()
 
+    def list_changed_since(self, updated_at: str, task_id: str = "", limit: int = 100) -> list[TaskRecord]:
+        """Tasks ordered by (updated_at, id) strictly after the given position.
+
+        Returns summaries only (no outputs/reviews) — served from the
+        updated_at index without the per-task child queries of _load_full.
+        """
+        from app.core.database import get_session
+        from sqlalchemy import and_, or_
+        with get_session() as session:
+            rows = session.exec(
+                select(TaskDB)
+                .where(or_(
+                    TaskDB.updated_at > updated_at,
+                    and_(TaskDB.updated_at == updated_at, TaskDB.id > task_id),
+                ))
+                .order_by(TaskDB.updated_at, TaskDB.id)
+                .limit(limit)
+            ).all()
+            return [self._to_summary(r) for r in rows]
+
+    def list_by_status(self, statuses: list[TaskStatus]) -> list[TaskRecord]:
+        """Tasks in any of *statuses*, oldest first."""
+        from app.core.database import get_session
+        with get_session() as session:
+            rows = session.exec(
+                select(TaskDB)
+                .where(TaskDB.status.in_([s.value for s in statuses]))
+                .order_by(TaskDB.created_at)
+            ).all()
+            return [self._load_full(session, r) for r in rows]
+
+    def status_by_id(self, task_ids: list[str]) -> dict[str, tuple[TaskStatus, str]]:
+        """(status, updated_at) of each task in *task_ids* that exists.
+
+        Reads only those columns, in batches, without loading outputs or reviews.
+        """
+        from app.core.database import get_session
+        found: dict[str, tuple[TaskStatus, str]] = {}
+        with get_session() as session:
+            for start in range(0, len(task_ids), _IN_BATCH):
+                rows = session.exec(
+                    select(TaskDB.id, TaskDB.status, TaskDB.updated_at)
+                    .where(TaskDB.id.in_(task_ids[start:start + _IN_BATCH]))
+                ).all()
+                found.update((tid, (TaskStatus(status), updated_at)) for tid, status, updated_at in rows)
+        return found
+
+    @staticmethod
+    def _to_summary(row: TaskDB) -> TaskRecord:
+        return TaskRecord(
+            id=row.id,
+            description=row.description,
+            status=TaskStatus(row.status),
+            assigned_agents=row.assigned_agents or [],
+            current_revision=row.current_revision,
+            max_revisions=row.max_revisions,
+            final_output=row.final_output,
+            requires_human_approval=row.requires_human_approval,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            parent_task_id=row.parent_task_id,
+            depth=row.depth,
+            child_task_ids=row.child_task_ids or [],
+            spawned_by_agent=row.spawned_by_agent,
+            cache_decision=row.cache_decision,
+            cache_source_task_id=row.cache_source_task_id,
+        )
+
     def _load_full(self, session, row: TaskDB) -> TaskRecord:
         wo_rows = session.exec(
             select(WorkerOutputDB).where(WorkerOutputDB.task_id == row.id)
@@ -296,6 +395,8 @@ class SQLTaskRepo:
             depth=row.depth,
             child_task_ids=row.child_task_ids or [],
             spawned_by_agent=row.spawned_by_agent,
+            cache_decision=row.cache_decision,
+            cache_source_task_id=row.cache_source_task_id,
         )
 
 
@@ -0,0 +1,80 @@
+"""Checkpoint serializer with payload compression.
+
+LangGraph's ``JsonPlusSerializer`` already encodes with ormsgpack.
+``CompressedSerializer`` extends it to compress payloads of at least
+``min_bytes`` with zstd (or stdlib zlib). A compressed payload's type tag
+gets a ``+<codec>`` suffix, e.g. ``msgpack+zstd``, so any mix of codecs stays
+readable whatever ``CHECKPOINT_COMPRESSION`` is set to now. Small payloads,
+and those that would not shrink, are stored as plain msgpack.
+
+Worker ReAct subgraphs inherit the checkpointer, so their message histories
+(tool output included) go through this serializer on every step.
+"""
+
+import logging
+import zlib
+from typing import Any
+
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+CODECS = ("zstd", "zlib")
+
+
+def _compress(codec: str, data: bytes, level: int) -> bytes:
+    if codec == "zstd":
+        import zstandard
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    return zlib.compress(data, level)
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == "zlib":
+        return zlib.decompress(data)
+    raise ValueError(f"Unknown checkpoint compression: {codec}")
+
+
+class CompressedSerializer(JsonPlusSerializer):
+    """``JsonPlusSerializer`` compressing payloads of at least *min_bytes*."""
+
+    def __init__(self, *, codec: str = "zstd", min_bytes: int = 2048, level: int = 3, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        if codec == "zstd":
+            try:
+                import zstandard  # noqa: F401
+            except ImportError:
+                logger.warning("zstandard not installed, compressing checkpoints with zlib")
+                codec = "zlib"
+        self.codec = codec if codec in CODECS else ""
+        self.min_bytes = min_bytes
+        self.level = level
+
+    def dumps_typed(self, obj: Any) -> tuple[str, bytes]:
+        type_, data = super().dumps_typed(obj)
+        if not self.codec or len(data) < self.min_bytes:
+            return type_, data
+        compressed = _compress(self.codec, data, self.level)
+        if len(compressed) >= len(data):
+            return type_, data
+        return f"{type_}+{self.codec}", compressed
+
+    def loads_typed(self, data: tuple[str, bytes]) -> Any:
+        type_, payload = data
+        if "+" in type_:
+            type_, codec = type_.rsplit("+", 1)
+            payload = _decompress(codec, payload)
+        return super().loads_typed((type_, payload))
+
+
+def make_checkpoint_serde() -> CompressedSerializer:
+    """Serializer configured from CHECKPOINT_COMPRESSION / CHECKPOINT_COMPRESS_MIN_BYTES."""
+    return CompressedSerializer(
+        codec=settings.CHECKPOINT_COMPRESSION,
+        min_bytes=settings.CHECKPOINT_COMPRESS_MIN_BYTES,
+    )
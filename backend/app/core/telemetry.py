@@ -1,6 +1,7 @@
 """Token usage telemetry and cost estimation."""
 
 from dataclasses import dataclass, field
+from typing import Any
 
 # Pricing per 1M tokens (input/output) as of 2025
 MODEL_PRICING: dict[str, tuple[float, float]] = {
@@ -53,3 +54,58 @@ def create_token_usage(model: str, input_tokens: int, output_tokens: int) -> Tok
         total_tokens=total,
         estimated_cost_usd=cost,
     )
+
+
+def extract_cache_usage(response: Any) -> tuple[int, int]:
+    """Pull ``(cache_read_tokens, cache_creation_tokens)`` from an LLMResult.
+
+    Read from ``usage_metadata.input_token_details``, where LangChain
+    normalizes provider prompt-cache counters. (0, 0) when not reported.
+    """
+    generations = getattr(response, "generations", None)
+    if not generations or not generations[0]:
+        return 0, 0
+    msg = getattr(generations[0][0], "message", None)
+    usage = getattr(msg, "usage_metadata", None) or {}
+    details = usage.get("input_token_details") or {}
+    return details.get("cache_read", 0) or 0, details.get("cache_creation", 0) or 0
+
+
+def extract_token_usage(response: Any) -> tuple[str, int, int] | None:
+    """Pull ``(model, input_tokens, output_tokens)`` from an LLMResult.
+
+    Providers report usage in different places: ``usage_metadata`` on the
+    message, or ``usage``/``token_usage`` in ``response_metadata``. Returns
+    None when no usage is reported.
+    """
+    usage_metadata = None
+    model_name = ""
+
+    # LangChain response objects have different structures
+    if hasattr(response, 'generations') and response.generations:
+        gen = response.generations[0][0] if response.generations[0] else None
+        if gen and hasattr(gen, 'message'):
+            msg = gen.message
+            if hasattr(msg, 'usage_metadata'):
+                usage_metadata = msg.usage_metadata
+            if hasattr(msg, 'response_metadata'):
+                model_name = msg.response_metadata.get('model', '')
+                if not usage_metadata:
+                    # Try extracting from response_metadata directly
+                    rm = msg.response_metadata
+                    usage = rm.get('usage', rm.get('token_usage', {}))
+                    if usage:
+                        usage_metadata = {
+                            'input_tokens': usage.get('input_tokens', usage.get('prompt_tokens', 0)),
+                            'output_tokens': usage.get('output_tokens', usage.get('completion_tokens', 0)),
+                        }
+
+    if not usage_metadata:
+        return None
+    if isinstance(usage_metadata, dict):
+        input_tokens = usage_metadata.get('input_tokens', 0)
+        output_tokens = usage_metadata.get('output_tokens', 0)
+    else:
+        input_tokens = getattr(usage_metadata, 'input_tokens', 0)
+        output_tokens = getattr(usage_metadata, 'output_tokens', 0)
+    return model_name, input_tokens, output_tokens
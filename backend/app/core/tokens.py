@@ -0,0 +1,106 @@
+"""Token counting and budgeting for prompts, tool output and rate limits.
+
+``estimate_tokens`` is a cheap length-based estimate (used per request by
+the TPM limiter). ``count_tokens`` / ``truncate_to_tokens`` are the precise
+budget helpers: they use the provider's tokenizer where one is available
+locally (tiktoken for OpenAI, loaded lazily and cached) and a
+per-provider characters-per-token ratio otherwise.
+"""
+
+import functools
+import logging
+from typing import Any
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Rough average for English text and code across provider tokenizers
+CHARS_PER_TOKEN = 4
+
+# Providers without a local tokenizer. Claude's tokenizer yields noticeably
+# more tokens per character than cl100k/o200k on code.
+_PROVIDER_CHARS_PER_TOKEN: dict[str, float] = {
+    "anthropic": 3.5,
+    "gemini": 4.0,
+    "ollama": 4.0,
+}
+
+_TIKTOKEN_ENCODINGS: dict[str, str] = {
+    "openai": "o200k_base",
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate for *text*."""
+    if not text:
+        return 0
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def message_text(content: Any) -> str:
+    """Flatten LangChain message content (str or list of blocks) to text."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "\n".join(
+            block.get("text", "") if isinstance(block, dict) else str(block)
+            for block in content
+        )
+    return str(content)
+
+
+def estimate_message_tokens(messages: list) -> int:
+    """Estimate the input tokens of a list of LangChain messages."""
+    # +4 per message for role/formatting overhead
+    return sum(estimate_tokens(message_text(m.content)) + 4 for m in messages)
+
+
+@functools.lru_cache(maxsize=8)
+def _encoder(provider: str):
+    """tiktoken encoding for *provider*, or None when unavailable (cached either way)."""
+    name = _TIKTOKEN_ENCODINGS.get(provider)
+    if name is None:
+        return None
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(name)
+    except Exception as e:
+        logger.warning("Tokenizer %s unavailable, estimating %s tokens: %s", name, provider, e)
+        return None
+
+
+def _ratio(provider: str) -> float:
+    return _PROVIDER_CHARS_PER_TOKEN.get(provider, CHARS_PER_TOKEN)
+
+
+def count_tokens(text: str, provider: str = "") -> int:
+    """Tokens in *text* for *provider* (default: the global LLM_PROVIDER)."""
+    if not text:
+        return 0
+    provider = (provider or settings.LLM_PROVIDER).lower()
+    encoder = _encoder(provider)
+    if encoder is not None:
+        return len(encoder.encode(text, disallowed_special=()))
+    return int(len(text) / _ratio(provider)) + 1
+
+
+def split_at_tokens(text: str, max_tokens: int, provider: str = "") -> tuple[str, str]:
+    """Split *text* into (first ``max_tokens`` tokens, remainder)."""
+    provider = (provider or settings.LLM_PROVIDER).lower()
+    encoder = _encoder(provider)
+    if encoder is not None:
+        tokens = encoder.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text, ""
+        # A cut inside a multi-byte character decodes to U+FFFD; drop it
+        head = encoder.decode(tokens[:max_tokens]).rstrip("\ufffd")
+        return head, text[len(head):]
+    cut = int(max_tokens * _ratio(provider))
+    return text[:cut], text[cut:]
+
+
+def truncate_to_tokens(text: str, max_tokens: int, provider: str = "", marker: str = "") -> str:
+    """*text* cut to at most *max_tokens* tokens, with *marker* appended if cut."""
+    head, tail = split_at_tokens(text, max_tokens, provider)
+    return head + marker if tail else head
@@ -4,7 +4,8 @@ import logging
 from fastapi import WebSocket
 from starlette.websockets import WebSocketState
 
-from app.models.schemas import WSEvent
+from app.core.event_bus import event_bus
+from app.models.schemas import STREAM_EVENT_TYPES, WSEvent
 
 logger = logging.getLogger(__name__)
 
@@ -12,30 +13,66 @@ logger = logging.getLogger(__name__)
 class ConnectionManager:
     def __init__(self) -> None:
         self._connections: set[WebSocket] = set()
+        # Per-connection task subscriptions for task-scoped stream events
+        self._subscriptions: dict[WebSocket, set[str]] = {}
         self._lock = asyncio.Lock()
 
-    async def connect(self, ws: WebSocket) -> None:
+    async def connect(self, ws: WebSocket, since: int | None = None, epoch: str | None = None) -> None:
         await ws.accept()
         async with self._lock:
+            # Replay under the broadcast lock so missed events reach the client
+            # before any newer broadcast. Events still sitting in the bus queue
+            # may arrive twice; clients drop anything with seq <= their last seq.
+            if since is not None:
+                await self._replay(ws, since, epoch)
             self._connections.add(ws)
         logger.info("WebSocket client connected. Total: %d", len(self._connections))
 
+    async def _replay(self, ws: WebSocket, since: int, epoch: str | None) -> None:
+        missed = event_bus.replay_since(since, epoch)
+        if missed is None:
+            # Gap is older than the replay buffer, or from before a restart —
+            # tell the client to refetch
+            hint = WSEvent(
+                type="resync_required",
+                data={"latest_seq": event_bus.latest_seq, "epoch": event_bus.epoch},
+            )
+            await ws.send_text(hint.model_dump_json())
+            logger.info("WebSocket resume from seq %d too old, sent resync hint", since)
+            return
+        for event in missed:
+            await ws.send_text(event.model_dump_json())
+        logger.info("WebSocket resume from seq %d replayed %d events", since, len(missed))
+
     async def disconnect(self, ws: WebSocket) -> None:
         async with self._lock:
             self._connections.discard(ws)
+            self._subscriptions.pop(ws, None)
         logger.info("WebSocket client disconnected. Total: %d", len(self._connections))
 
+    def subscribe(self, ws: WebSocket, task_id: str) -> None:
+        self._subscriptions.setdefault(ws, set()).add(task_id)
+
+    def unsubscribe(self, ws: WebSocket, task_id: str) -> None:
+        self._subscriptions.get(ws, set()).discard(task_id)
+
     async def broadcast(self, event: WSEvent) -> None:
         payload = event.model_dump_json()
         async with self._lock:
+            targets = self._connections
+            if event.type in STREAM_EVENT_TYPES:
+                task_id = event.data.get("task_id", "")
+                targets = {ws for ws in self._connections if task_id in self._subscriptions.get(ws, ())}
             stale: list[WebSocket] = []
-            for ws in self._connections:
+            for ws in targets:
                 try:
                     await ws.send_text(payload)
                 except (RuntimeError, ConnectionError, OSError):
                     stale.append(ws)
             if stale:
                 self._connections -= set(stale)
+                for ws in stale:
+                    self._subscriptions.pop(ws, None)
 
     @property
     def active_count(self) -> int:
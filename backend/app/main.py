@@ -6,11 +6,12 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
+from app.core.checkpoint import close_checkpointer, open_checkpointer, prune_loop
 from app.core.event_bus import event_bus
 from app.core.ws_manager import ws_manager
 from app.core.log_filter import KeyScrubFilter
 from app.middleware.byok import BYOKMiddleware
-from app.api.routes import health, agents, tasks, settings as settings_routes, approval, scout
+from app.api.routes import health, agents, tasks, settings as settings_routes, approval, scout, events
 from app.api import websocket
 
 logging.basicConfig(level=logging.INFO)
@@ -47,6 +48,7 @@ async def lifespan(app: FastAPI):
     if settings.STORAGE_BACKEND == "postgres":
         from app.core.database import init_db
         init_db()
+    checkpointer = await open_checkpointer()
 
     # Pre-pull sandbox image to avoid cold-start latency
     pull_success = False
@@ -78,6 +80,14 @@ async def lifespan(app: FastAPI):
 
     # Start the broadcast consumer
     broadcast_task = asyncio.create_task(_broadcast_loop())
+    prune_task = None
+    if checkpointer is not None and settings.CHECKPOINT_PRUNE_INTERVAL_SECONDS > 0:
+        prune_task = asyncio.create_task(prune_loop())
+    # Last, so recovered graphs find the sandbox image and a running event
+    # broadcast. ARQ re-delivers the jobs of dead workers itself.
+    if settings.RECOVER_TASKS_ON_STARTUP and not settings.USE_QUEUE:
+        from app.services.recovery import recover_tasks
+        await recover_tasks()
     logger.info("Saladin backend started (storage=%s)", settings.STORAGE_BACKEND)
     yield
     broadcast_task.cancel()
@@ -85,6 +95,14 @@ async def lifespan(app: FastAPI):
         await broadcast_task
     except asyncio.CancelledError:
         logger.debug("Broadcast task was cancelled as expected.")
+    if prune_task is not None:
+        prune_task.cancel()
+        # A prune in progress must finish unwinding before the saver closes
+        try:
+            await prune_task
+        except asyncio.CancelledError:
+            pass
+    await close_checkpointer()
     logger.info("Saladin backend stopped")
 
 
@@ -109,4 +127,5 @@ app.include_router(tasks.router)
 app.include_router(settings_routes.router)
 app.include_router(approval.router)
 app.include_router(scout.router)
+app.include_router(events.router)
 app.include_router(websocket.router)
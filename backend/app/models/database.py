@@ -33,12 +33,15 @@ class TaskDB(SQLModel, table=True):
     final_output: str = ""
     requires_human_approval: bool = False
     created_at: str = Field(default_factory=lambda: datetime.now(UTC).isoformat())
-    updated_at: str = Field(default_factory=lambda: datetime.now(UTC).isoformat())
+    # Indexed for delta sync (GET /api/tasks/changes)
+    updated_at: str = Field(default_factory=lambda: datetime.now(UTC).isoformat(), index=True)
     # Task lineage
     parent_task_id: str = ""
     depth: int = 0
     child_task_ids: list = Field(default_factory=list, sa_column=Column(JSON))
     spawned_by_agent: str = ""
+    cache_decision: str = ""
+    cache_source_task_id: str = ""
 
 
 class WorkerOutputDB(SQLModel, table=True):
@@ -26,6 +26,14 @@ class TaskStatus(str, Enum):
     PENDING_HUMAN_APPROVAL = "pending_human_approval"
 
 
+# Statuses after which a task's graph will not run again
+TERMINAL_STATUSES: frozenset[TaskStatus] = frozenset({
+    TaskStatus.APPROVED,
+    TaskStatus.REJECTED,
+    TaskStatus.FAILED,
+})
+
+
 class SupervisorDecision(str, Enum):
     APPROVE = "approve"
     REJECT = "reject"
@@ -80,3 +88,6 @@ class TaskRecord:
     depth: int = 0
     child_task_ids: list[str] = field(default_factory=list)
     spawned_by_agent: str = ""
+    # Semantic result cache: "" (not checked), "miss", "seeded" or "returned"
+    cache_decision: str = ""
+    cache_source_task_id: str = ""
@@ -76,6 +76,8 @@ class TaskResponse(BaseModel):
     depth: int = 0
     child_task_ids: list[str] = []
     spawned_by_agent: str = ""
+    cache_decision: str = ""
+    cache_source_task_id: str = ""
 
 
 class TaskListResponse(BaseModel):
@@ -92,8 +94,21 @@ class TaskListResponse(BaseModel):
     spawned_by_agent: str = ""
 
 
+class TaskChangesResponse(BaseModel):
+    tasks: list[TaskListResponse]
+    cursor: str  # opaque; pass back as ?since= on the next call
+    has_more: bool = False
+
+
 # --- WebSocket event ---
 
+# High-volume events that are only delivered to clients subscribed to the
+# event's task_id, and are never sequenced or kept for replay.
+STREAM_EVENT_TYPES: frozenset[str] = frozenset({"worker_token"})
+
+
 class WSEvent(BaseModel):
-    type: str  # task_update, agent_update, log, worker_output, supervisor_review, human_approval_required, telemetry
+    type: str  # task_update, agent_update, log, worker_output, supervisor_review, human_approval_required, telemetry, resync_required, worker_token
     data: dict
+    seq: int = 0  # assigned by the event bus on publish; 0 = unsequenced
+    epoch: str = ""  # event bus instance that assigned seq
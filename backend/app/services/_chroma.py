@@ -111,6 +111,44 @@ def store_chroma(agent_id: str, content: str) -> None:
         raise
 
 
+# Descriptions of approved tasks, keyed by task id (semantic result cache)
+TASK_RESULTS_COLLECTION = "task_results"
+
+
+def _get_task_results_collection() -> chromadb.Collection:
+    if TASK_RESULTS_COLLECTION in _collection_cache:
+        return _collection_cache[TASK_RESULTS_COLLECTION]
+    collection = _get_client().get_or_create_collection(
+        name=TASK_RESULTS_COLLECTION,
+        # Cosine distance, so 1 - distance is cosine similarity
+        metadata={"hnsw:space": "cosine"},
+    )
+    _collection_cache[TASK_RESULTS_COLLECTION] = collection
+    return collection
+
+
+def store_task_result(task_id: str, description: str) -> None:
+    """Index an approved task's description for similarity lookup."""
+    collection = _get_task_results_collection()
+    collection.upsert(documents=[description], ids=[task_id])
+
+
+def query_task_results(description: str, k: int = 3) -> list[tuple[str, float]]:
+    """Return (task_id, similarity) for the most similar indexed task descriptions."""
+    collection = _get_task_results_collection()
+    count = collection.count()
+    if count == 0:
+        return []
+    results = collection.query(
+        query_texts=[description],
+        n_results=min(k, count),
+        include=["distances"],
+    )
+    ids = results.get("ids", [[]])[0]
+    distances = results.get("distances", [[]])[0]
+    return [(task_id, 1.0 - dist) for task_id, dist in zip(ids, distances)]
+
+
 def shutdown_chroma() -> None:
     """Clean up ChromaDB resources."""
     global _client
@@ -8,6 +8,7 @@ import threading
 
 from app.core.repository import get_task_repo
 from app.models.domain import TaskRecord
+from app.services.task_waiters import notify_status
 
 # Per-task locks to prevent race conditions on concurrent status updates
 _task_locks: dict[str, threading.Lock] = {}
@@ -26,6 +27,10 @@ def get_task(task_id: str) -> TaskRecord | None:
 
 
 def save_task(task: TaskRecord) -> None:
-    """Persist a task record with per-task locking."""
+    """Persist a task record with per-task locking.
+
+    Also wakes any long-poll waiters watching for the task's new status.
+    """
     with _get_task_lock(task.id):
         get_task_repo().save(task)
+    notify_status(task.id, task.status)
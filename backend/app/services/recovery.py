@@ -0,0 +1,47 @@
+"""Startup recovery of tasks left unfinished by a previous process.
+
+Graph runs live in the scheduler's memory, so a restart orphans every task
+that was queued or mid-run. ``recover_tasks`` finds them and hands them back
+to the scheduler, which bounds how many run at once. Tasks that had started
+resume from their latest checkpoint when a checkpointer is configured and
+start over otherwise. Tasks waiting for human approval are left alone:
+their checkpoint is resumed by the approval endpoint.
+"""
+
+import logging
+from datetime import datetime, UTC
+
+from app.core.event_bus import event_bus
+from app.core.repository import get_task_repo
+from app.models.domain import TaskStatus
+from app.models.schemas import WSEvent
+from app.services.scheduler import scheduler
+
+logger = logging.getLogger(__name__)
+
+RECOVERABLE_STATUSES = [
+    TaskStatus.PENDING,
+    TaskStatus.RUNNING,
+    TaskStatus.UNDER_REVIEW,
+    TaskStatus.REVISION,
+]
+
+
+async def recover_tasks() -> int:
+    """Requeue unfinished tasks; returns how many were recovered."""
+    tasks = get_task_repo().list_by_status(RECOVERABLE_STATUSES)
+    for task in tasks:
+        resume = task.status != TaskStatus.PENDING
+        scheduler.submit(task, resume=resume)
+        await event_bus.publish(WSEvent(
+            type="log",
+            data={
+                "task_id": task.id,
+                "level": "info",
+                "message": "Recovered after restart; " + ("resuming" if resume else "starting"),
+                "timestamp": datetime.now(UTC).isoformat(),
+            },
+        ))
+    if tasks:
+        logger.info("Recovered %d unfinished tasks (%s)", len(tasks), scheduler.stats())
+    return len(tasks)
@@ -0,0 +1,70 @@
+"""Semantic result cache — reuse approved results for near-duplicate tasks.
+
+Approved task descriptions are embedded into a Chroma collection. When a new
+task's description is similar enough (SEMANTIC_CACHE_THRESHOLD) to an
+approved one, the prior ``final_output`` is either returned as-is or used to
+seed the workers, depending on SEMANTIC_CACHE_MODE. Lookups and stores never
+fail the task: any Chroma error counts as a miss.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+
+from app.config import settings
+from app.models.domain import TaskRecord, TaskStatus
+from app.services.persistence import get_task
+
+logger = logging.getLogger(__name__)
+
+SEED_PROMPT = (
+    "\n\nA previously approved result for a very similar task is included "
+    "below. Reuse what applies and fix anything that doesn't fit this task.\n\n"
+    "Previous result:\n{output}"
+)
+
+
+@dataclass
+class CacheMatch:
+    task_id: str
+    similarity: float
+    final_output: str
+
+
+def _find_similar(task: TaskRecord) -> CacheMatch | None:
+    from app.services._chroma import query_task_results
+
+    for task_id, similarity in query_task_results(task.description):
+        if similarity < settings.SEMANTIC_CACHE_THRESHOLD:
+            break
+        if task_id == task.id:
+            continue
+        prior = get_task(task_id)
+        if prior and prior.status == TaskStatus.APPROVED and prior.final_output:
+            return CacheMatch(task_id=task_id, similarity=similarity, final_output=prior.final_output)
+    return None
+
+
+async def find_similar_result(task: TaskRecord) -> CacheMatch | None:
+    """Best approved match above the threshold, or None (also when disabled)."""
+    if not settings.SEMANTIC_CACHE_ENABLED:
+        return None
+    try:
+        # Embedding runs locally and is CPU-bound — keep it off the event loop
+        return await asyncio.to_thread(_find_similar, task)
+    except Exception as e:
+        logger.warning("Semantic cache lookup failed for task %s: %s", task.id, e)
+        return None
+
+
+async def remember_result(task: TaskRecord) -> None:
+    """Index an approved task so later near-duplicates can reuse its result."""
+    if not settings.SEMANTIC_CACHE_ENABLED:
+        return
+    if task.cache_decision == "returned" or not task.final_output:
+        return  # already a copy of an indexed result
+    try:
+        from app.services._chroma import store_task_result
+        await asyncio.to_thread(store_task_result, task.id, task.description)
+    except Exception as e:
+        logger.warning("Semantic cache store failed for task %s: %s", task.id, e)
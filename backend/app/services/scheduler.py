@@ -0,0 +1,75 @@
+"""Bounded global scheduler for graph executions.
+
+Every task — user-submitted or spawned by an agent via the ``create_task``
+tool — goes through here instead of straight to ``asyncio.create_task``.
+At most ``max_concurrent`` graphs run at once; the rest wait in a priority
+queue where user-submitted tasks go ahead of auto-spawned ones and shallower
+tasks ahead of deeper ones (FIFO within the same priority).
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+
+from app.config import settings
+from app.core.key_context import RequestKeys
+from app.models.domain import TaskRecord
+
+logger = logging.getLogger(__name__)
+
+
+class TaskScheduler:
+    def __init__(self, max_concurrent: int) -> None:
+        self.max_concurrent = max(1, max_concurrent)
+        self._heap: list[tuple[tuple[int, int, int], TaskRecord, RequestKeys | None, bool]] = []
+        self._counter = itertools.count()
+        self._running: set[asyncio.Task] = set()
+
+    def submit(self, task: TaskRecord, keys: RequestKeys | None = None, resume: bool = False) -> None:
+        """Queue *task* for execution; starts immediately if a slot is free.
+
+        With *resume*, the graph continues from the task's latest checkpoint
+        when there is one.
+        """
+        priority = (1 if task.parent_task_id else 0, task.depth, next(self._counter))
+        heapq.heappush(self._heap, (priority, task, keys, resume))
+        self._pump()
+
+    def _pump(self) -> None:
+        from app.services.task_service import _run_task
+
+        while self._heap and len(self._running) < self.max_concurrent:
+            _, task, keys, resume = heapq.heappop(self._heap)
+            # Fresh context so the spawning worker's tool/key context doesn't
+            # leak into the child; _run_task re-applies the captured keys.
+            job = asyncio.create_task(_run_task(task, keys=keys, resume=resume), context=contextvars.Context())
+            self._running.add(job)
+            job.add_done_callback(self._on_done)
+            logger.info(
+                "Scheduler started task %s (running=%d queued=%d)",
+                task.id, len(self._running), len(self._heap),
+            )
+
+    def _on_done(self, job: asyncio.Task) -> None:
+        self._running.discard(job)
+        self._pump()
+
+    @property
+    def running(self) -> int:
+        return len(self._running)
+
+    @property
+    def queued(self) -> int:
+        return len(self._heap)
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "queued": self.queued,
+            "max_concurrent": self.max_concurrent,
+        }
+
+
+scheduler = TaskScheduler(settings.MAX_CONCURRENT_GRAPHS)
@@ -1,4 +1,5 @@
-import asyncio
+import base64
+import binascii
 import logging
 from datetime import datetime, UTC
 
@@ -9,12 +10,10 @@ from app.core.key_context import RequestKeys, get_request_keys
 from app.core.repository import get_task_repo
 from app.services.agent_service import get_workers
 from app.services.persistence import get_task, save_task  # re-export for back-compat
+from app.services.scheduler import scheduler
 
 logger = logging.getLogger(__name__)
 
-# Track running background tasks to prevent GC and enable monitoring
-_running_tasks: set[asyncio.Task] = set()
-
 
 class AutoTaskError(Exception):
     """Raised when auto-task creation safety limits are hit."""
@@ -28,6 +27,37 @@ def task_count() -> int:
     return get_task_repo().count()
 
 
+def list_task_changes(cursor: str = "", limit: int = 100) -> tuple[list[TaskRecord], str, bool]:
+    """Tasks updated after *cursor*, plus the cursor for the next call.
+
+    The cursor is an opaque encoding of the last seen ``(updated_at, id)``
+    pair; an empty cursor returns everything from the beginning. Raises
+    ValueError for a malformed cursor.
+    """
+    updated_at, task_id = _decode_cursor(cursor) if cursor else ("", "")
+    # Fetch one extra row to know whether another page follows
+    changed = get_task_repo().list_changed_since(updated_at, task_id, limit + 1)
+    has_more = len(changed) > limit
+    changed = changed[:limit]
+    if changed:
+        cursor = _encode_cursor(changed[-1].updated_at, changed[-1].id)
+    return changed, cursor, has_more
+
+
+def _encode_cursor(updated_at: str, task_id: str) -> str:
+    return base64.urlsafe_b64encode(f"{updated_at}|{task_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[str, str]:
+    try:
+        updated_at, sep, task_id = base64.urlsafe_b64decode(cursor.encode()).decode().partition("|")
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    if not sep:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return updated_at, task_id
+
+
 def _validate_lineage(data: TaskCreate) -> tuple[int, str]:
     """Validate lineage constraints. Returns (depth, parent_task_id).
 
@@ -100,23 +130,20 @@ async def create_task(data: TaskCreate) -> TaskRecord:
             repo.save(parent)
             await event_bus.publish(WSEvent(
                 type="task_update",
-                data={"action": "child_created", "task": _task_summary(parent), "child_id": task.id},
+                data={"action": "child_created", "task": task_summary(parent), "child_id": task.id},
             ))
 
     await event_bus.publish(WSEvent(
         type="task_update",
-        data={"action": "created", "task": _task_summary(task)},
+        data={"action": "created", "task": task_summary(task)},
     ))
 
-    # Launch the graph execution in background with tracking
+    # Hand the graph execution to the bounded scheduler (or the ARQ queue)
     from app.config import settings
     if settings.USE_QUEUE:
         await _enqueue_task(task)
     else:
-        captured_keys = get_request_keys()
-        bg_task = asyncio.create_task(_run_task(task, keys=captured_keys))
-        _running_tasks.add(bg_task)
-        bg_task.add_done_callback(_running_tasks.discard)
+        scheduler.submit(task, keys=get_request_keys())
 
     return task
 
@@ -136,14 +163,17 @@ async def _enqueue_task(task: TaskRecord) -> None:
         )
     except Exception as e:
         logger.error("Failed to enqueue task %s: %s", task.id, e)
-        # Fallback to direct execution
-        bg_task = asyncio.create_task(_run_task(task, keys=keys))
-        _running_tasks.add(bg_task)
-        bg_task.add_done_callback(_running_tasks.discard)
+        # Fallback to in-process execution
+        scheduler.submit(task, keys=keys)
+
 
+async def _run_task(task: TaskRecord, keys: RequestKeys | None = None, resume: bool = False) -> None:
+    """Execute the LangGraph workflow for this task.
 
-async def _run_task(task: TaskRecord, keys: RequestKeys | None = None) -> None:
-    """Execute the LangGraph workflow for this task."""
+    *resume* continues an interrupted run from its latest checkpoint (see
+    ``run_graph``) and skips the result cache, which was consulted on the
+    first run.
+    """
     if keys is not None:
         from app.core.key_context import request_keys as _ctx
         _ctx.set(keys)
@@ -151,8 +181,11 @@ async def _run_task(task: TaskRecord, keys: RequestKeys | None = None) -> None:
     from app.agents.graph import run_graph
 
     try:
+        seed_output = "" if resume else await _check_result_cache(task)
+        if task.status == TaskStatus.APPROVED:
+            return
         await _update_status(task, TaskStatus.RUNNING)
-        await run_graph(task)
+        await run_graph(task, seed_output=seed_output, resume=resume)
         logger.info("Graph completed successfully for task %s", task.id)
     except Exception as e:
         logger.exception("Task %s failed: %s", task.id, e)
@@ -168,17 +201,67 @@ async def _run_task(task: TaskRecord, keys: RequestKeys | None = None) -> None:
         ))
 
 
+async def _check_result_cache(task: TaskRecord) -> str:
+    """Consult the semantic result cache before running the graph.
+
+    Records the decision on the task. In "return" mode a hit finishes the
+    task as approved with the prior output; in "seed" mode the prior output
+    is returned for the workers to build on. Returns "" when not seeding.
+    """
+    # Only first runs: revisions re-enter here after the decision is recorded
+    if task.cache_decision or task.current_revision > 0:
+        return ""
+    from app.config import settings
+    from app.services.result_cache import find_similar_result
+
+    match = await find_similar_result(task)
+    if match is None:
+        if settings.SEMANTIC_CACHE_ENABLED:
+            task.cache_decision = "miss"
+        return ""
+
+    task.cache_source_task_id = match.task_id
+    # A returned result would skip human review, so those tasks only seed
+    if settings.SEMANTIC_CACHE_MODE == "return" and not task.requires_human_approval:
+        task.cache_decision = "returned"
+        task.final_output = match.final_output
+        await _update_status(task, TaskStatus.APPROVED)
+        await event_bus.publish(WSEvent(
+            type="task_update",
+            data={"action": "completed", "task": {"id": task.id, "status": "approved"}},
+        ))
+        seed_output = ""
+    else:
+        task.cache_decision = "seeded"
+        seed_output = match.final_output
+
+    await event_bus.publish(WSEvent(
+        type="log",
+        data={
+            "task_id": task.id,
+            "level": "info",
+            "message": (
+                f"Semantic cache {task.cache_decision} result of task {match.task_id} "
+                f"(similarity {match.similarity:.2f})"
+            ),
+            "timestamp": datetime.now(UTC).isoformat(),
+        },
+    ))
+    return seed_output
+
+
 async def _update_status(task: TaskRecord, status: TaskStatus) -> None:
     task.status = status
     task.updated_at = datetime.now(UTC).isoformat()
-    get_task_repo().save(task)
+    save_task(task)
     await event_bus.publish(WSEvent(
         type="task_update",
-        data={"action": "status_changed", "task": _task_summary(task)},
+        data={"action": "status_changed", "task": task_summary(task)},
     ))
 
 
-def _task_summary(task: TaskRecord) -> dict:
+def task_summary(task: TaskRecord) -> dict:
+    """The task fields carried by ``task_update`` events."""
     return {
         "id": task.id,
         "description": task.description,
@@ -0,0 +1,138 @@
+"""Completion waiters for long-poll clients.
+
+``wait_for_status`` parks a request on an in-process future that
+``notify_status`` resolves whenever a task is saved with a matching status.
+When USE_QUEUE is enabled graphs run in ARQ worker processes, so status
+changes are also fanned out over a Redis pub/sub channel per task.
+"""
+
+import asyncio
+import functools
+import logging
+
+from app.config import settings
+from app.core.repository import get_task_repo
+from app.models.domain import TERMINAL_STATUSES, TaskStatus
+
+logger = logging.getLogger(__name__)
+
+# Named targets accepted by the ``until`` query parameter
+WAIT_TARGETS: dict[str, frozenset[TaskStatus]] = {
+    "terminal": TERMINAL_STATUSES,
+    # Also stop when the graph is parked waiting on a human decision
+    "settled": TERMINAL_STATUSES | {TaskStatus.PENDING_HUMAN_APPROVAL},
+}
+
+_waiters: dict[str, list[tuple[frozenset[TaskStatus], asyncio.Future]]] = {}
+# Redis publishes in flight; referenced here so they aren't garbage-collected
+_publishing: set[asyncio.Task] = set()
+
+
+def _channel(task_id: str) -> str:
+    return f"saladin:task_status:{task_id}"
+
+
+def notify_status(task_id: str, status: TaskStatus) -> None:
+    """Wake local waiters for *task_id* and, in queue mode, notify other processes."""
+    _resolve(task_id, status)
+    if settings.USE_QUEUE:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        job = loop.create_task(_publish(task_id, status))
+        _publishing.add(job)
+        job.add_done_callback(functools.partial(_publish_done, task_id))
+
+
+def _resolve(task_id: str, status: TaskStatus) -> None:
+    for statuses, fut in _waiters.get(task_id, []):
+        if status in statuses and not fut.done():
+            # save_task may run outside the waiter's loop thread
+            fut.get_loop().call_soon_threadsafe(_set_result, fut)
+
+
+def _set_result(fut: asyncio.Future) -> None:
+    if not fut.done():
+        fut.set_result(None)
+
+
+async def _publish(task_id: str, status: TaskStatus) -> None:
+    from app.core.redis_client import get_redis
+    redis = await get_redis()
+    await redis.publish(_channel(task_id), status.value)
+
+
+def _publish_done(task_id: str, job: asyncio.Task) -> None:
+    _publishing.discard(job)
+    if not job.cancelled() and job.exception() is not None:
+        logger.warning("Could not publish status for task %s: %s", task_id, job.exception())
+
+
+async def _subscribe(task_id: str):
+    """Redis pub/sub subscribed to *task_id*'s status channel, or None."""
+    try:
+        from app.core.redis_client import get_redis
+        redis = await get_redis()
+        pubsub = redis.pubsub()
+        await pubsub.subscribe(_channel(task_id))
+        return pubsub
+    except Exception as e:
+        logger.warning("Redis status watch failed for task %s: %s", task_id, e)
+        return None
+
+
+async def _watch_redis(task_id: str, pubsub, statuses: frozenset[TaskStatus], fut: asyncio.Future) -> None:
+    try:
+        async for message in pubsub.listen():
+            if message.get("type") != "message":
+                continue
+            if TaskStatus(message["data"]) in statuses:
+                _set_result(fut)
+                return
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.warning("Redis status watch failed for task %s: %s", task_id, e)
+
+
+async def _close_pubsub(task_id: str, pubsub) -> None:
+    try:
+        await pubsub.unsubscribe(_channel(task_id))
+        await pubsub.close()
+    except Exception as e:
+        logger.debug("Error closing status subscription for task %s: %s", task_id, e)
+
+
+async def wait_for_status(task_id: str, statuses: frozenset[TaskStatus], timeout: float) -> bool:
+    """Wait until *task_id* reaches one of *statuses*. Returns False on timeout."""
+    fut = asyncio.get_running_loop().create_future()
+    entry = (statuses, fut)
+    _waiters.setdefault(task_id, []).append(entry)
+    pubsub = watcher = None
+    try:
+        if settings.USE_QUEUE:
+            # Subscribed before the re-check, so a status published by another
+            # process after it still arrives
+            pubsub = await _subscribe(task_id)
+            if pubsub is not None:
+                watcher = asyncio.create_task(_watch_redis(task_id, pubsub, statuses, fut))
+        # Re-check after registering so a transition in between isn't missed
+        task = get_task_repo().get(task_id)
+        if task is not None and task.status in statuses:
+            return True
+        await asyncio.wait_for(fut, timeout=timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
+    finally:
+        if watcher is not None:
+            watcher.cancel()
+            await asyncio.gather(watcher, return_exceptions=True)
+        if pubsub is not None:
+            await _close_pubsub(task_id, pubsub)
+        entries = _waiters.get(task_id, [])
+        if entry in entries:
+            entries.remove(entry)
+        if not entries:
+            _waiters.pop(task_id, None)
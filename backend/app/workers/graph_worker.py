@@ -5,6 +5,7 @@ Run with: arq app.workers.graph_worker.WorkerSettings
 
 import logging
 
+from app.config import settings
 from app.core.key_context import RequestKeys, request_keys
 
 logger = logging.getLogger(__name__)
@@ -26,26 +27,38 @@ async def execute_graph_job(
     token = request_keys.set(keys)
 
     try:
+        from app.models.domain import TaskStatus
+        from app.services.recovery import RECOVERABLE_STATUSES
         from app.services.task_service import get_task, _run_task
         task = get_task(task_id)
         if task is None:
             logger.error("Task %s not found", task_id)
             return
-        await _run_task(task)
+        # ARQ re-delivers jobs of a worker that died; pick up where it stopped.
+        # A job re-delivered after its task finished (or parked for human
+        # approval, which the approval endpoint resumes) has nothing to do.
+        if task.status not in RECOVERABLE_STATUSES:
+            logger.info("Task %s is %s, skipping re-delivered job", task_id, task.status.value)
+            return
+        await _run_task(task, resume=task.status != TaskStatus.PENDING)
     finally:
         request_keys.reset(token)
 
 
 async def startup(ctx: dict) -> None:
-    """ARQ worker startup — initialize DB if needed."""
+    """ARQ worker startup — initialize DB and checkpointer if needed."""
     from app.config import settings
     if settings.STORAGE_BACKEND == "postgres":
         from app.core.database import init_db
         init_db()
+    from app.core.checkpoint import open_checkpointer
+    await open_checkpointer()
     logger.info("ARQ worker started")
 
 
 async def shutdown(ctx: dict) -> None:
+    from app.core.checkpoint import close_checkpointer
+    await close_checkpointer()
     logger.info("ARQ worker stopped")
 
 
@@ -54,6 +67,8 @@ class WorkerSettings:
     functions = [execute_graph_job]
     on_startup = startup
     on_shutdown = shutdown
+    # Same concurrency cap as the in-process scheduler
+    max_jobs = settings.MAX_CONCURRENT_GRAPHS
 
     # Import redis settings at runtime
     @staticmethod
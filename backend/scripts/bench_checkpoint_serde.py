@@ -0,0 +1,119 @@
+"""Benchmark checkpoint serialization: time and bytes per snapshot.
+
+Compares LangGraph's default serializer (msgpack) with
+``app.core.serde.CompressedSerializer`` using zlib and zstd, on:
+
+- ``orchestrator``: a SaladinState snapshot as checkpointed today (output refs);
+- ``orchestrator-inline``: the same with three worker outputs inlined, as
+  checkpoints looked before outputs were stored by reference;
+- ``worker-react``: a worker ReAct subgraph state after 12 tool calls whose
+  results are files from this repository (realistic code/text entropy).
+
+Run from backend/:  python -m scripts.bench_checkpoint_serde
+"""
+
+import argparse
+import pathlib
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from app.agents.output_store import output_ref
+from app.agents.state import ReviewResult
+from app.core.serde import CompressedSerializer
+
+_SOURCES = sorted(pathlib.Path(__file__).resolve().parents[1].joinpath("app").rglob("*.py"))
+
+
+def _source_text(index: int, min_chars: int = 6000) -> str:
+    text = ""
+    while len(text) < min_chars:
+        text += _SOURCES[index % len(_SOURCES)].read_text()
+        index += 7
+    return text[: min_chars * 2]
+
+
+def _orchestrator(inline: bool) -> dict:
+    workers = []
+    for i in range(3):
+        output = _source_text(i * 11, 12_000)
+        entry = {"agent_id": f"agent-{i}", "agent_name": f"Worker {i}"}
+        entry.update({"output": output} if inline else {"output_ref": output_ref(output)})
+        workers.append(entry)
+    state = {
+        "task_id": "6f1c3f0e-2b1a-4c55-9a43-0d3c9b1f2e77",
+        "task_description": "Add pagination to the tasks API and cover it with tests. " * 4,
+        "assigned_agent_ids": [w["agent_id"] for w in workers],
+        "worker_outputs": workers,
+        "supervisor_review": ReviewResult(decision="revise", feedback="Handle empty pages. " * 10),
+        "current_revision": 1,
+        "max_revisions": 3,
+        "final_output": "",
+        "status": "under_review",
+        "requires_human_approval": False,
+        "human_decision": None,
+    }
+    if inline:
+        state["messages"] = [AIMessage(content='{"decision": "revise", "feedback": "..."}' * 20)] * 2
+    return state
+
+
+def _worker_react() -> dict:
+    messages = [SystemMessage(content="You are a worker agent. " * 40), HumanMessage(content="Fix the failing test")]
+    for step in range(12):
+        call_id = f"call_{step:02d}"
+        messages.append(AIMessage(content="", tool_calls=[
+            {"name": "read_file", "args": {"path": str(_SOURCES[step * 5 % len(_SOURCES)].name)}, "id": call_id},
+        ]))
+        messages.append(ToolMessage(content=_source_text(step * 5), tool_call_id=call_id, name="read_file"))
+    return {"messages": messages, "remaining_steps": 38}
+
+
+SNAPSHOTS = {
+    "orchestrator": lambda: _orchestrator(inline=False),
+    "orchestrator-inline": lambda: _orchestrator(inline=True),
+    "worker-react": _worker_react,
+}
+
+# Compiling the graph adds state schema types to the allowlist; do the same here
+_ALLOWED = [("app.agents.state", "ReviewResult")]
+SERIALIZERS = {
+    "msgpack": JsonPlusSerializer(allowed_msgpack_modules=_ALLOWED),
+    "msgpack+zlib": CompressedSerializer(codec="zlib", min_bytes=2048, allowed_msgpack_modules=_ALLOWED),
+    "msgpack+zstd": CompressedSerializer(codec="zstd", min_bytes=2048, allowed_msgpack_modules=_ALLOWED),
+}
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    print(f"{'snapshot':<20} {'serializer':<14} {'bytes':>10} {'ratio':>6} {'dump ms':>8} {'load ms':>8}")
+    for snapshot_name, build in SNAPSHOTS.items():
+        snapshot = build()
+        baseline = None
+        for serde_name, serde in SERIALIZERS.items():
+            typed = serde.dumps_typed(snapshot)
+            size = len(typed[1])
+            baseline = baseline or size
+            dump_ms = _time(lambda: serde.dumps_typed(snapshot), args.repeat)
+            load_ms = _time(lambda: serde.loads_typed(typed), args.repeat)
+            print(
+                f"{snapshot_name:<20} {serde_name:<14} {size:>10,} {baseline / size:>5.1f}x "
+                f"{dump_ms:>8.2f} {load_ms:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
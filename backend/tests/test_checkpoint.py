@@ -0,0 +1,105 @@
+import pytest
+
+from app.agents.graph import get_compiled_graph
+from app.config import settings
+from app.core import checkpoint
+
+
+@pytest.fixture
+async def sqlite_backend(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "STORAGE_BACKEND", "postgres")
+    monkeypatch.setattr(settings, "DATABASE_URL", f"sqlite:///{tmp_path}/saladin.db")
+    monkeypatch.setattr(settings, "CHECKPOINT_SQLITE_PATH", str(tmp_path / "checkpoints.db"))
+    yield
+    await checkpoint.close_checkpointer()
+
+
+def test_sqlalchemy_urls_become_psycopg_conninfo():
+    assert checkpoint._postgres_conninfo("postgresql+psycopg2://u:p@db/saladin") == "postgresql://u:p@db/saladin"
+    assert checkpoint._postgres_conninfo("postgres://u@db/x") == "postgresql://u@db/x"
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_has_no_checkpointer():
+    assert await checkpoint.open_checkpointer() is None
+    assert get_compiled_graph().checkpointer is None
+
+
+@pytest.mark.asyncio
+async def test_sqlite_database_gets_an_async_saver(sqlite_backend):
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+    saver = await checkpoint.open_checkpointer()
+
+    assert isinstance(saver, AsyncSqliteSaver)
+    assert await checkpoint.open_checkpointer() is saver
+    assert get_compiled_graph().checkpointer is saver
+
+    await checkpoint.close_checkpointer()
+    assert checkpoint.get_checkpointer() is None
+    assert get_compiled_graph().checkpointer is None
+
+
+async def _write_checkpoints(saver, thread_id: str, count: int) -> None:
+    from langgraph.checkpoint.base import empty_checkpoint
+
+    config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    for _ in range(count):
+        config = await saver.aput(config, empty_checkpoint(), {}, {})
+        await saver.aput_writes(config, [("messages", "x")], task_id="t")
+
+
+async def _count(saver, thread_id: str) -> int:
+    return len([c async for c in saver.alist({"configurable": {"thread_id": thread_id}})])
+
+
+@pytest.mark.asyncio
+async def test_pruning_applies_retention_per_task_state(sqlite_backend, monkeypatch):
+    from app.core import repository
+    from app.models.domain import TaskRecord, TaskStatus
+
+    repo = repository.InMemoryTaskRepo()
+    monkeypatch.setattr(repository, "_task_repo", repo)
+    monkeypatch.setattr(settings, "CHECKPOINT_KEEP_ACTIVE", 3)
+    monkeypatch.setattr(settings, "CHECKPOINT_RETENTION_SECONDS", 3600)
+    running = TaskRecord(description="r", status=TaskStatus.RUNNING)
+    done = TaskRecord(description="d", status=TaskStatus.APPROVED)
+    expired = TaskRecord(description="e", status=TaskStatus.FAILED, updated_at="2020-01-01T00:00:00+00:00")
+
+    saver = await checkpoint.open_checkpointer()
+    for task in (running, done, expired):
+        repo.save(task)
+        await _write_checkpoints(saver, task.id, 6)
+    await _write_checkpoints(saver, "orphan", 2)
+    monkeypatch.setattr(repo, "get", None)  # statuses come from one status_by_id query
+
+    assert await checkpoint.prune_checkpoints() == {"deleted": 2, "pruned": 2}
+
+    assert await _count(saver, running.id) == 3
+    assert await _count(saver, done.id) == 1
+    assert await _count(saver, expired.id) == 0
+    assert await _count(saver, "orphan") == 0
+    latest = await saver.aget_tuple({"configurable": {"thread_id": done.id}})
+    assert latest.pending_writes  # writes of the kept checkpoint survive
+    async with checkpoint._conn.execute("SELECT COUNT(*) FROM writes") as cursor:
+        assert (await cursor.fetchone())[0] == 4
+
+
+def test_sql_status_by_id_reads_only_existing_tasks(tmp_path, monkeypatch):
+    from sqlmodel import SQLModel, create_engine
+
+    from app.core import database, repository
+    from app.models.domain import TaskRecord, TaskStatus
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'status.db'}")
+    SQLModel.metadata.create_all(engine)
+    monkeypatch.setattr(database, "_engine", engine)
+    monkeypatch.setattr(repository, "_IN_BATCH", 2)
+    repo = repository.SQLTaskRepo()
+    tasks = [TaskRecord(description=str(i), status=TaskStatus.APPROVED) for i in range(3)]
+    for task in tasks:
+        repo.save(task)
+
+    found = repo.status_by_id([t.id for t in tasks] + ["missing"])
+
+    assert found == {t.id: (TaskStatus.APPROVED, t.updated_at) for t in tasks}
@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import HumanMessage
+
+from app.agents.call_limits import CallLimits, limited_class
+from app.core.concurrency import AIMDController, ConcurrencyRegistry, is_overload_error
+
+
+class _StatusError(Exception):
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def test_additive_increase_multiplicative_decrease():
+    c = AIMDController(initial=4, minimum=1, maximum=8, cooldown=0)
+    for _ in range(5):
+        c.on_success(latency=1.0)
+    assert int(c.limit) == 5
+
+    before = c.limit
+    assert c.on_overload() is True
+    assert c.limit == pytest.approx(before / 2)
+    c.on_overload()
+    c.on_overload()
+    assert c.limit == 1.0  # clamped at minimum
+
+
+def test_overload_cut_once_per_cooldown():
+    c = AIMDController(initial=8, cooldown=60)
+    assert c.on_overload() is True
+    assert c.on_overload() is False
+    assert c.limit == 4.0
+
+
+def test_slow_responses_hold_the_limit():
+    c = AIMDController(initial=4)
+    c.on_success(latency=1.0)
+    before = c.limit
+    c.on_success(latency=5.0)
+    assert c.limit == before
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_for_a_free_slot():
+    c = AIMDController(initial=1)
+    await c.acquire()
+    assert c.try_acquire() is False
+
+    waiter = asyncio.create_task(c.acquire())
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+    c.release()
+    await asyncio.wait_for(waiter, 1)
+    assert c.in_flight == 1
+
+
+def test_is_overload_error():
+    assert is_overload_error(_StatusError(429))
+    assert is_overload_error(_StatusError(529))
+    assert is_overload_error(RuntimeError("Resource exhausted: quota"))
+    assert not is_overload_error(_StatusError(400))
+    assert not is_overload_error(ValueError("bad prompt"))
+
+
+class _SlowModel(GenericFakeChatModel):
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(10)
+
+
+def _limited_model(base, registry: ConcurrencyRegistry, **kwargs):
+    model = limited_class(base)(messages=iter([]), **kwargs)
+    model._call_limits = CallLimits("fake:k", concurrency=registry)
+    return model
+
+
+@pytest.mark.asyncio
+async def test_overload_cuts_limit_and_rate_on_429(monkeypatch):
+    from app.core import concurrency as concurrency_module
+    from app.core.rate_limiter import RateLimiterRegistry
+
+    limiter = RateLimiterRegistry()
+    monkeypatch.setattr(concurrency_module, "rate_limiter", limiter)
+    registry = ConcurrencyRegistry()
+
+    def _raise(*args, **kwargs):
+        raise _StatusError(429)
+
+    model = _limited_model(GenericFakeChatModel, registry)
+    monkeypatch.setattr(GenericFakeChatModel, "_generate", _raise)
+
+    with pytest.raises(_StatusError):
+        await model.ainvoke([HumanMessage(content="hi")])
+
+    controller = registry.get("fake:k")
+    assert controller.in_flight == 0
+    assert controller.limit < controller.initial
+    assert limiter.get_bucket_by_key("fake:k").rate < 1.0  # below the 60 RPM default
+
+
+@pytest.mark.asyncio
+async def test_cancelled_call_releases_its_slot():
+    registry = ConcurrencyRegistry()
+    model = _limited_model(_SlowModel, registry)
+    controller = registry.get("fake:k")
+
+    call = asyncio.create_task(model.ainvoke([HumanMessage(content="hi")]))
+    await asyncio.sleep(0.05)
+    assert controller.in_flight == 1
+    call.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await call
+    assert controller.in_flight == 0
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(model.ainvoke([HumanMessage(content="hi")]), 0.05)
+    assert controller.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_limited_model_keeps_provider_identity():
+    model = _limited_model(GenericFakeChatModel, ConcurrencyRegistry())
+    assert isinstance(model, GenericFakeChatModel)
+    assert type(model).__name__ == "GenericFakeChatModel"
+    assert model.get_lc_namespace() == GenericFakeChatModel.get_lc_namespace()
@@ -28,6 +28,7 @@ async def test_health_details_endpoint(async_client: httpx.AsyncClient):
         "sandbox_mode",
         "llm_provider",
         "llm_model",
+        "scheduler",
     ]
     for field in expected_fields:
         assert field in json_response
@@ -0,0 +1,67 @@
+import time
+
+import pytest
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+
+from app.core.llm_cache import SQLiteLRUCache, bypass_llm_cache, is_cache_hit
+
+
+def _model(cache, replies):
+    return GenericFakeChatModel(messages=iter(AIMessage(content=r) for r in replies), cache=cache)
+
+
+@pytest.mark.asyncio
+async def test_identical_prompt_is_served_from_cache(tmp_path):
+    cache = SQLiteLRUCache(str(tmp_path / "c.db"), max_bytes=1_000_000, ttl_seconds=60)
+    model = _model(cache, ["first", "second"])
+
+    a = await model.ainvoke([HumanMessage(content="hello")])
+    b = await model.ainvoke([HumanMessage(content="hello")])
+
+    assert a.content == b.content == "first"
+    assert b.response_metadata.get("llm_cache_hit") is True
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_entries_survive_reopen_and_expire(tmp_path):
+    path = str(tmp_path / "c.db")
+    _model(SQLiteLRUCache(path, 1_000_000, 60), ["x"]).invoke("hi")
+
+    reopened = SQLiteLRUCache(path, 1_000_000, ttl_seconds=0)
+    time.sleep(0.01)
+    assert reopened.lookup("anything", "else") is None
+    assert reopened.stats()["bytes"] > 0
+    assert _model(reopened, ["fresh"]).invoke("hi").content == "fresh"
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = SQLiteLRUCache(str(tmp_path / "c.db"), max_bytes=2_000, ttl_seconds=60)
+    model = _model(cache, [str(i) * 300 for i in range(11)])
+    for i in range(10):
+        model.invoke(f"prompt {i}")
+
+    assert cache.stats()["bytes"] <= 2_000
+    assert not is_cache_hit(model.generate([[HumanMessage(content="prompt 0")]]))
+
+
+def test_bypass_skips_lookup_and_store(tmp_path):
+    cache = SQLiteLRUCache(str(tmp_path / "c.db"), max_bytes=1_000_000, ttl_seconds=60)
+    model = _model(cache, ["a", "b", "c"])
+    with bypass_llm_cache():
+        model.invoke("hi")
+    assert cache.stats()["bytes"] == 0
+    model.invoke("hi")
+    with bypass_llm_cache():
+        assert model.invoke("hi").content == "c"
+
+
+def test_scopes_do_not_share_entries(tmp_path):
+    cache = SQLiteLRUCache(str(tmp_path / "c.db"), max_bytes=1_000_000, ttl_seconds=60)
+
+    _model(cache.scoped("tenant-a"), ["a's answer"]).invoke("hi")
+    other = _model(cache.scoped("tenant-b"), ["b's answer"]).invoke("hi")
+    again = _model(cache.scoped("tenant-a"), ["unused"]).invoke("hi")
+
+    assert other.content == "b's answer"
+    assert again.content == "a's answer"
@@ -0,0 +1,46 @@
+import pytest
+
+from app.agents import llm_factory
+from app.agents.llm_factory import clear_llm_pool, create_llm
+
+
+@pytest.fixture(autouse=True)
+def _empty_pool():
+    clear_llm_pool()
+    yield
+    clear_llm_pool()
+
+
+def test_same_arguments_reuse_one_client():
+    a = create_llm(provider="anthropic", api_key="k1", max_tokens=1000)
+    b = create_llm(provider="anthropic", api_key="k1", max_tokens=1000)
+    assert a is b
+
+
+def test_pool_key_includes_key_tokens_and_streaming():
+    base = create_llm(provider="anthropic", api_key="k1", max_tokens=1000)
+    assert create_llm(provider="anthropic", api_key="k2", max_tokens=1000) is not base
+    assert create_llm(provider="anthropic", api_key="k1", max_tokens=2000) is not base
+    assert create_llm(provider="anthropic", api_key="k1", max_tokens=1000, streaming=True) is not base
+
+
+def test_pool_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(llm_factory.settings, "LLM_CLIENT_POOL_SIZE", 2)
+    first = create_llm(provider="anthropic", api_key="k1")
+    create_llm(provider="anthropic", api_key="k2")
+    create_llm(provider="anthropic", api_key="k1")  # touch k1
+    create_llm(provider="anthropic", api_key="k3")  # evicts k2
+
+    assert len(llm_factory._pool) == 2
+    assert create_llm(provider="anthropic", api_key="k1") is first
+    k2 = llm_factory._key_digest("k2")
+    assert all(key[2] != k2 for key in llm_factory._pool)
+
+
+def test_pool_never_shares_a_client_between_keys_with_the_same_short_hash(monkeypatch):
+    # Bucket keys are 32-bit; force a collision between two API keys
+    monkeypatch.setattr(llm_factory.rate_limiter, "key", lambda provider, api_key="": f"{provider}:same")
+    a = create_llm(provider="anthropic", api_key="user-a-key")
+    b = create_llm(provider="anthropic", api_key="user-b-key")
+    assert a is not b
+    assert b.anthropic_api_key.get_secret_value() == "user-b-key"
@@ -0,0 +1,34 @@
+import pickle
+
+from app.agents import output_store
+from app.agents.output_store import put_output, resolve_outputs
+from app.agents.state import WorkerResult
+from app.core.repository import get_task_repo
+from app.models.domain import TaskRecord, WorkerOutput
+
+
+def test_state_carries_a_reference_not_the_text():
+    text = "x" * 50_000
+    result = WorkerResult(agent_id="a1", agent_name="Coder", output_ref=put_output(text))
+
+    assert len(pickle.dumps(result)) < 200
+    assert resolve_outputs("unused", [result]) == [text]
+
+
+def test_outputs_resolve_from_the_task_record_in_a_fresh_process():
+    task = TaskRecord(description="t", worker_outputs=[
+        WorkerOutput(agent_id="a1", output="first"),
+        WorkerOutput(agent_id="a2", output="second"),
+    ])
+    get_task_repo().save(task)
+    refs = [
+        WorkerResult(agent_id=wo.agent_id, agent_name="", output_ref=output_store.output_ref(wo.output))
+        for wo in reversed(task.worker_outputs)
+    ]
+    output_store._outputs.clear()
+
+    assert resolve_outputs(task.id, refs) == ["second", "first"]
+
+
+def test_inline_outputs_from_older_checkpoints_still_resolve():
+    assert resolve_outputs("unused", [{"agent_id": "a1", "agent_name": "", "output": "inline"}]) == ["inline"]
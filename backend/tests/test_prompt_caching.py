@@ -0,0 +1,36 @@
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+from app.agents.llm_factory import cacheable_content, create_llm
+from app.core.telemetry import extract_cache_usage
+
+
+def test_anthropic_gets_a_breakpoint_after_the_stable_prefix():
+    llm = create_llm(provider="anthropic", api_key="k")
+    content = cacheable_content(llm, "instructions", "per-call tail")
+
+    assert content[0]["cache_control"] == {"type": "ephemeral"}
+    assert "cache_control" not in content[1]
+
+    payload = llm._get_request_payload([SystemMessage(content=content), HumanMessage(content="hi")])
+    assert payload["system"][0]["cache_control"] == {"type": "ephemeral"}
+
+
+def test_other_providers_get_plain_text_in_the_same_order():
+    llm = create_llm(provider="openai", api_key="k")
+    assert cacheable_content(llm, "instructions", " tail") == "instructions tail"
+
+
+def test_cached_token_counts_are_extracted():
+    message = AIMessage(
+        content="ok",
+        usage_metadata={
+            "input_tokens": 1200,
+            "output_tokens": 10,
+            "total_tokens": 1210,
+            "input_token_details": {"cache_read": 1000, "cache_creation": 0},
+        },
+    )
+    response = LLMResult(generations=[[ChatGeneration(message=message)]])
+    assert extract_cache_usage(response) == (1000, 0)
+    assert extract_cache_usage(LLMResult(generations=[[]])) == (0, 0)
@@ -0,0 +1,103 @@
+import asyncio
+import time
+
+import pytest
+
+from app.agents.llm_factory import create_llm
+from app.core.rate_limiter import LeakyBucket, ModelRateLimiter, RateLimiterRegistry
+
+
+@pytest.mark.asyncio
+async def test_bucket_waits_once_burst_is_spent():
+    bucket = LeakyBucket(rate=100.0, capacity=2)
+    assert await bucket.acquire() == 0.0
+    assert await bucket.acquire() == 0.0
+    waited = await bucket.acquire()
+    assert 0 < waited <= 0.011
+
+
+def test_bucket_sync_path_and_try_acquire():
+    bucket = LeakyBucket(rate=100.0, capacity=1)
+    assert bucket.try_acquire() is True
+    assert bucket.try_acquire() is False
+    start = time.monotonic()
+    bucket.acquire_sync()
+    assert time.monotonic() - start > 0.005
+
+
+@pytest.mark.asyncio
+async def test_model_limiter_records_wait_metrics():
+    registry = RateLimiterRegistry()
+    limiter = registry.for_model("openai", "sk-test")
+    assert await limiter.aacquire() is True
+    assert limiter.acquire() is True
+
+    stats = registry.stats()
+    (key,) = stats
+    assert key.startswith("openai:") and "sk-test" not in key
+    assert stats[key]["acquisitions"] == 2
+
+
+def test_buckets_are_per_key():
+    registry = RateLimiterRegistry()
+    assert registry.get_bucket("openai", "a") is not registry.get_bucket("openai", "b")
+    assert registry.get_bucket("openai", "a") is registry.get_bucket("openai", "a")
+
+
+def test_create_llm_attaches_rate_limiter():
+    llm = create_llm(provider="anthropic", api_key="test-key")
+    assert isinstance(llm.rate_limiter, ModelRateLimiter)
+
+
+@pytest.mark.asyncio
+async def test_token_budget_reserves_and_reconciles_with_actual_usage():
+    from langchain_core.language_models import GenericFakeChatModel
+    from langchain_core.messages import AIMessage, HumanMessage
+
+    from app.agents.call_limits import CallLimits, limited_class
+    from app.core.rate_limiter import TokenBudget
+
+    registry = RateLimiterRegistry()
+    budget = TokenBudget(input_tpm=60_000, output_tpm=6_000)
+    reply = AIMessage(
+        content="ok",
+        usage_metadata={"input_tokens": 10, "output_tokens": 2, "total_tokens": 12},
+    )
+    model = limited_class(GenericFakeChatModel)(messages=iter([reply]))
+    model._call_limits = CallLimits(
+        "fake:k", budget=budget, registry=registry, stats_key="fake:tokens", max_tokens=1024,
+    )
+
+    await model.ainvoke([HumanMessage(content="x" * 4000)])
+
+    # Reservation (~1000 in / 512 out) was refunded down to the real usage
+    assert budget.input._tokens == pytest.approx(60_000 - 10, abs=5)
+    assert budget.output._tokens == pytest.approx(6_000 - 2, abs=5)
+    assert registry.stats()["fake:tokens"]["acquisitions"] == 1
+
+
+def test_token_budget_disabled_by_default():
+    assert RateLimiterRegistry().token_budget("openai", "k") is None
+
+
+@pytest.mark.asyncio
+async def test_token_budget_refunds_a_call_cancelled_while_waiting():
+    from langchain_core.language_models import GenericFakeChatModel
+    from langchain_core.messages import HumanMessage
+
+    from app.agents.call_limits import CallLimits, limited_class
+    from app.core.rate_limiter import TokenBudget
+
+    class _AsyncModel(GenericFakeChatModel):
+        async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+            raise AssertionError("request sent before the budget allowed it")
+
+    budget = TokenBudget(input_tpm=600, output_tpm=6_000)
+    model = limited_class(_AsyncModel)(messages=iter([]))
+    model._call_limits = CallLimits("fake:k", budget=budget, registry=RateLimiterRegistry(), max_tokens=100)
+
+    # ~1000 estimated input tokens against a 600 TPM bucket: has to wait
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(model.ainvoke([HumanMessage(content="x" * 4000)]), 0.05)
+    assert budget.input._tokens == pytest.approx(600, abs=5)
+    assert budget.output._tokens == pytest.approx(6_000, abs=5)
@@ -0,0 +1,92 @@
+import pytest
+
+from app.agents import graph as graph_module
+from app.agents.output_store import put_output
+from app.config import settings
+from app.core import checkpoint
+from app.core.repository import get_task_repo
+from app.models.domain import TaskRecord, TaskStatus
+from app.services import recovery
+
+
+@pytest.mark.asyncio
+async def test_unfinished_tasks_are_requeued(monkeypatch):
+    submitted = []
+    monkeypatch.setattr(recovery.scheduler, "submit", lambda task, resume=False: submitted.append((task.id, resume)))
+    tasks = {status: TaskRecord(description=status.value, status=status) for status in TaskStatus}
+    for task in tasks.values():
+        get_task_repo().save(task)
+
+    await recovery.recover_tasks()
+
+    assert (tasks[TaskStatus.PENDING].id, False) in submitted
+    for status in (TaskStatus.RUNNING, TaskStatus.UNDER_REVIEW, TaskStatus.REVISION):
+        assert (tasks[status].id, True) in submitted
+    for status in (TaskStatus.APPROVED, TaskStatus.REJECTED, TaskStatus.FAILED, TaskStatus.PENDING_HUMAN_APPROVAL):
+        assert tasks[status].id not in {task_id for task_id, _ in submitted}
+
+
+@pytest.mark.asyncio
+async def test_redelivered_job_of_a_finished_task_does_nothing(monkeypatch):
+    from app.services import task_service
+    from app.workers.graph_worker import execute_graph_job
+
+    runs = []
+
+    async def run_task(task, keys=None, resume=False):
+        runs.append((task.id, resume))
+
+    monkeypatch.setattr(task_service, "_run_task", run_task)
+    done = TaskRecord(description="done", status=TaskStatus.APPROVED)
+    running = TaskRecord(description="running", status=TaskStatus.RUNNING)
+    get_task_repo().save(done)
+    get_task_repo().save(running)
+
+    await execute_graph_job({}, done.id)
+    await execute_graph_job({}, running.id)
+
+    assert runs == [(running.id, True)]
+
+
+@pytest.fixture
+async def sqlite_checkpointer(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "STORAGE_BACKEND", "postgres")
+    monkeypatch.setattr(settings, "DATABASE_URL", f"sqlite:///{tmp_path}/saladin.db")
+    monkeypatch.setattr(settings, "CHECKPOINT_SQLITE_PATH", str(tmp_path / "checkpoints.db"))
+    await checkpoint.open_checkpointer()
+    monkeypatch.setattr(settings, "STORAGE_BACKEND", "memory")
+    yield
+    await checkpoint.close_checkpointer()
+
+
+@pytest.mark.asyncio
+async def test_resume_continues_from_the_checkpoint_without_rerunning_workers(sqlite_checkpointer, monkeypatch):
+    async def no_workers(state):
+        raise AssertionError("workers must not run again")
+
+    async def approve(state, llm_provider="", llm_model=""):
+        return {"supervisor_review": {"decision": "approve", "feedback": "ok"}}
+
+    monkeypatch.setattr(graph_module, "dispatch_workers", no_workers)
+    monkeypatch.setattr(graph_module, "supervisor_review", approve)
+    task = TaskRecord(description="t", status=TaskStatus.UNDER_REVIEW, assigned_agents=[])
+    get_task_repo().save(task)
+
+    # State as checkpointed right after the workers finished, before the crash
+    compiled = graph_module.get_compiled_graph()
+    config = {"configurable": {"thread_id": task.id}}
+    await compiled.aupdate_state(config, {
+        "task_id": task.id,
+        "task_description": "t",
+        "assigned_agent_ids": [],
+        "worker_outputs": [{"agent_id": "a1", "agent_name": "W", "output_ref": put_output("done work")}],
+        "current_revision": 0,
+        "max_revisions": 3,
+        "requires_human_approval": False,
+    }, as_node="dispatch_workers")
+
+    await graph_module.run_graph(task, resume=True)
+
+    stored = get_task_repo().get(task.id)
+    assert stored.status == TaskStatus.APPROVED
+    assert stored.final_output == "done work"
@@ -0,0 +1,61 @@
+import pytest
+
+from app.config import settings
+from app.core.repository import get_task_repo
+from app.models.domain import TaskRecord, TaskStatus
+from app.services import _chroma, task_service
+
+
+@pytest.fixture
+def prior(monkeypatch):
+    task = TaskRecord(
+        description="add tests for the parser",
+        status=TaskStatus.APPROVED,
+        final_output="def test_parser(): ...",
+    )
+    get_task_repo().save(task)
+    monkeypatch.setattr(settings, "SEMANTIC_CACHE_ENABLED", True)
+    monkeypatch.setattr(_chroma, "query_task_results", lambda description, k=3: [(task.id, 0.97)])
+    return task
+
+
+@pytest.mark.asyncio
+async def test_return_mode_finishes_task_with_prior_output(prior, monkeypatch):
+    monkeypatch.setattr(settings, "SEMANTIC_CACHE_MODE", "return")
+    task = TaskRecord(description="add tests to the parser module")
+    get_task_repo().save(task)
+
+    assert await task_service._check_result_cache(task) == ""
+
+    stored = get_task_repo().get(task.id)
+    assert stored.status == TaskStatus.APPROVED
+    assert stored.final_output == prior.final_output
+    assert (stored.cache_decision, stored.cache_source_task_id) == ("returned", prior.id)
+
+
+@pytest.mark.asyncio
+async def test_seed_mode_and_human_approval_only_seed(prior, monkeypatch):
+    monkeypatch.setattr(settings, "SEMANTIC_CACHE_MODE", "return")
+    task = TaskRecord(description="add tests to the parser module", requires_human_approval=True)
+
+    assert await task_service._check_result_cache(task) == prior.final_output
+    assert task.cache_decision == "seeded"
+    assert task.status == TaskStatus.PENDING
+
+
+@pytest.mark.asyncio
+async def test_below_threshold_is_a_miss(prior, monkeypatch):
+    monkeypatch.setattr(_chroma, "query_task_results", lambda description, k=3: [(prior.id, 0.5)])
+    task = TaskRecord(description="rewrite the scheduler")
+
+    assert await task_service._check_result_cache(task) == ""
+    assert task.cache_decision == "miss"
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_records_nothing(prior, monkeypatch):
+    monkeypatch.setattr(settings, "SEMANTIC_CACHE_ENABLED", False)
+    task = TaskRecord(description="add tests to the parser module")
+
+    assert await task_service._check_result_cache(task) == ""
+    assert task.cache_decision == ""
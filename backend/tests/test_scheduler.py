@@ -0,0 +1,33 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.models.domain import TaskRecord
+from app.services.scheduler import TaskScheduler
+
+
+@pytest.mark.asyncio
+async def test_scheduler_caps_concurrency_and_orders_by_priority():
+    started: list[str] = []
+    release = asyncio.Event()
+
+    async def fake_run(task, keys=None, resume=False):
+        started.append(task.description)
+        await release.wait()
+
+    sched = TaskScheduler(max_concurrent=1)
+    with patch("app.services.task_service._run_task", fake_run):
+        sched.submit(TaskRecord(description="first"))
+        sched.submit(TaskRecord(description="deep-child", parent_task_id="p", depth=2))
+        sched.submit(TaskRecord(description="child", parent_task_id="p", depth=1))
+        sched.submit(TaskRecord(description="user"))
+        await asyncio.sleep(0)
+
+        assert sched.stats() == {"running": 1, "queued": 3, "max_concurrent": 1}
+        release.set()
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+    assert started == ["first", "user", "child", "deep-child"]
+    assert sched.running == 0 and sched.queued == 0
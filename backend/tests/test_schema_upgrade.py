@@ -0,0 +1,43 @@
+from sqlalchemy import inspect, text
+from sqlmodel import create_engine
+
+from app.core.database import add_missing_columns, create_missing_indexes
+import app.models.database  # noqa: F401
+
+
+def _old_database(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        # tasks as created before updated_at was indexed and cache_* were added
+        conn.execute(text(
+            "CREATE TABLE tasks (id VARCHAR PRIMARY KEY, description VARCHAR, status VARCHAR,"
+            " assigned_agents JSON, current_revision INTEGER, max_revisions INTEGER,"
+            " final_output VARCHAR, requires_human_approval BOOLEAN, created_at VARCHAR,"
+            " updated_at VARCHAR, parent_task_id VARCHAR, depth INTEGER,"
+            " child_task_ids JSON, spawned_by_agent VARCHAR)"
+        ))
+        conn.execute(text("INSERT INTO tasks (id, description) VALUES ('old', 'before upgrade')"))
+    return engine
+
+
+def test_missing_index_is_created_on_existing_table(tmp_path):
+    engine = _old_database(tmp_path)
+
+    create_missing_indexes(engine)
+    create_missing_indexes(engine)  # idempotent
+
+    indexes = inspect(engine).get_indexes("tasks")
+    assert [ix["column_names"] for ix in indexes] == [["updated_at"]]
+
+
+def test_missing_columns_are_added_with_defaults(tmp_path):
+    engine = _old_database(tmp_path)
+
+    add_missing_columns(engine)
+    add_missing_columns(engine)  # idempotent
+
+    columns = {col["name"] for col in inspect(engine).get_columns("tasks")}
+    assert {"cache_decision", "cache_source_task_id"} <= columns
+    with engine.connect() as conn:
+        row = conn.execute(text("SELECT cache_decision, cache_source_task_id FROM tasks")).one()
+    assert tuple(row) == ("", "")
@@ -0,0 +1,44 @@
+import pytest
+from langchain_core.messages import AIMessage, ToolMessage
+
+from app.agents.state import ReviewResult
+from app.core.serde import CompressedSerializer
+
+
+def _state():
+    return {
+        "messages": [
+            AIMessage(content="", tool_calls=[{"name": "read_file", "args": {"path": "a.py"}, "id": "c1"}]),
+            ToolMessage(content="def handler(request):\n    return None\n" * 400, tool_call_id="c1"),
+        ],
+        "supervisor_review": ReviewResult(decision="revise", feedback="add tests"),
+    }
+
+
+def test_large_payloads_are_compressed_and_round_trip():
+    serde = CompressedSerializer(codec="zstd", min_bytes=1024)
+
+    type_, data = serde.dumps_typed(_state())
+
+    assert type_ == "msgpack+zstd"
+    assert len(data) < 1024
+    restored = serde.loads_typed((type_, data))
+    assert restored["messages"][1].content == _state()["messages"][1].content
+    assert restored["supervisor_review"].decision == "revise"
+
+
+def test_small_payloads_stay_plain_msgpack():
+    assert CompressedSerializer(min_bytes=1024).dumps_typed({"status": "running"})[0] == "msgpack"
+
+
+def test_any_codec_stays_readable_after_a_settings_change():
+    written = CompressedSerializer(codec="zlib", min_bytes=0).dumps_typed(_state())
+    assert written[0] == "msgpack+zlib"
+
+    for reader in (CompressedSerializer(codec="zstd"), CompressedSerializer(codec="none")):
+        assert reader.loads_typed(written)["supervisor_review"].feedback == "add tests"
+
+
+def test_unknown_codec_is_rejected_as_bad_data():
+    with pytest.raises(ValueError):
+        CompressedSerializer().loads_typed(("msgpack+lz4", b"\x00"))
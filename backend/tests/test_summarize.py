@@ -0,0 +1,111 @@
+import asyncio
+import time
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from app.agents import llm_factory, tools_summarize
+from app.agents.supervisor import supervisor_review
+from app.config import settings
+
+
+class _SlowModel:
+    """Answers after a fixed delay and counts calls."""
+
+    def __init__(self, reply: str, delay: float = 0.1) -> None:
+        self.reply = reply
+        self.delay = delay
+        self.calls = 0
+        self.prompts: list[str] = []
+        self.active = 0
+        self.max_active = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        self.prompts.append(messages[0].content)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        return AIMessage(content=self.reply)
+
+    def invoke(self, messages):
+        self.calls += 1
+        self.prompts.append(messages[0].content)
+        return AIMessage(content=self.reply)
+
+
+@pytest.fixture(autouse=True)
+def _estimated_tokens(monkeypatch):
+    # 4 chars/token, no tokenizer download
+    monkeypatch.setattr(settings, "LLM_PROVIDER", "gemini")
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    tools_summarize._summary_cache.clear()
+    yield
+    tools_summarize._summary_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_summaries_are_cached_by_content(monkeypatch):
+    model = _SlowModel("short", delay=0)
+    monkeypatch.setattr(llm_factory, "create_llm", lambda **kwargs: model)
+
+    text = "x" * 5000
+    assert await tools_summarize.asummarize_text(text, 100) == "short"
+    assert await tools_summarize.asummarize_text(text, 100) == "short"
+    assert tools_summarize.summarize_text.invoke({"text": text, "max_tokens": 100}) == "short"
+    assert model.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_supervisor_summarizes_outputs_concurrently(monkeypatch):
+    summarizer = _SlowModel("summary", delay=0.2)
+    reviewer = _SlowModel('{"decision": "approve", "feedback": "ok"}', delay=0)
+    monkeypatch.setattr(llm_factory, "create_llm", lambda **kwargs: summarizer)
+    monkeypatch.setattr("app.agents.supervisor.create_llm", lambda **kwargs: reviewer)
+    state = {
+        "task_description": "t",
+        "worker_outputs": [{"agent_name": f"w{i}", "output": f"{i}" * 5000} for i in range(5)],
+    }
+
+    start = time.monotonic()
+    result = await supervisor_review(state)
+
+    assert summarizer.calls == 5
+    assert time.monotonic() - start < 0.6  # one summarization latency, not five
+    assert result["supervisor_review"].decision == "approve"
+
+
+def test_split_chunks_prefers_structure():
+    text = "\n\n".join(["a" * 3000, "b" * 3000, "c" * 3000])
+    chunks = tools_summarize.split_chunks(text, chunk_tokens=1750)
+    assert chunks == ["a" * 3000 + "\n\n" + "b" * 3000, "c" * 3000]
+
+    long_line = "z" * 10_000
+    assert [len(c) for c in tools_summarize.split_chunks(long_line, 1000)] == [4000, 4000, 2000]
+
+
+@pytest.mark.asyncio
+async def test_long_text_is_map_reduced_without_dropping_the_tail(monkeypatch):
+    model = _SlowModel("s" * 200, delay=0.01)
+    monkeypatch.setattr(llm_factory, "create_llm", lambda **kwargs: model)
+    paragraphs = [f"section {i}: " + "x" * 3000 for i in range(20)]
+
+    await tools_summarize.asummarize_text("\n\n".join(paragraphs), 750)
+
+    # 10 chunk summaries, then one reduce over the joined summaries
+    assert model.calls == 11
+    assert any("section 19" in p for p in model.prompts)
+    assert model.max_active <= tools_summarize.SUMMARY_MAX_PARALLEL
+
+
+def test_sync_tool_map_reduces_too(monkeypatch):
+    model = _SlowModel("s" * 200)
+    monkeypatch.setattr(llm_factory, "create_llm", lambda **kwargs: model)
+    text = "\n\n".join(f"part {i} " + "y" * 3000 for i in range(6))
+
+    assert tools_summarize.summarize_text.invoke({"text": text, "max_tokens": 250}) == "s" * 200
+    assert model.calls == 4  # 3 chunks + reduce
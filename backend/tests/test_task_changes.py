@@ -0,0 +1,77 @@
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from app.core.repository import SQLTaskRepo, get_task_repo
+from app.main import app
+from app.models.domain import TaskRecord
+
+
+@pytest.fixture
+async def client():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.mark.asyncio
+async def test_changes_returns_only_newer_tasks(client: AsyncClient):
+    first = await client.get("/api/tasks/changes")
+    assert first.status_code == 200
+    cursor = first.json()["cursor"]
+    # Drain any earlier pages so the cursor is at the head
+    while first.json()["has_more"]:
+        first = await client.get("/api/tasks/changes", params={"since": cursor})
+        cursor = first.json()["cursor"]
+
+    task = TaskRecord(description="delta", updated_at="9999-01-01T00:00:00+00:00")
+    get_task_repo().save(task)
+
+    resp = await client.get("/api/tasks/changes", params={"since": cursor})
+    data = resp.json()
+    assert [t["id"] for t in data["tasks"]] == [task.id]
+    assert "worker_outputs" not in data["tasks"][0]
+
+    again = await client.get("/api/tasks/changes", params={"since": data["cursor"]})
+    assert again.json()["tasks"] == []
+
+
+@pytest.mark.asyncio
+async def test_changes_paginates_ties_on_updated_at(client: AsyncClient):
+    stamp = "9999-06-01T00:00:00+00:00"
+    ids = sorted(TaskRecord().id for _ in range(3))
+    for task_id in ids:
+        get_task_repo().save(TaskRecord(id=task_id, description="tie", updated_at=stamp))
+
+    since = ""
+    seen: list[str] = []
+    while True:
+        data = (await client.get("/api/tasks/changes", params={"since": since, "limit": 1})).json()
+        seen += [t["id"] for t in data["tasks"] if t["updated_at"] == stamp]
+        since = data["cursor"]
+        if not data["has_more"]:
+            break
+    assert seen == ids
+
+
+@pytest.mark.asyncio
+async def test_changes_rejects_bad_cursor(client: AsyncClient):
+    resp = await client.get("/api/tasks/changes", params={"since": "%%%"})
+    assert resp.status_code == 400
+
+
+def test_sql_changes_since(tmp_path, monkeypatch):
+    from sqlmodel import SQLModel, create_engine
+    import app.core.database as database
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'changes.db'}")
+    SQLModel.metadata.create_all(engine)
+    monkeypatch.setattr(database, "_engine", engine)
+
+    repo = SQLTaskRepo()
+    old = TaskRecord(description="old", updated_at="2026-01-01T00:00:00+00:00")
+    new = TaskRecord(description="new", updated_at="2026-02-01T00:00:00+00:00")
+    repo.save(old)
+    repo.save(new)
+
+    changed = repo.list_changed_since("2026-01-01T00:00:00+00:00", old.id)
+    assert [t.id for t in changed] == [new.id]
@@ -0,0 +1,104 @@
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from app.api.routes.events import _stream, task_events
+from app.core.event_bus import event_bus
+from app.core.repository import get_task_repo
+from app.main import app
+from app.models.domain import TaskRecord, TaskStatus
+from app.models.schemas import WSEvent
+
+
+class _ConnectedRequest:
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+@pytest.fixture
+async def client():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.mark.asyncio
+async def test_events_unknown_task_404(client: AsyncClient):
+    resp = await client.get("/api/tasks/does-not-exist/events")
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_events_terminal_task_sends_snapshot_and_closes(client: AsyncClient):
+    task = TaskRecord(description="done", status=TaskStatus.APPROVED)
+    get_task_repo().save(task)
+
+    resp = await client.get(f"/api/tasks/{task.id}/events")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    assert "event: task_update" in resp.text
+    assert '"action":"snapshot"' in resp.text
+
+
+@pytest.mark.asyncio
+async def test_events_resume_replays_only_this_task():
+    start = event_bus.latest_seq
+    await event_bus.publish(WSEvent(type="log", data={"task_id": "sse-t1", "message": "a"}))
+    await event_bus.publish(WSEvent(type="log", data={"task_id": "sse-other", "message": "b"}))
+
+    stream = _stream(_ConnectedRequest(), "sse-t1", (event_bus.epoch, start))
+    first = await stream.__anext__()
+    assert f"id: {event_bus.epoch}:{start + 1}" in first
+    assert '"message":"a"' in first
+
+    await event_bus.publish(WSEvent(
+        type="task_update",
+        data={"action": "completed", "task": {"id": "sse-t1", "status": "approved"}},
+    ))
+    second = await stream.__anext__()
+    assert "event: task_update" in second
+    with pytest.raises(StopAsyncIteration):
+        await stream.__anext__()
+
+
+@pytest.mark.asyncio
+async def test_events_resume_from_another_epoch_requires_resync():
+    stream = _stream(_ConnectedRequest(), "sse-t1", ("0123456789ab", 0))
+    first = await stream.__anext__()
+    assert "event: resync_required" in first
+    assert f'"epoch":"{event_bus.epoch}"' in first
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_events_after_the_snapshot_are_delivered():
+    task = TaskRecord(description="running", status=TaskStatus.RUNNING)
+    get_task_repo().save(task)
+
+    resp = await task_events(task.id, _ConnectedRequest(), None)
+    stream = resp.body_iterator
+    assert '"action":"snapshot"' in await stream.__anext__()
+    await event_bus.publish(WSEvent(
+        type="task_update",
+        data={"action": "completed", "task": {"id": task.id, "status": "approved"}},
+    ))
+
+    assert '"action":"completed"' in await stream.__anext__()
+    with pytest.raises(StopAsyncIteration):
+        await stream.__anext__()
+
+
+@pytest.mark.asyncio
+async def test_listener_only_exists_while_streaming():
+    task = TaskRecord(description="running", status=TaskStatus.RUNNING)
+    get_task_repo().save(task)
+    listeners = len(event_bus._listeners)
+
+    resp = await task_events(task.id, _ConnectedRequest(), None)
+    # A client that disconnects before the body starts leaves nothing behind
+    assert len(event_bus._listeners) == listeners
+
+    stream = resp.body_iterator
+    await stream.__anext__()
+    assert len(event_bus._listeners) == listeners + 1
+    await stream.aclose()
+    assert len(event_bus._listeners) == listeners
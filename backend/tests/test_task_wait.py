@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from app.core.repository import get_task_repo
+from app.main import app
+from app.models.domain import TaskRecord, TaskStatus
+from app.services.persistence import save_task
+
+
+@pytest.fixture
+async def client():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.mark.asyncio
+async def test_wait_returns_when_task_completes(client: AsyncClient):
+    task = TaskRecord(description="wait me", status=TaskStatus.RUNNING)
+    get_task_repo().save(task)
+
+    async def finish():
+        await asyncio.sleep(0.05)
+        task.status = TaskStatus.APPROVED
+        save_task(task)
+
+    finisher = asyncio.create_task(finish())
+    resp = await client.get(f"/api/tasks/{task.id}/wait", params={"timeout": 5})
+    await finisher
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "approved"
+
+
+@pytest.mark.asyncio
+async def test_wait_times_out_with_current_state(client: AsyncClient):
+    task = TaskRecord(description="slow", status=TaskStatus.RUNNING)
+    get_task_repo().save(task)
+
+    resp = await client.get(f"/api/tasks/{task.id}/wait", params={"timeout": 0.05})
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "running"
+
+
+@pytest.mark.asyncio
+async def test_wait_settled_stops_at_human_approval(client: AsyncClient):
+    task = TaskRecord(description="hitl", status=TaskStatus.PENDING_HUMAN_APPROVAL)
+    get_task_repo().save(task)
+
+    resp = await client.get(f"/api/tasks/{task.id}/wait", params={"until": "settled", "timeout": 5})
+    assert resp.json()["status"] == "pending_human_approval"
+
+
+@pytest.mark.asyncio
+async def test_queue_mode_subscribes_before_rechecking(monkeypatch):
+    from app.config import settings
+    from app.core import redis_client
+    from app.services import task_waiters
+
+    calls: list[str] = []
+
+    class _PubSub:
+        async def subscribe(self, channel):
+            calls.append("subscribe")
+
+        async def listen(self):
+            # Another process finishes the task right after the re-check
+            yield {"type": "message", "data": TaskStatus.APPROVED.value}
+
+        async def unsubscribe(self, channel):
+            calls.append("unsubscribe")
+
+        async def close(self):
+            pass
+
+    class _Redis:
+        def pubsub(self):
+            return _PubSub()
+
+    async def get_redis():
+        return _Redis()
+
+    task = TaskRecord(description="remote", status=TaskStatus.RUNNING)
+    get_task_repo().save(task)
+    repo_get = get_task_repo().get
+
+    def get(task_id):
+        calls.append("recheck")
+        return repo_get(task_id)
+
+    monkeypatch.setattr(settings, "USE_QUEUE", True)
+    monkeypatch.setattr(redis_client, "get_redis", get_redis)
+    monkeypatch.setattr(get_task_repo(), "get", get)
+
+    assert await task_waiters.wait_for_status(task.id, frozenset({TaskStatus.APPROVED}), timeout=1)
+    assert calls == ["subscribe", "recheck", "unsubscribe"]
+
+
+@pytest.mark.asyncio
+async def test_failed_status_publish_is_logged(monkeypatch, caplog):
+    from app.config import settings
+    from app.core import redis_client
+    from app.services import task_waiters
+
+    async def get_redis():
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(settings, "USE_QUEUE", True)
+    monkeypatch.setattr(redis_client, "get_redis", get_redis)
+
+    task_waiters.notify_status("published", TaskStatus.APPROVED)
+    assert len(task_waiters._publishing) == 1
+    await asyncio.gather(*task_waiters._publishing, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    assert task_waiters._publishing == set()
+    assert "Could not publish status for task published: redis down" in caplog.text
@@ -0,0 +1,40 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.agents.callbacks_telemetry import TelemetryCallbackHandler
+from app.core.ws_manager import ConnectionManager
+from app.models.schemas import WSEvent
+
+
+@pytest.mark.asyncio
+async def test_tokens_are_batched_into_one_event():
+    handler = TelemetryCallbackHandler(task_id="t1", agent_id="a1", agent_name="Worker")
+    with patch("app.agents.callbacks_telemetry.event_bus.publish", new_callable=AsyncMock) as publish:
+        for tok in ["Hel", "lo", " world"]:
+            await handler.on_llm_new_token(tok)
+        publish.assert_not_called()
+        await asyncio.sleep(0.1)
+
+    publish.assert_called_once()
+    event = publish.call_args[0][0]
+    assert event.type == "worker_token"
+    assert event.data["task_id"] == "t1"
+    assert event.data["delta"] == "Hello world"
+
+
+@pytest.mark.asyncio
+async def test_stream_events_only_reach_task_subscribers():
+    manager = ConnectionManager()
+    subscribed, other = AsyncMock(), AsyncMock()
+    manager._connections = {subscribed, other}
+    manager.subscribe(subscribed, "t1")
+
+    await manager.broadcast(WSEvent(type="worker_token", data={"task_id": "t1", "delta": "x"}))
+    subscribed.send_text.assert_called_once()
+    other.send_text.assert_not_called()
+
+    await manager.broadcast(WSEvent(type="task_update", data={"task": {"id": "t1"}}))
+    assert subscribed.send_text.call_count == 2
+    other.send_text.assert_called_once()
@@ -0,0 +1,32 @@
+from app.core import tokens
+from app.core.tokens import count_tokens, split_at_tokens, truncate_to_tokens
+
+
+def test_estimates_use_the_provider_ratio():
+    text = "x" * 700
+    assert count_tokens(text, "anthropic") == 201
+    assert count_tokens(text, "gemini") == 176
+    assert count_tokens("", "anthropic") == 0
+
+
+def test_truncation_marks_only_when_cut():
+    assert truncate_to_tokens("short", 10, "gemini", marker=" [cut]") == "short"
+    assert truncate_to_tokens("y" * 100, 10, "gemini", marker=" [cut]") == "y" * 40 + " [cut]"
+
+
+class _ByteEncoder:
+    """One token per UTF-8 byte, like a byte-level BPE on unseen text."""
+
+    def encode(self, text, disallowed_special=()):
+        return list(text.encode())
+
+    def decode(self, tokens):
+        return bytes(tokens).decode(errors="replace")
+
+
+def test_tokenizer_split_never_breaks_a_character(monkeypatch):
+    monkeypatch.setattr(tokens, "_encoder", lambda provider: _ByteEncoder())
+
+    head, tail = split_at_tokens("aé" * 3, 4, "fake")  # 'é' is two bytes
+    assert (head, tail) == ("aéa", "éaé")
+    assert count_tokens("aé", "fake") == 3
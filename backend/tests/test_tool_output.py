@@ -0,0 +1,115 @@
+import os
+
+import pytest
+
+from app.agents import tool_output
+from app.agents.tool_output import collapse_grep_hits, compact_output, dedupe_lines
+from app.agents.tools_code import read_file
+from app.config import settings
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "WORKSPACE_DIR", str(tmp_path / "workspace"))
+    monkeypatch.setattr(settings, "TOOL_OUTPUT_DIR", str(tmp_path / "outputs"))
+    monkeypatch.setattr(settings, "LLM_PROVIDER", "gemini")  # 4 chars/token
+    monkeypatch.setattr(settings, "TOOL_OUTPUT_MAX_TOKENS", 200)
+    (tmp_path / "workspace").mkdir()
+    return tmp_path / "workspace"
+
+
+def _saved(workspace) -> list[str]:
+    outputs = workspace.parent / "outputs"
+    return os.listdir(outputs) if outputs.exists() else []
+
+
+def test_repeated_lines_collapse():
+    text = "start\n" + "retrying...\n" * 50 + "ok\nok\nend"
+    assert dedupe_lines(text) == "start\nretrying...\n[previous line repeated 49 more times]\nok\nok\nend"
+
+
+def test_grep_hits_are_capped_per_file():
+    hits = [f"a.py:{i}:x = {i}" for i in range(8)] + ["b.py:3:y"]
+    collapsed = collapse_grep_hits("\n".join(hits), per_file=5).split("\n")
+
+    assert collapsed[:5] == hits[:5]
+    assert "b.py:3:y" in collapsed
+    assert collapsed[-1] == "[a.py: 3 more matches not shown]"
+
+
+def test_small_output_passes_through_unchanged(workspace):
+    text = "STDOUT:\n" + "host0:8080:up\n" * 8 + "2024-05-01 10:00:01 started\nEXIT CODE: 0"
+    assert compact_output(text, "run_command") == text
+    assert compact_output(text, "search_code") == text
+    assert _saved(workspace) == []
+
+
+def test_large_output_keeps_head_and_tail_and_saves_outside_workspace(workspace):
+    text = "\n".join(f"line {i:04d} " + "x" * 30 for i in range(500))
+
+    compacted = compact_output(text, "run_command")
+
+    assert compacted.startswith("line 0000")
+    assert "line 0499" in compacted
+    assert "lines omitted" in compacted
+    assert len(compacted) < len(text) // 10
+
+    saved = _saved(workspace)
+    assert len(saved) == 1
+    assert os.listdir(workspace) == []
+    assert f"output:{saved[0]}" in compacted
+    assert read_file.invoke({"path": f"output:{saved[0]}", "offset": 499, "limit": 1}) == text.split("\n")[-1]
+
+
+def test_grep_hits_are_only_capped_for_search_code(workspace):
+    log = "\n".join(f"2024-05-01 10:00:{i:02d} worker {i} " + "x" * 40 for i in range(40))
+    compacted = compact_output(log, "run_command")
+    assert "more matches not shown" not in compacted
+
+
+def test_read_file_returns_content_unchanged(workspace):
+    text = "".join(f"2024-05-01 10:00:{i:02d} ok\n" for i in range(10)) + "host0:8080:up\n" * 8
+    (workspace / "app.log").write_text(text)
+    assert read_file.invoke({"path": "app.log"}) == text
+
+
+def test_read_file_pages_long_files_with_a_marker(workspace):
+    (workspace / "big.txt").write_text("".join(f"row {i}\n" for i in range(2000)))
+
+    first = read_file.invoke({"path": "big.txt"})
+    lines = first.split("\n")
+    assert lines[0] == "row 0"
+    shown = sum(1 for line in lines if line.startswith("row "))
+    assert lines[shown - 1] == f"row {shown - 1}"
+    assert f"[Lines 1-{shown} of 2000 in big.txt shown; continue with read_file(path, offset={shown}" in first
+    assert _saved(workspace) == []
+
+    page = read_file.invoke({"path": "big.txt", "offset": 1000, "limit": 3})
+    assert page == "row 1000\nrow 1001\nrow 1002\n"
+
+
+def test_read_file_rejects_paths_outside_saved_outputs(workspace):
+    assert read_file.invoke({"path": "output:../secret"}).startswith("Error:")
+
+
+def test_head_tail_keeps_whole_lines_at_both_ends(workspace):
+    lines = [f"line {i:04d} " + "x" * 30 for i in range(500)]
+
+    kept = tool_output.head_tail("\n".join(lines), 200).split("\n")
+
+    marker = next(i for i, line in enumerate(kept) if "lines omitted" in line)
+    head, tail = kept[:marker], kept[marker + 1:]
+    assert head == lines[:len(head)] and tail == lines[-len(tail):]
+    assert f"[... {500 - len(head) - len(tail)} lines omitted ...]" == kept[marker]
+
+
+def test_saved_outputs_expire_by_age_not_count(workspace, monkeypatch):
+    monkeypatch.setattr(settings, "TOOL_OUTPUT_RETENTION_SECONDS", 3600)
+    stale = tool_output.spill("old output", "run_command")
+    stale_path = tool_output.resolve_output_path(stale)
+    os.utime(stale_path, (0, 0))
+
+    fresh = [tool_output.spill(f"output {i}", "run_command") for i in range(60)]
+
+    assert not os.path.exists(stale_path)
+    assert all(os.path.exists(tool_output.resolve_output_path(p)) for p in fresh)
@@ -0,0 +1,40 @@
+import pytest
+
+from app.agents import worker as worker_module
+from app.agents.llm_factory import clear_llm_pool
+from app.agents.worker import create_worker_agent, worker_input_messages
+
+
+@pytest.fixture(autouse=True)
+def _fresh_caches():
+    clear_llm_pool()
+    worker_module._agent_cache.clear()
+    yield
+    clear_llm_pool()
+    worker_module._agent_cache.clear()
+
+
+def _agent(**overrides):
+    kwargs = {"agent_id": "a1", "custom_prompt": "Be brief.", "llm_provider": "anthropic", "tools": []}
+    kwargs.update(overrides)
+    return create_worker_agent(**kwargs)
+
+
+def test_compiled_agent_is_reused_across_dispatches():
+    assert _agent() is _agent()
+
+
+def test_config_or_tool_change_compiles_a_new_agent():
+    base = _agent()
+    assert _agent(custom_prompt="Be thorough.") is not base
+    assert _agent(tools=[worker_module.TOOL_REGISTRY["search_memory"]]) is not base
+    assert _agent(agent_id="a2") is not base
+
+
+def test_revision_context_goes_in_the_input():
+    assert len(worker_input_messages("Do X")) == 1
+
+    messages = worker_input_messages("Do X", revision=2, revision_feedback="Add tests")
+    assert messages[0].content == "Do X"
+    assert "Current task revision: 2" in messages[1].content
+    assert "Add tests" in messages[1].content
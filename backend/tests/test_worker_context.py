@@ -0,0 +1,88 @@
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from app.agents import llm_factory, tools_summarize
+from app.agents.context import compact_messages, make_context_hook
+
+
+class _Summarizer:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        return AIMessage(content="summary")
+
+
+@pytest.fixture
+def summarizer(monkeypatch):
+    model = _Summarizer()
+    monkeypatch.setattr(llm_factory, "create_llm", lambda **kwargs: model)
+    tools_summarize._summary_cache.clear()
+    yield model
+    tools_summarize._summary_cache.clear()
+
+
+def _history(steps: int, output_chars: int = 8000) -> list:
+    messages = [HumanMessage(content="Fix the failing test")]
+    for i in range(steps):
+        messages.append(AIMessage(content="", tool_calls=[
+            {"name": "read_file", "args": {"path": f"f{i}.py"}, "id": f"c{i}"},
+        ]))
+        messages.append(ToolMessage(content=f"file {i}\n" + "x" * output_chars, tool_call_id=f"c{i}"))
+    return messages
+
+
+@pytest.mark.asyncio
+async def test_short_history_is_sent_unchanged(summarizer):
+    history = _history(2, output_chars=100)
+    assert await compact_messages(history, 10_000, 4, "gemini") is history
+    assert summarizer.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_older_tool_results_are_summarized_and_recent_kept(summarizer):
+    history = _history(5, output_chars=4000)
+
+    compacted = await compact_messages(history, 3_000, 4, "gemini")
+
+    assert compacted[0] is history[0]
+    assert compacted[-4:] == history[-4:]
+    older = [m for m in compacted[1:-4] if isinstance(m, ToolMessage)]
+    assert len(older) == 3 and all("summary" in m.content for m in older)
+    assert [m.tool_call_id for m in older] == ["c0", "c1", "c2"]
+    assert summarizer.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_oldest_steps_are_dropped_whole_when_still_over_budget(summarizer):
+    history = _history(30)
+
+    compacted = await compact_messages(history, 4_500, 4, "gemini")
+
+    assert "earlier steps omitted" in compacted[1].content
+    # Every remaining tool result still follows the AI message that called it
+    call_ids = {c["id"] for m in compacted if isinstance(m, AIMessage) for c in m.tool_calls}
+    assert all(m.tool_call_id in call_ids for m in compacted if isinstance(m, ToolMessage))
+    assert compacted[-4:] == history[-4:]
+
+
+@pytest.mark.asyncio
+async def test_keep_recent_zero_keeps_nothing_verbatim(summarizer):
+    history = _history(3, output_chars=4000)
+
+    compacted = await compact_messages(history, 3_000, 0, "gemini")
+
+    assert compacted[0] is history[0]
+    assert all("summary" in m.content for m in compacted if isinstance(m, ToolMessage))
+
+
+@pytest.mark.asyncio
+async def test_hook_leaves_state_messages_alone(summarizer):
+    hook = make_context_hook(10_000, 4, "gemini")
+    history = _history(5)
+
+    update = await hook({"messages": history})
+
+    assert set(update) == {"llm_input_messages"}
+    assert len(history) == 11
@@ -0,0 +1,140 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from app.agents import graph as graph_module
+from app.agents.output_store import resolve_outputs
+from app.config import settings
+from app.core.repository import get_task_repo
+from app.models.domain import TaskRecord
+
+DELAYS = {"fast": 0.0, "slow": 0.5}
+
+
+class _Worker:
+    def __init__(self, agent_id: str, runs: list[str]):
+        self.agent_id = agent_id
+        self.runs = runs
+
+    async def ainvoke(self, inputs, config=None):
+        self.runs.append(self.agent_id)
+        await asyncio.sleep(DELAYS[self.agent_id])
+        self.runs.append(f"{self.agent_id} finished")
+        return {"messages": [AIMessage(content=f"{self.agent_id} done")]}
+
+
+@pytest.fixture
+def runs(monkeypatch):
+    runs: list[str] = []
+
+    async def no_status(agent_id, status):
+        pass
+
+    monkeypatch.setattr(graph_module, "get_agent", lambda aid: SimpleNamespace(
+        name=aid.title(), system_prompt="", llm_provider=None, llm_model=None,
+    ))
+    monkeypatch.setattr(graph_module, "set_agent_status", no_status)
+    monkeypatch.setattr(graph_module, "create_worker_agent", lambda agent_id, **kw: _Worker(agent_id, runs))
+    monkeypatch.setattr(settings, "WORKER_TIMEOUT_SECONDS", 0.1)
+    yield runs
+    for jobs in graph_module._late_workers.values():
+        for job in jobs.values():
+            job.cancel()
+    graph_module._late_workers.clear()
+
+
+def _state(task: TaskRecord, revision: int = 0) -> dict:
+    return {
+        "task_id": task.id,
+        "task_description": task.description,
+        "assigned_agent_ids": ["fast", "slow"],
+        "current_revision": revision,
+        "supervisor_review": None,
+    }
+
+
+@pytest.mark.asyncio
+async def test_review_proceeds_without_laggards(runs):
+    task = TaskRecord(description="t")
+    get_task_repo().save(task)
+
+    update = await graph_module.dispatch_workers(_state(task))
+
+    assert [wo["agent_id"] for wo in update["worker_outputs"]] == ["fast"]
+    assert resolve_outputs(task.id, update["worker_outputs"]) == ["fast done"]
+    recorded = {o.agent_id: o.output for o in get_task_repo().get(task.id).worker_outputs}
+    assert recorded["slow"].startswith("[Timed out after")
+    assert task.id not in graph_module._late_workers
+
+
+@pytest.mark.asyncio
+async def test_late_result_joins_the_next_revision(runs, monkeypatch):
+    monkeypatch.setattr(settings, "WORKER_LATE_RESULTS", True)
+    task = TaskRecord(description="t")
+    get_task_repo().save(task)
+
+    first = await graph_module.dispatch_workers(_state(task))
+    assert [wo["agent_id"] for wo in first["worker_outputs"]] == ["fast"]
+    assert set(graph_module._late_workers[task.id]) == {"slow"}
+
+    await asyncio.sleep(0.5)
+    second = await graph_module.dispatch_workers(_state(task, revision=1))
+
+    assert sorted(wo["agent_id"] for wo in second["worker_outputs"]) == ["fast", "slow"]
+    assert runs.count("slow") == 1
+    assert task.id not in graph_module._late_workers
+
+
+@pytest.mark.asyncio
+async def test_zero_timeout_waits_for_every_worker(runs, monkeypatch):
+    monkeypatch.setattr(settings, "WORKER_TIMEOUT_SECONDS", 0)
+    task = TaskRecord(description="t")
+    get_task_repo().save(task)
+
+    update = await graph_module.dispatch_workers(_state(task))
+
+    assert sorted(wo["agent_id"] for wo in update["worker_outputs"]) == ["fast", "slow"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_workers_clean_up_before_review(runs, monkeypatch):
+    statuses: list[tuple[str, str]] = []
+
+    async def record_status(agent_id, status):
+        await asyncio.sleep(0)
+        statuses.append((agent_id, status))
+
+    monkeypatch.setattr(graph_module, "set_agent_status", record_status)
+    task = TaskRecord(description="t")
+    get_task_repo().save(task)
+
+    await graph_module.dispatch_workers(_state(task))
+
+    # The slow worker's cancellation ran its cleanup before dispatch returned
+    assert ("slow", "idle") in statuses
+
+
+def test_all_workers_timed_out_skips_review():
+    assert graph_module.after_dispatch({"worker_outputs": [{"agent_id": "fast"}]}) == "review"
+    state = {"worker_outputs": [], "current_revision": 0, "max_revisions": 2}
+    assert graph_module.after_dispatch(state) == "revise"
+    assert graph_module.after_dispatch({**state, "current_revision": 2}) == "fail"
+
+
+@pytest.mark.asyncio
+async def test_cancelling_dispatch_cancels_workers(runs, monkeypatch):
+    monkeypatch.setattr(settings, "WORKER_TIMEOUT_SECONDS", 0)
+    task = TaskRecord(description="t")
+    get_task_repo().save(task)
+
+    dispatch = asyncio.create_task(graph_module.dispatch_workers(_state(task)))
+    await asyncio.sleep(0.05)
+    dispatch.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await dispatch
+
+    # The slow worker was cancelled with the node rather than left to finish
+    await asyncio.sleep(DELAYS["slow"])
+    assert "slow" in runs and "slow finished" not in runs
@@ -1,4 +1,4 @@
-import type { Agent, AgentCreate, Task, TaskSummary } from './types'
+import type { Agent, AgentCreate, Task, TaskChanges, TaskSummary } from './types'
 
 const BASE = '/api'
 
@@ -46,6 +46,8 @@ export const deleteAgent = (id: string) =>
 // Tasks
 export const fetchTasks = () => request<TaskSummary[]>('/tasks')
 export const fetchTask = (id: string) => request<Task>(`/tasks/${id}`)
+export const fetchTaskChanges = (since: string) =>
+  request<TaskChanges>(`/tasks/changes?since=${encodeURIComponent(since)}`)
 export const createTask = (data: { description: string; assigned_agents?: string[]; requires_human_approval?: boolean }) =>
   request<Task>('/tasks', { method: 'POST', body: JSON.stringify(data) })
 
@@ -53,6 +53,8 @@ export interface Task {
   depth: number
   child_task_ids: string[]
   spawned_by_agent: string
+  cache_decision: string
+  cache_source_task_id: string
 }
 
 export interface TaskSummary {
@@ -69,6 +71,12 @@ export interface TaskSummary {
   spawned_by_agent: string
 }
 
+export interface TaskChanges {
+  tasks: TaskSummary[]
+  cursor: string
+  has_more: boolean
+}
+
 export interface LogEntry {
   id: string
   task_id: string
@@ -95,6 +103,10 @@ export interface WSWorkerOutput {
   type: 'worker_output'
   data: { task_id: string; agent_id: string; agent_name: string; output: string; revision: number; timestamp: string }
 }
+export interface WSWorkerToken {
+  type: 'worker_token'
+  data: { task_id: string; agent_id: string; agent_name: string; delta: string; timestamp: string }
+}
 export interface WSSupervisorReview {
   type: 'supervisor_review'
   data: { task_id: string; decision: string; feedback: string; revision: number; timestamp: string }
@@ -111,5 +123,9 @@ export interface WSPing {
   type: 'ping'
   data: Record<string, unknown>
 }
+export interface WSResyncRequired {
+  type: 'resync_required'
+  data: { latest_seq: number; epoch: string }
+}
 
-export type WSEvent = WSTaskUpdate | WSAgentUpdate | WSLog | WSWorkerOutput | WSSupervisorReview | WSHumanApproval | WSTelemetry | WSPing
+export type WSEvent = (WSTaskUpdate | WSAgentUpdate | WSLog | WSWorkerOutput | WSWorkerToken | WSSupervisorReview | WSHumanApproval | WSTelemetry | WSPing | WSResyncRequired) & { seq?: number; epoch?: string }
@@ -0,0 +1,31 @@
+import { useStore } from '../../store'
+import { Bot, Radio } from 'lucide-react'
+
+export function WorkerStreamPanel({ taskId }: { taskId: string }) {
+  const streams = useStore((s) => s.workerStreams[taskId])
+  const entries = Object.entries(streams ?? {})
+
+  if (entries.length === 0) return null
+
+  return (
+    <section className="bg-card border rounded-xl overflow-hidden shadow-sm">
+      <div className="px-6 py-4 border-b bg-muted/30 flex items-center gap-2">
+        <Radio className="size-4 text-primary animate-pulse" />
+        <h3 className="text-xs font-bold uppercase tracking-widest text-muted-foreground">Live Worker Output</h3>
+      </div>
+      <div className="divide-y">
+        {entries.map(([agentId, stream]) => (
+          <div key={agentId} className="p-6 space-y-2">
+            <div className="flex items-center gap-1.5 text-xs font-semibold text-primary">
+              <Bot className="size-3" />
+              {stream.agent_name || agentId.slice(0, 8)}
+            </div>
+            <pre className="text-sm text-foreground/90 whitespace-pre-wrap font-mono leading-relaxed max-h-[300px] overflow-auto custom-scrollbar">
+              {stream.text}
+            </pre>
+          </div>
+        ))}
+      </div>
+    </section>
+  )
+}
@@ -1,8 +1,21 @@
 import { useEffect, useRef } from 'react'
 import { useStore } from '../store'
+import { fetchTaskChanges } from '../api/client'
 import type { WSEvent, TaskStatus } from '../api/types'
 
 let idCounter = 0
+// Delta-sync cursor from /api/tasks/changes; empty until the first resync
+let taskCursor = ''
+
+async function syncTaskChanges(): Promise<void> {
+  const { upsertTask } = useStore.getState()
+  for (;;) {
+    const page = await fetchTaskChanges(taskCursor)
+    page.tasks.forEach(upsertTask)
+    taskCursor = page.cursor
+    if (!page.has_more) return
+  }
+}
 
 export function useWebSocket(): void {
   const closedIntentionally = useRef(false)
@@ -12,6 +25,10 @@ export function useWebSocket(): void {
     closedIntentionally.current = false
     const currentInstance = ++instanceId.current
     let reconnectAttempts = 0
+    // Highest event seq applied; sent as ?since= on reconnect to replay the gap
+    let lastSeq = 0
+    // Server event bus that assigned lastSeq; seqs restart with the server
+    let lastEpoch = ''
 
     function getBackoffDelay(): number {
       return Math.min(1000 * Math.pow(2, reconnectAttempts), 30_000)
@@ -19,17 +36,24 @@ export function useWebSocket(): void {
 
     let ws: WebSocket | null = null
 
+    function sendSubscription(type: 'subscribe' | 'unsubscribe', taskId: string): void {
+      if (ws?.readyState === WebSocket.OPEN) ws.send(JSON.stringify({ type, task_id: taskId }))
+    }
+
     function connect(): void {
       // Bail if this effect instance was cleaned up (React StrictMode)
       if (currentInstance !== instanceId.current) return
 
       const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:'
-      ws = new WebSocket(`${protocol}//${window.location.host}/ws`)
+      const query = lastSeq > 0 ? `?since=${lastSeq}&epoch=${encodeURIComponent(lastEpoch)}` : ''
+      ws = new WebSocket(`${protocol}//${window.location.host}/ws${query}`)
 
       ws.onopen = () => {
         reconnectAttempts = 0
         useStore.getState().setWsConnected(true)
         useStore.getState().setWsError(null) // Clear any previous errors on successful connection
+        // Stream subscriptions are per connection; renew them after a reconnect
+        Object.keys(useStore.getState().streamSubscriptions).forEach((taskId) => sendSubscription('subscribe', taskId))
       }
 
       ws.onmessage = (e: MessageEvent) => {
@@ -39,6 +63,19 @@ export function useWebSocket(): void {
             ws?.send(JSON.stringify({ type: 'pong' }))
             return
           }
+          if (event.type === 'resync_required') {
+            // Gap is older than the server's replay buffer — pull task deltas
+            lastSeq = event.data.latest_seq
+            lastEpoch = event.data.epoch
+            syncTaskChanges().catch(() => { /* next reconnect retries */ })
+            return
+          }
+          if (event.seq) {
+            // Replay can overlap with live broadcast; drop anything already applied
+            if (event.seq <= lastSeq) return
+            lastSeq = event.seq
+            lastEpoch = event.epoch ?? ''
+          }
           handleEvent(event)
         } catch {
           // ignore malformed messages
@@ -71,13 +108,35 @@ export function useWebSocket(): void {
 
     connect()
 
+    // Forward task stream (un)subscriptions from mounted views to the server
+    const stopFollowingSubscriptions = useStore.subscribe((state, prev) => {
+      if (state.streamSubscriptions === prev.streamSubscriptions) return
+      Object.keys(state.streamSubscriptions)
+        .filter((taskId) => !(taskId in prev.streamSubscriptions))
+        .forEach((taskId) => sendSubscription('subscribe', taskId))
+      Object.keys(prev.streamSubscriptions)
+        .filter((taskId) => !(taskId in state.streamSubscriptions))
+        .forEach((taskId) => sendSubscription('unsubscribe', taskId))
+    })
+
     return () => {
       closedIntentionally.current = true
+      stopFollowingSubscriptions()
       ws?.close()
     }
   }, [])
 }
 
+/** Receive worker_token deltas for *taskId* while the calling component is mounted. */
+export function useTaskStream(taskId: string | undefined): void {
+  useEffect(() => {
+    if (!taskId) return
+    const { subscribeTaskStream, unsubscribeTaskStream } = useStore.getState()
+    subscribeTaskStream(taskId)
+    return () => unsubscribeTaskStream(taskId)
+  }, [taskId])
+}
+
 function isString(value: unknown): value is string {
   return typeof value === 'string'
 }
@@ -90,8 +149,10 @@ function isTaskStatus(value: unknown): value is TaskStatus {
 }
 
 function handleEvent(event: WSEvent): void {
-  const { upsertAgent, removeAgent, updateAgentStatus, updateTask, addLog, addTelemetryEntry } =
-    useStore.getState()
+  const {
+    upsertAgent, removeAgent, updateAgentStatus, updateTask, addLog, addTelemetryEntry,
+    appendWorkerToken, clearWorkerStream,
+  } = useStore.getState()
 
   switch (event.type) {
     case 'agent_update': {
@@ -141,6 +202,11 @@ function handleEvent(event: WSEvent): void {
       })
       break
     }
+    case 'worker_token': {
+      const d = event.data
+      appendWorkerToken(d.task_id, d.agent_id, d.agent_name, d.delta)
+      break
+    }
     case 'telemetry': {
       const d = event.data
       addTelemetryEntry(d.task_id, {
@@ -170,6 +236,8 @@ function handleEvent(event: WSEvent): void {
 
       let logMessage: string
       if (event.type === 'worker_output') {
+        // The finished output replaces the live token stream
+        if (isString(taskId) && isString(agentId)) clearWorkerStream(taskId, agentId)
         logMessage = `[Worker: ${isString(agentName) ? agentName : 'unknown'}] Output received (rev ${String(revision ?? '?')})`
       } else if (event.type === 'supervisor_review') {
         const fb = isString(feedback) ? feedback.slice(0, 100) : ''
@@ -2,11 +2,13 @@ import { useParams, Link } from 'react-router-dom'
 import { motion } from 'framer-motion'
 import { useTask } from '../hooks/useTasks'
 import { useStore } from '../store'
+import { useTaskStream } from '../hooks/useWebSocket'
 import { StatusBadge } from '../components/common/StatusBadge'
 import { TaskTimeline } from '../components/tasks/TaskTimeline'
 import { LiveLogPanel } from '../components/logs/LiveLogPanel'
 import { LoadingSpinner } from '../components/common/LoadingSpinner'
 import { HumanApprovalPanel } from '../components/tasks/HumanApprovalPanel'
+import { WorkerStreamPanel } from '../components/tasks/WorkerStreamPanel'
 import { ArrowLeft, ClipboardList, CheckCircle, FileText, Activity, Clock, Hash, History, Zap, DollarSign, GitBranch, Bot } from 'lucide-react'
 
 export function TaskDetailPage() {
@@ -14,6 +16,7 @@ export function TaskDetailPage() {
   const { data: task, isLoading, refetch } = useTask(id!)
   const getTaskTelemetry = useStore((s) => s.getTaskTelemetry)
   const telemetry = id ? getTaskTelemetry(id) : null
+  useTaskStream(id)
 
   if (isLoading) return <LoadingSpinner />
   if (!task) {
@@ -82,6 +85,9 @@ export function TaskDetailPage() {
             <HumanApprovalPanel task={task} onDecisionMade={() => refetch()} />
           )}
 
+          {/* Tokens from workers still generating */}
+          <WorkerStreamPanel taskId={task.id} />
+
           {/* Final Output */}
           {task.final_output && (
             <section className="bg-card border-2 border-green-500/20 rounded-xl overflow-hidden shadow-lg shadow-green-500/5 ring-4 ring-green-500/5">
@@ -146,6 +152,20 @@ export function TaskDetailPage() {
                 </div>
               )}
 
+              {task.cache_source_task_id && (
+                <div className="space-y-1">
+                  <p className="text-[10px] text-muted-foreground uppercase font-semibold">
+                    {task.cache_decision === 'returned' ? 'Result Reused From' : 'Seeded From'}
+                  </p>
+                  <Link
+                    to={`/tasks/${task.cache_source_task_id}`}
+                    className="text-xs font-mono text-primary hover:underline block truncate"
+                  >
+                    {task.cache_source_task_id}
+                  </Link>
+                </div>
+              )}
+
               {task.child_task_ids && task.child_task_ids.length > 0 && (
                 <div className="space-y-1.5">
                   <p className="text-[10px] text-muted-foreground uppercase font-semibold">
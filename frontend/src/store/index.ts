@@ -7,8 +7,9 @@ import { createDashboardSlice, type DashboardSlice } from './dashboardSlice'
 import { createSettingsSlice, type SettingsSlice } from './settingsSlice'
 import { createTelemetrySlice, type TelemetrySlice } from './telemetrySlice'
 import { createWebSocketSlice, type WebSocketSlice } from './webSocketSlice'
+import { createStreamSlice, type StreamSlice } from './streamSlice'
 
-export type AppStore = AgentSlice & TaskSlice & LogSlice & ThemeSlice & DashboardSlice & SettingsSlice & TelemetrySlice & WebSocketSlice
+export type AppStore = AgentSlice & TaskSlice & LogSlice & ThemeSlice & DashboardSlice & SettingsSlice & TelemetrySlice & WebSocketSlice & StreamSlice
 
 export const useStore = create<AppStore>()((...a) => ({
   ...createAgentSlice(...a),
@@ -19,4 +20,5 @@ export const useStore = create<AppStore>()((...a) => ({
   ...createSettingsSlice(...a),
   ...createTelemetrySlice(...a),
   ...createWebSocketSlice(...a),
+  ...createStreamSlice(...a),
 }))
@@ -0,0 +1,58 @@
+import type { StateCreator } from 'zustand'
+
+// Live text kept per worker; older text scrolls out of the buffer
+const MAX_STREAM_CHARS = 20_000
+
+export interface WorkerStream {
+  agent_name: string
+  text: string
+}
+
+export interface StreamSlice {
+  // Mounted views per task id that want worker_token deltas
+  streamSubscriptions: Record<string, number>
+  // task id -> agent id -> text generated so far
+  workerStreams: Record<string, Record<string, WorkerStream>>
+  subscribeTaskStream: (taskId: string) => void
+  unsubscribeTaskStream: (taskId: string) => void
+  appendWorkerToken: (taskId: string, agentId: string, agentName: string, delta: string) => void
+  clearWorkerStream: (taskId: string, agentId: string) => void
+}
+
+export const createStreamSlice: StateCreator<StreamSlice> = (set) => ({
+  streamSubscriptions: {},
+  workerStreams: {},
+  subscribeTaskStream: (taskId) =>
+    set((s) => ({
+      streamSubscriptions: { ...s.streamSubscriptions, [taskId]: (s.streamSubscriptions[taskId] ?? 0) + 1 },
+    })),
+  unsubscribeTaskStream: (taskId) =>
+    set((s) => {
+      const count = (s.streamSubscriptions[taskId] ?? 0) - 1
+      if (count > 0) {
+        return { streamSubscriptions: { ...s.streamSubscriptions, [taskId]: count } }
+      }
+      const { [taskId]: _subscription, ...streamSubscriptions } = s.streamSubscriptions
+      const { [taskId]: _streams, ...workerStreams } = s.workerStreams
+      return { streamSubscriptions, workerStreams }
+    }),
+  appendWorkerToken: (taskId, agentId, agentName, delta) =>
+    set((s) => {
+      if (!s.streamSubscriptions[taskId]) return s
+      const streams = s.workerStreams[taskId] ?? {}
+      const text = ((streams[agentId]?.text ?? '') + delta).slice(-MAX_STREAM_CHARS)
+      return {
+        workerStreams: {
+          ...s.workerStreams,
+          [taskId]: { ...streams, [agentId]: { agent_name: agentName, text } },
+        },
+      }
+    }),
+  clearWorkerStream: (taskId, agentId) =>
+    set((s) => {
+      const streams = s.workerStreams[taskId]
+      if (!streams?.[agentId]) return s
+      const { [agentId]: _done, ...rest } = streams
+      return { workerStreams: { ...s.workerStreams, [taskId]: rest } }
+    }),
+})